@@ -55,6 +55,18 @@ class Config:
     def auth(self) -> Dict[str, str]:
         return dict(self.get("api.auth", {}))
 
+    @property
+    def retry(self) -> Dict[str, Any]:
+        return dict(self.get("api.retry", {}))
+
+    @property
+    def pool(self) -> Dict[str, Any]:
+        return dict(self.get("api.pool", {}))
+
+    @property
+    def cassette(self) -> Dict[str, Any]:
+        return dict(self.get("cassette", {}))
+
     @property
     def database(self) -> Dict[str, str]:
         return dict(self.get("database", {}))
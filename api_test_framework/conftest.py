@@ -3,25 +3,34 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-import logging
+import json
+import time
 import allure
+import allure_commons
 import pytest
 import requests_mock
+from allure_commons.logger import AllureFileLogger
+from allure_commons.model2 import Attachment, Status, TestAfterResult, TestResultContainer
+from allure_commons.utils import uuid4
 from utils.logger import get_logger
 from utils.data_reader import DataReader
 
 from config.settings import config
-from core.http_client import HTTPClient
+from core.api.token_manager import TokenManager
+from core.capture import get_capture_policy
+from core.client_registry import HeaderClient, client_registry, shared_client
+from core.latency_aggregator import LatencyAggregator
+from core.timing import set_metrics_sink
 from utils.data_generator import DataGenerator
 
-logging.basicConfig(format='%(message)s', level=logging.INFO, force=True)
+pytest_plugins = ["fixtures.case_plugin", "fixtures.allure_plugin"]
+
+DEFAULT_ACCOUNT = {"phone": "18821371697", "password": "Ww12345678.."}
 
 
 @pytest.fixture(scope="session")
 def api_client():
-    client = HTTPClient()
-    yield client
-    client.close()
+    return shared_client()
 
 
 @pytest.fixture(scope="function")
@@ -50,22 +59,22 @@ def setup_allure_environment(request):
     pass
 
 
+@pytest.fixture(scope="session")
+def token_manager(api_client):
+    manager = TokenManager(client=api_client)
+    manager.start()
+    yield manager
+    manager.stop()
+
+
 @pytest.fixture(scope="function")
-def auth_token(api_client):
-    login_data = {"phone": "18821371697", "password": "Ww12345678.."}
-    response = api_client.post("/auth/login", json=login_data)
-    if response.status_code == 200:
-        response_data = response.json()
-        token = response_data.get("data", {}).get("access_token") or response_data.get("data", {}).get("token")
-        return token if token else ""
-    return ""
+def auth_token(token_manager):
+    return token_manager.get_token(**DEFAULT_ACCOUNT) or ""
 
 
 @pytest.fixture(scope="function")
 def authenticated_client(api_client, auth_token):
-    api_client.headers["Authorization"] = f"Bearer {auth_token}"
-    yield api_client
-    api_client.headers.pop("Authorization", None)
+    return HeaderClient(api_client, {"Authorization": f"Bearer {auth_token}"})
 
 
 @pytest.fixture(scope="session")
@@ -88,6 +97,10 @@ def test_cases(data_reader):
     return _load_test_cases
 
 
+def pytest_runtest_setup(item):
+    get_capture_policy().begin()
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
@@ -103,13 +116,16 @@ def pytest_runtest_makereport(item, call):
         
         display_name = f"{test_file}::{test_name}"
         
+        policy = get_capture_policy()
+        policy.end(report.failed)
         if report.failed:
             logger.error(f"✗ {display_name}")
             logger.error(f"失败原因: {report.longreprtext}")
-            allure.attach(
+            policy.attach(
                 str(report.longreprtext),
                 name="失败信息",
                 attachment_type=allure.attachment_type.TEXT,
+                failed=True,
             )
         elif report.passed:
             logger.info(f"✓ {display_name}")
@@ -121,6 +137,16 @@ def pytest_runtest_makereport(item, call):
             allure.label("testMethod", test_method)
 
 
+def pytest_addoption(parser):
+    group = parser.getgroup("framework-bench", "框架基准测试")
+    group.addoption("--framework-bench", action="store_true", default=False, help="运行 tests/performance 下的基准测试")
+    group.addoption("--framework-bench-save", action="store_true", default=False, help="将本次结果写入基线文件")
+    group.addoption(
+        "--framework-bench-threshold", type=float, default=None, help="允许的吞吐量回退比例，默认读取 benchmark.threshold"
+    )
+    group.addoption("--framework-bench-baseline", default=None, help="基线文件路径，默认读取 benchmark.baseline_file")
+
+
 def pytest_configure(config):
     config.addinivalue_line("markers", "smoke: 冒烟测试")
     config.addinivalue_line("markers", "regression: 回归测试")
@@ -131,6 +157,70 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "slow: 慢速测试")
     config.addinivalue_line("markers", "integration: 集成测试")
 
+    aggregator = LatencyAggregator(int(_metrics_settings().get("max_endpoints", 500)))
+    set_metrics_sink(aggregator)
+    config._latency_aggregator = aggregator
+
+    if _metrics_settings().get("allure_attachment") and not hasattr(config, "workerinput"):
+        collector = _AllureResultCollector()
+        allure_commons.plugin_manager.register(collector)
+        config._allure_result_collector = collector
+        config.add_cleanup(lambda: allure_commons.plugin_manager.unregister(collector))
+
+
+class _AllureResultCollector:
+    def __init__(self):
+        self.uuids = []
+
+    @allure_commons.hookimpl
+    def report_result(self, result):
+        self.uuids.append(result.uuid)
+
+
+def _metrics_settings():
+    return config.get("metrics", {}) or {}
+
+
+def _attach_to_allure(pytest_config, report_dir, name, report):
+    collector = getattr(pytest_config, "_allure_result_collector", None)
+    if collector is None or not collector.uuids:
+        return
+    file_logger = getattr(pytest_config, "_allure_writer", None) or AllureFileLogger(report_dir)
+    source = f"{uuid4()}-attachment.json"
+    file_logger.report_attached_data(json.dumps(report, ensure_ascii=False, indent=2), source)
+    now = int(time.time() * 1000)
+    file_logger.report_container(
+        TestResultContainer(
+            uuid=uuid4(),
+            name=name,
+            children=list(collector.uuids),
+            afters=[
+                TestAfterResult(
+                    name=name,
+                    status=Status.PASSED,
+                    start=now,
+                    stop=now,
+                    attachments=[Attachment(name=name, source=source, type="application/json")],
+                )
+            ],
+            start=now,
+            stop=now,
+        )
+    )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    output = getattr(node, "workeroutput", {}).get("latency")
+    if output:
+        node.config._latency_aggregator.merge(LatencyAggregator.from_dict(output))
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    path = getattr(config, "_latency_report_path", None)
+    if path is not None:
+        terminalreporter.write_line(f"接口延迟统计: {path}")
+
 
 def pytest_sessionstart(session):
     logger = get_logger(__name__)
@@ -140,3 +230,23 @@ def pytest_sessionstart(session):
 def pytest_sessionfinish(session, exitstatus):
     logger = get_logger(__name__)
     logger.info(f"测试会话结束 - 退出状态码: {exitstatus}")
+
+    client_registry.close_all()
+
+    aggregator = getattr(session.config, "_latency_aggregator", None)
+    if aggregator is None:
+        return
+    if hasattr(session.config, "workerinput"):
+        session.config.workeroutput["latency"] = aggregator.to_dict()
+        return
+
+    report = aggregator.report()
+    if not report["requests"]:
+        return
+    path = aggregator.write_report(
+        config.base_dir / _metrics_settings().get("latency_report", "reports/latency.json")
+    )
+    session.config._latency_report_path = path
+    report_dir = session.config.getoption("allure_report_dir", None)
+    if report_dir:
+        _attach_to_allure(session.config, report_dir, "接口延迟统计", report)
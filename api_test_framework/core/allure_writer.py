@@ -0,0 +1,205 @@
+import argparse
+import hashlib
+import json
+import os
+import queue
+import shutil
+import tarfile
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from allure_commons import hookimpl
+from attr import asdict
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+
+class DedupAllureWriter:
+    def __init__(
+        self,
+        report_dir: Union[str, Path],
+        blob_dir: Optional[Union[str, Path]] = None,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+    ):
+        self.report_dir = Path(report_dir).absolute()
+        self.blob_dir = Path(blob_dir).absolute() if blob_dir else self.report_dir.parent / "allure-blobs"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+
+        self.counters: Counter = Counter()
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="allure-writer", daemon=True)
+        self._thread.start()
+
+    def _enqueue_item(self, item: Any):
+        file_name = item.file_pattern.format(prefix=uuid.uuid4())
+        self._queue.put(("item", file_name, asdict(item, filter=lambda _, v: v or v is False)))
+
+    @hookimpl
+    def report_result(self, result):
+        self._enqueue_item(result)
+
+    @hookimpl
+    def report_container(self, container):
+        self._enqueue_item(container)
+
+    @hookimpl
+    def report_globals(self, globals_item):
+        self._enqueue_item(globals_item)
+
+    @hookimpl
+    def report_attached_data(self, body, file_name):
+        self._queue.put(("data", file_name, body.encode("utf-8") if isinstance(body, str) else body))
+
+    @hookimpl
+    def report_attached_file(self, source, file_name):
+        self._queue.put(("file", file_name, str(source)))
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch: List[Tuple[str, str, Any]] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    entry = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            if batch:
+                self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Tuple[str, str, Any]]):
+        for kind, file_name, payload in batch:
+            try:
+                if kind == "item":
+                    self._write_atomic(self.report_dir / file_name, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+                    self.counters["results"] += 1
+                elif kind == "data":
+                    self._attach(file_name, payload)
+                else:
+                    with open(payload, "rb") as f:
+                        self._attach(file_name, f.read())
+            except OSError as e:
+                logger.error(f"写入Allure结果失败: {file_name}: {e}")
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def _attach(self, file_name: str, data: bytes):
+        self.counters["attachments"] += 1
+        self.counters["attachment_bytes"] += len(data)
+        destination = self.report_dir / file_name
+        if destination.exists():
+            self.counters["deduped_bytes"] += len(data)
+            return
+        digest = hashlib.sha256(data).hexdigest()
+        blob = self.blob_path(digest)
+        if blob.exists():
+            self.counters["deduped_bytes"] += len(data)
+        else:
+            blob.parent.mkdir(exist_ok=True)
+            self._write_atomic(blob, data)
+            self.counters["blobs"] += 1
+            self.counters["blob_bytes"] += len(data)
+        try:
+            os.link(blob, destination)
+        except FileExistsError:
+            pass
+        except OSError:
+            shutil.copyfile(blob, destination)
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counters)
+
+
+def pack(report_dir: Union[str, Path], archive: Union[str, Path]) -> Path:
+    report_dir = Path(report_dir)
+    archive = Path(archive)
+    archive.parent.mkdir(parents=True, exist_ok=True)
+    with tarfile.open(archive, "w:gz") as tar:
+        for path in sorted(report_dir.iterdir()):
+            if path.is_file() and not path.name.endswith(".tmp"):
+                tar.add(path, arcname=path.name)
+    return archive
+
+
+def unpack(archive: Union[str, Path], report_dir: Union[str, Path]) -> Path:
+    report_dir = Path(report_dir)
+    report_dir.mkdir(parents=True, exist_ok=True)
+    with tarfile.open(archive, "r:gz") as tar:
+        for member in tar.getmembers():
+            if Path(member.name).name != member.name:
+                raise ValueError(f"归档中包含非法路径: {member.name}")
+            if not (member.isfile() or member.islnk()):
+                raise ValueError(f"归档中包含非法文件类型: {member.name}")
+            if member.islnk() and Path(member.linkname).name != member.linkname:
+                raise ValueError(f"归档中包含非法链接: {member.name} -> {member.linkname}")
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(report_dir, filter="data")
+        else:
+            tar.extractall(report_dir)
+    return report_dir
+
+
+def prune(blob_dir: Union[str, Path], min_age_days: float = 1.0, now: Optional[float] = None) -> int:
+    now = time.time() if now is None else now
+    removed = 0
+    for blob in Path(blob_dir).glob("*/*"):
+        stat = blob.stat()
+        if stat.st_nlink == 1 and now - stat.st_mtime >= min_age_days * 86400:
+            blob.unlink()
+            removed += 1
+    return removed
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Allure结果归档与清理")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack_parser = commands.add_parser("pack", help="将结果目录打包为单个归档")
+    pack_parser.add_argument("report_dir")
+    pack_parser.add_argument("archive")
+    unpack_parser = commands.add_parser("unpack", help="将归档解压为结果目录")
+    unpack_parser.add_argument("archive")
+    unpack_parser.add_argument("report_dir")
+    prune_parser = commands.add_parser("prune", help="删除不再被任何结果目录引用的附件")
+    prune_parser.add_argument("blob_dir")
+    prune_parser.add_argument("--min-age-days", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        print(f"已打包: {pack(args.report_dir, args.archive)}")
+    elif args.command == "unpack":
+        print(f"已解压: {unpack(args.archive, args.report_dir)}")
+    else:
+        print(f"已删除 {prune(args.blob_dir, args.min_age_days)} 个未引用的附件")
+
+
+if __name__ == "__main__":
+    main()
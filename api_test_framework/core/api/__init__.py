@@ -1,5 +1,6 @@
 from .base_api import BaseAPI
 from .api_context import APIContext
 from .api_manager import APIManager
+from .batch import BatchResult, RequestSpec
 
-__all__ = ["BaseAPI", "APIContext", "APIManager"]
+__all__ = ["BaseAPI", "APIContext", "APIManager", "BatchResult", "RequestSpec"]
@@ -1,37 +1,134 @@
-from typing import Dict, Any, Optional
-from threading import Lock
+import os
+from contextlib import nullcontext
+from contextvars import ContextVar
+from threading import Lock, local
+from typing import Any, Dict, Optional, Tuple
+
+from config.settings import config
+
+_EMPTY: Dict[str, Any] = {}
+
+
+class _LockedStore:
+    def __init__(self):
+        self.lock = Lock()
+        self._data: Dict[str, Any] = _EMPTY
+
+    def read(self) -> Dict[str, Any]:
+        return self._data
+
+    def write(self, data: Dict[str, Any]):
+        self._data = data
+
+
+class _ThreadStore(local):
+    lock = nullcontext()
+
+    def read(self) -> Dict[str, Any]:
+        return getattr(self, "_data", _EMPTY)
+
+    def write(self, data: Dict[str, Any]):
+        self._data = data
+
+
+class _TaskStore:
+    lock = nullcontext()
+
+    def __init__(self, name: str):
+        self._var: ContextVar = ContextVar(name, default=_EMPTY)
+
+    def read(self) -> Dict[str, Any]:
+        return self._var.get()
+
+    def write(self, data: Dict[str, Any]):
+        self._var.set(data)
+
+
+def worker_id() -> str:
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
 
 
 class APIContext:
-    _instance = None
+    SCOPES = ("thread", "task", "worker", "session", "shared")
+
+    _instances: Dict[Tuple[str, Optional[str]], "APIContext"] = {}
     _lock = Lock()
-    
-    def __new__(cls):
-        if cls._instance is None:
+
+    def __new__(cls, scope: Optional[str] = None, name: Optional[str] = None):
+        scope, name = cls._resolve_scope(scope, name)
+        key = (scope, name)
+        instance = cls._instances.get(key)
+        if instance is None:
             with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._data = {}
-        return cls._instance
-    
+                instance = cls._instances.get(key)
+                if instance is None:
+                    instance = super().__new__(cls)
+                    instance.scope = scope
+                    instance.name = name
+                    instance._store = cls._create_store(scope, name)
+                    cls._instances[key] = instance
+        return instance
+
+    @staticmethod
+    def _resolve_scope(scope: Optional[str], name: Optional[str]) -> Tuple[str, Optional[str]]:
+        scope = scope or str(config.get("context.scope", "shared"))
+        if ":" in scope:
+            scope, name = scope.split(":", 1)
+        if scope not in APIContext.SCOPES:
+            raise ValueError(f"不支持的上下文作用域: {scope}")
+        if scope == "session" and not name:
+            raise ValueError("session作用域需要指定名称")
+        if scope == "worker":
+            name = worker_id()
+        elif scope != "session":
+            name = None
+        return scope, name
+
+    @staticmethod
+    def _create_store(scope: str, name: Optional[str]):
+        if scope == "thread":
+            return _ThreadStore()
+        if scope == "task":
+            return _TaskStore("api_context")
+        return _LockedStore()
+
+    @property
+    def shared(self) -> "APIContext":
+        return APIContext("shared")
+
     def set(self, key: str, value: Any):
-        self._data[key] = value
-    
+        with self._store.lock:
+            data = dict(self._store.read())
+            data[key] = value
+            self._store.write(data)
+
     def get(self, key: str, default: Any = None) -> Any:
-        return self._data.get(key, default)
-    
+        return self._store.read().get(key, default)
+
     def remove(self, key: str):
-        if key in self._data:
-            del self._data[key]
-    
+        with self._store.lock:
+            data = self._store.read()
+            if key in data:
+                data = dict(data)
+                del data[key]
+                self._store.write(data)
+
     def clear(self):
-        self._data.clear()
-    
+        with self._store.lock:
+            self._store.write({})
+
     def get_all(self) -> Dict[str, Any]:
-        return self._data.copy()
-    
+        return dict(self._store.read())
+
     def update(self, data: Dict[str, Any]):
-        self._data.update(data)
-    
+        with self._store.lock:
+            merged = dict(self._store.read())
+            merged.update(data)
+            self._store.write(merged)
+
     def has(self, key: str) -> bool:
-        return key in self._data
+        return key in self._store.read()
+
+    def __repr__(self) -> str:
+        scope = f"{self.scope}:{self.name}" if self.name else self.scope
+        return f"<APIContext scope={scope}>"
@@ -1,13 +1,23 @@
-from typing import Dict, Type, Optional
+import inspect
+from typing import TYPE_CHECKING, Dict, Type, Optional, Union
+from core.client_registry import shared_client
 from core.http_client import HTTPClient
 from core.api.api_context import APIContext
 from core.api.base_api import BaseAPI
 
+if TYPE_CHECKING:
+    from core.async_http_client import AsyncHTTPClient
+
 
 class APIManager:
-    def __init__(self, client: Optional[HTTPClient] = None, context: Optional[APIContext] = None):
-        self.client = client or HTTPClient()
-        self.context = context or APIContext()
+    def __init__(
+        self,
+        client: Optional[Union[HTTPClient, "AsyncHTTPClient"]] = None,
+        context: Optional[APIContext] = None,
+        scope: Optional[str] = None,
+    ):
+        self.client = client or shared_client()
+        self.context = context or APIContext(scope)
         self._apis: Dict[str, BaseAPI] = {}
     
     def register_api(self, name: str, api_class: Type[BaseAPI]) -> BaseAPI:
@@ -21,6 +31,10 @@ class APIManager:
     def get_api(self, name: str) -> Optional[BaseAPI]:
         return self._apis.get(name)
     
+    @property
+    def is_async(self) -> bool:
+        return inspect.iscoroutinefunction(self.client.request)
+    
     def get_context(self) -> APIContext:
         return self.context
     
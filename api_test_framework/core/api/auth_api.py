@@ -13,16 +13,20 @@ class AuthAPI(BaseAPI):
         return response
     
     def login_and_extract_token(self, phone: str, password: str) -> Optional[str]:
-        response = self.login(phone, password)
-        if response.status_code == 200:
-            return self._extract_token(response)
-        return None
+        def _extract(response):
+            if response.status_code == 200:
+                return self._extract_token(response)
+            return None
+        
+        return self._then(self.login(phone, password), _extract)
     
     def logout(self) -> requests.Response:
-        response = self._request("POST", "/auth/logout")
-        if response.status_code == 200:
-            self.context.remove("token")
-        return response
+        def _clear_token(response):
+            if response.status_code == 200:
+                self.context.remove("token")
+            return response
+        
+        return self._then(self._request("POST", "/auth/logout"), _clear_token)
     
     def register(self, phone: str, password: str, confirm_password: str, verification_code: str) -> requests.Response:
         response = self._request(
@@ -58,7 +62,9 @@ class AuthAPI(BaseAPI):
         return response
     
     def refresh_token(self) -> requests.Response:
-        response = self._request("POST", "/auth/refresh-token")
-        if response.status_code == 200:
-            self._extract_token(response)
-        return response
+        def _update_token(response):
+            if response.status_code == 200:
+                self._extract_token(response)
+            return response
+        
+        return self._then(self._request("POST", "/auth/refresh-token"), _update_token)
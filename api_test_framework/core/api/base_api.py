@@ -1,14 +1,40 @@
-from typing import Dict, Optional, Any
+import asyncio
+import contextvars
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
 import requests
+from config.settings import config
+from core.client_registry import shared_client
 from core.http_client import HTTPClient
 from core.api.api_context import APIContext
+from core.api.batch import BatchResult, RequestSpec
+
+if TYPE_CHECKING:
+    from core.async_http_client import AsyncHTTPClient
 
 
 class BaseAPI:
-    def __init__(self, client: Optional[HTTPClient] = None, context: Optional[APIContext] = None):
-        self.client = client or HTTPClient()
+    def __init__(
+        self,
+        client: Optional[Union[HTTPClient, "AsyncHTTPClient"]] = None,
+        context: Optional[APIContext] = None,
+    ):
+        self.client = client or shared_client()
         self.context = context or APIContext()
     
+    @property
+    def is_async(self) -> bool:
+        return inspect.iscoroutinefunction(self.client.request)
+    
+    def _then(self, response: Any, callback: Callable[[Any], Any]) -> Any:
+        if inspect.isawaitable(response):
+            async def _chain():
+                return callback(await response)
+            return _chain()
+        return callback(response)
+    
     def _request(
         self,
         method: str,
@@ -34,6 +60,104 @@ class BaseAPI:
         else:
             raise ValueError(f"不支持的HTTP方法: {method}")
     
+    def _call_spec(self, spec: Any) -> Any:
+        if isinstance(spec, RequestSpec):
+            return self._request(
+                spec.method,
+                spec.endpoint,
+                data=spec.data,
+                json=spec.json,
+                params=spec.params,
+                headers=spec.headers,
+                **spec.kwargs,
+            )
+        if isinstance(spec, dict):
+            return self._call_spec(RequestSpec.from_dict(spec))
+        if isinstance(spec, tuple) and len(spec) == 2 and callable(spec[0]):
+            func, kwargs = spec
+            return func(**(kwargs or {}))
+        if callable(spec):
+            return spec()
+        raise TypeError(f"不支持的批量请求描述: {spec!r}")
+
+    def _batch_workers(self, count: int, max_workers: Optional[int]) -> int:
+        workers = max_workers or int(config.pool.get("maxsize", 10))
+        return max(1, min(workers, count))
+
+    def _run_spec(self, index: int, spec: Any) -> BatchResult:
+        start = time.perf_counter()
+        try:
+            response = self._call_spec(spec)
+        except Exception as e:
+            return BatchResult(index, spec, error=e, elapsed_ms=(time.perf_counter() - start) * 1000)
+        return BatchResult(index, spec, response=response, elapsed_ms=(time.perf_counter() - start) * 1000)
+
+    def iter_batch(self, specs: Iterable[Any], max_workers: Optional[int] = None) -> Iterator[BatchResult]:
+        if self.is_async:
+            raise TypeError("异步客户端请使用 await batch(...)")
+        specs = list(specs)
+        if not specs:
+            return
+        with ThreadPoolExecutor(max_workers=self._batch_workers(len(specs), max_workers)) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, self._run_spec, index, spec)
+                for index, spec in enumerate(specs)
+            ]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def batch(
+        self,
+        specs: Iterable[Any],
+        max_workers: Optional[int] = None,
+        on_result: Optional[Callable[[BatchResult], Any]] = None,
+    ) -> List[BatchResult]:
+        specs = list(specs)
+        if self.is_async:
+            return self._batch_async(specs, max_workers, on_result)
+        results: List[Optional[BatchResult]] = [None] * len(specs)
+        for result in self.iter_batch(specs, max_workers):
+            results[result.index] = result
+            if on_result is not None:
+                on_result(result)
+        return results
+
+    async def _batch_async(
+        self,
+        specs: List[Any],
+        max_workers: Optional[int],
+        on_result: Optional[Callable[[BatchResult], Any]],
+    ) -> List[BatchResult]:
+        semaphore = asyncio.Semaphore(self._batch_workers(len(specs), max_workers))
+
+        async def _run(index: int, spec: Any) -> BatchResult:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = self._call_spec(spec)
+                    if inspect.isawaitable(response):
+                        response = await response
+                except Exception as e:
+                    return BatchResult(index, spec, error=e, elapsed_ms=(time.perf_counter() - start) * 1000)
+                return BatchResult(index, spec, response=response, elapsed_ms=(time.perf_counter() - start) * 1000)
+
+        tasks = [asyncio.ensure_future(_run(index, spec)) for index, spec in enumerate(specs)]
+        results: List[Optional[BatchResult]] = [None] * len(specs)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                results[result.index] = result
+                if on_result is not None:
+                    on_result(result)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return results
+
     def _get_headers(self, additional_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         headers = {}
         
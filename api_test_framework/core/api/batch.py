@@ -0,0 +1,40 @@
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class RequestSpec:
+    method: str
+    endpoint: str
+    params: Optional[Dict[str, Any]] = None
+    json: Optional[Any] = None
+    data: Optional[Any] = None
+    headers: Optional[Dict[str, str]] = None
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> "RequestSpec":
+        names = {f.name for f in fields(cls)} - {"kwargs"}
+        known = {key: value for key, value in spec.items() if key in names}
+        extra = {key: value for key, value in spec.items() if key not in names}
+        extra.update(spec.get("kwargs") or {})
+        extra.pop("kwargs", None)
+        return cls(**known, kwargs=extra)
+
+
+@dataclass
+class BatchResult:
+    index: int
+    spec: Any
+    response: Any = None
+    error: Optional[BaseException] = None
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.response
@@ -0,0 +1,264 @@
+import base64
+import contextvars
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, List, Optional, Union
+
+from config.settings import config
+from core.api.api_context import APIContext
+from core.api.auth_api import AuthAPI
+from core.client_registry import shared_client
+from core.http_client import HTTPClient
+from utils.file_lock import file_lock
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def decode_jwt_exp(token: str) -> Optional[float]:
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except ValueError:
+        return None
+    exp = claims.get("exp") if isinstance(claims, dict) else None
+    if isinstance(exp, bool) or not isinstance(exp, (int, float)):
+        return None
+    return float(exp)
+
+
+@dataclass
+class TokenEntry:
+    token: str
+    expires_at: float
+
+    def expires_in(self, now: Optional[float] = None) -> float:
+        return self.expires_at - (time.time() if now is None else now)
+
+
+class TokenCache:
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+
+    def _read(self) -> Dict[str, List[Dict]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, data: Dict[str, List[Dict]]):
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def load(self, key: str) -> List[TokenEntry]:
+        with file_lock(self.lock_path):
+            return [TokenEntry(**item) for item in self._read().get(key, [])]
+
+    def update(
+        self, key: str, func: Callable[[List[TokenEntry]], List[TokenEntry]]
+    ) -> List[TokenEntry]:
+        with file_lock(self.lock_path):
+            data = self._read()
+            entries = func([TokenEntry(**item) for item in data.get(key, [])])
+            data[key] = [asdict(entry) for entry in entries]
+            self._write(self._prune(data))
+        return entries
+
+    @staticmethod
+    def _prune(data: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        now = time.time()
+        pruned = {}
+        for key, items in data.items():
+            alive = [item for item in items if isinstance(item, dict) and item.get("expires_at", 0) > now]
+            if alive:
+                pruned[key] = alive
+        return pruned
+
+
+class TokenManager:
+    MIN_TTL = 30
+
+    def __init__(
+        self,
+        client: Optional[HTTPClient] = None,
+        pool_size: Optional[int] = None,
+        refresh_margin: Optional[float] = None,
+        refresh_interval: Optional[float] = None,
+        default_ttl: Optional[float] = None,
+        cache_path: Optional[Union[str, Path]] = None,
+    ):
+        settings = dict(config.get("token_manager", {}))
+        self.client = client or shared_client()
+        self.auth_api = AuthAPI(client=self.client, context=APIContext("task"))
+        self.pool_size = int(pool_size or settings.get("pool_size", 1))
+        self.refresh_margin = float(refresh_margin or settings.get("refresh_margin", 300))
+        self.refresh_interval = float(refresh_interval or settings.get("refresh_interval", 30))
+        self.default_ttl = float(default_ttl or settings.get("default_ttl", 3600))
+
+        cache_file = cache_path or settings.get("cache_file")
+        self.cache = TokenCache(config.base_dir / cache_file) if cache_file else None
+
+        self.logins = 0
+        self.refreshes = 0
+        self._accounts: Dict[str, str] = {}
+        self._pools: Dict[str, List[TokenEntry]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = Lock()
+        self._account_locks: Dict[str, Lock] = {}
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    def _cache_key(self, phone: str) -> str:
+        return f"{self.client.base_url}|{phone}"
+
+    def _account_lock(self, phone: str) -> Lock:
+        with self._lock:
+            return self._account_locks.setdefault(phone, Lock())
+
+    def _expires_at(self, token: str) -> float:
+        exp = decode_jwt_exp(token)
+        return exp if exp is not None else time.time() + self.default_ttl
+
+    def _acquire(self, phone: str) -> Optional[TokenEntry]:
+        now = time.time()
+        with self._lock:
+            pool = [e for e in self._pools.get(phone, []) if e.expires_in(now) > self.MIN_TTL]
+            self._pools[phone] = pool
+            if not pool:
+                return None
+            cursor = self._cursors.get(phone, 0)
+            self._cursors[phone] = cursor + 1
+            return pool[cursor % len(pool)]
+
+    def _login(self, phone: str, password: str) -> Optional[TokenEntry]:
+        token = contextvars.Context().run(
+            self.auth_api.login_and_extract_token, phone, password
+        )
+        if not token:
+            logger.warning(f"账号{phone}登录失败，无法获取token")
+            return None
+        self.logins += 1
+        return TokenEntry(token, self._expires_at(token))
+
+    def _refresh(self, entry: TokenEntry) -> Optional[TokenEntry]:
+        def _call():
+            self.auth_api.context.set("token", entry.token)
+            response = self.auth_api.refresh_token()
+            return self.auth_api.context.get("token") if response.status_code == 200 else None
+
+        try:
+            token = contextvars.Context().run(_call)
+        except Exception as e:
+            logger.warning(f"刷新token失败: {e}")
+            return None
+        if not token or token == entry.token:
+            return None
+        self.refreshes += 1
+        return TokenEntry(token, self._expires_at(token))
+
+    def _renew(self, phone: str, entries: List[TokenEntry], min_ttl: float) -> List[TokenEntry]:
+        now = time.time()
+        renewed = []
+        for entry in entries:
+            if entry.expires_in(now) > min_ttl:
+                renewed.append(entry)
+            elif entry.expires_in(now) > 0:
+                refreshed = self._refresh(entry)
+                if refreshed is not None:
+                    renewed.append(refreshed)
+
+        password = self._accounts[phone]
+        while len(renewed) < self.pool_size:
+            entry = self._login(phone, password)
+            if entry is None:
+                break
+            renewed.append(entry)
+        return renewed[: max(self.pool_size, 1)]
+
+    def _fill_pool(self, phone: str, min_ttl: float):
+        with self._lock:
+            current = list(self._pools.get(phone, []))
+
+        if self.cache is not None:
+            entries = self.cache.update(
+                self._cache_key(phone),
+                lambda cached: self._renew(phone, cached or current, min_ttl),
+            )
+        else:
+            entries = self._renew(phone, current, min_ttl)
+
+        with self._lock:
+            self._pools[phone] = entries
+
+    def register_account(self, phone: str, password: str):
+        self._accounts[phone] = password
+
+    def get_token(self, phone: str, password: str) -> Optional[str]:
+        self.register_account(phone, password)
+        entry = self._acquire(phone)
+        if entry is None:
+            with self._account_lock(phone):
+                entry = self._acquire(phone)
+                if entry is None:
+                    self._fill_pool(phone, self.MIN_TTL)
+                    entry = self._acquire(phone)
+        return entry.token if entry else None
+
+    def invalidate(self, phone: str, token: str):
+        with self._lock:
+            self._pools[phone] = [e for e in self._pools.get(phone, []) if e.token != token]
+        if self.cache is not None:
+            self.cache.update(
+                self._cache_key(phone),
+                lambda cached: [e for e in cached if e.token != token],
+            )
+
+    def refresh_expiring(self):
+        now = time.time()
+        for phone in list(self._accounts):
+            with self._lock:
+                pool = list(self._pools.get(phone, []))
+            if len(pool) >= self.pool_size and all(
+                e.expires_in(now) > self.refresh_margin for e in pool
+            ):
+                continue
+            try:
+                with self._account_lock(phone):
+                    self._fill_pool(phone, self.refresh_margin)
+            except Exception as e:
+                logger.warning(f"刷新账号{phone}的token失败: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh_expiring()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="token-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.refresh_interval)
+            self._thread = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            pooled = sum(len(pool) for pool in self._pools.values())
+        return {"logins": self.logins, "refreshes": self.refreshes, "pooled": pooled}
@@ -9,10 +9,12 @@ class UserAPI(BaseAPI):
         return response
     
     def get_profile_and_extract(self) -> Optional[Dict]:
-        response = self.get_profile()
-        if response.status_code == 200:
-            return self._extract_data(response)
-        return None
+        def _extract(response):
+            if response.status_code == 200:
+                return self._extract_data(response)
+            return None
+        
+        return self._then(self.get_profile(), _extract)
     
     def update_profile(self, data: Dict) -> requests.Response:
         response = self._request("PUT", "/user/profile", json=data)
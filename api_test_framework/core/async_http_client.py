@@ -0,0 +1,238 @@
+import asyncio
+import json as jsonlib
+import time
+from datetime import timedelta
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+from requests.structures import CaseInsensitiveDict
+
+from config.settings import config
+from core.resilience import IDEMPOTENT_METHODS, ResiliencePolicy
+from core.response import APIResponse
+
+
+class AsyncResponse:
+    def __init__(
+        self,
+        status_code: int,
+        headers: CaseInsensitiveDict,
+        content: bytes,
+        url: str,
+        reason: Optional[str] = None,
+        elapsed: Optional[timedelta] = None,
+        encoding: Optional[str] = None,
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.reason = reason
+        self.elapsed = elapsed or timedelta(0)
+        self.encoding = encoding
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self, **kwargs) -> Any:
+        return jsonlib.loads(self.text, **kwargs)
+
+    def iter_content(self, chunk_size: int = 1, decode_unicode: bool = False) -> Iterator:
+        for start in range(0, len(self.content), chunk_size):
+            chunk = self.content[start : start + chunk_size]
+            yield chunk.decode(self.encoding or "utf-8") if decode_unicode else chunk
+
+    def __repr__(self) -> str:
+        return f"<AsyncResponse [{self.status_code}]>"
+
+
+class AsyncHTTPClient:
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Optional[int] = None,
+        headers: Optional[Dict[str, str]] = None,
+        limit: int = 100,
+        resilience: Optional[ResiliencePolicy] = None,
+    ):
+        self.base_url = base_url or config.base_url
+        self.timeout = timeout or config.timeout
+        self.headers = headers or config.headers.copy()
+        self.limit = limit
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.resilience = resilience or ResiliencePolicy()
+
+        retry_config = config.retry
+        self.retry_total = retry_config.get("total", 3)
+        self.status_forcelist = set(
+            retry_config.get("status_forcelist", [429, 500, 502, 503, 504])
+        )
+        self.allowed_methods = {
+            m.upper() for m in retry_config.get("allowed_methods", IDEMPOTENT_METHODS)
+        }
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(limit=self.limit)
+        return aiohttp.ClientSession(connector=connector)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        return self._session
+
+    def _build_url(self, endpoint: str) -> str:
+        endpoint = endpoint.lstrip("/")
+        return f"{self.base_url}/{endpoint}"
+
+    def _update_headers(
+        self, headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        merged_headers = self.headers.copy()
+        if headers:
+            merged_headers.update(headers)
+        return merged_headers
+
+    def _get_backoff_time(self, attempt: int) -> float:
+        return self.resilience.backoff(attempt)
+
+    def _get_retry_after(self, response: AsyncResponse) -> Optional[float]:
+        if response.status_code not in (413, 429, 503):
+            return None
+        return self.resilience.retry_after(
+            urlsplit(response.url).netloc, response.headers.get("Retry-After")
+        )
+
+    def _prepare_kwargs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        params = kwargs.get("params")
+        if params is not None:
+            kwargs["params"] = {k: str(v) for k, v in params.items() if v is not None}
+        else:
+            kwargs.pop("params", None)
+
+        timeout = kwargs.pop("timeout")
+        kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        if "verify" in kwargs:
+            kwargs["ssl"] = None if kwargs.pop("verify") else False
+        return kwargs
+
+    async def _send(self, method: str, url: str, **kwargs) -> AsyncResponse:
+        session = self._get_session()
+        start = time.perf_counter()
+        async with session.request(method, url, **kwargs) as resp:
+            content = await resp.read()
+        return AsyncResponse(
+            status_code=resp.status,
+            headers=CaseInsensitiveDict(resp.headers),
+            content=content,
+            url=str(resp.url),
+            reason=resp.reason,
+            elapsed=timedelta(seconds=time.perf_counter() - start),
+            encoding=resp.charset,
+        )
+
+    async def request(self, method: str, endpoint: str, **kwargs) -> APIResponse:
+        method = method.upper()
+        url = self._build_url(endpoint)
+        kwargs.setdefault("timeout", self.timeout)
+        kwargs.setdefault("headers", {})
+        kwargs["headers"] = self._update_headers(kwargs["headers"])
+        kwargs = self._prepare_kwargs(kwargs)
+
+        host = urlsplit(url).netloc
+        self.resilience.before_request(host)
+        try:
+            response = await self._send_with_retries(method, url, host, **kwargs)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            self.resilience.record_result(host, error=e)
+            raise
+        except BaseException:
+            self.resilience.release(host)
+            raise
+        self.resilience.record_result(host, response.status_code)
+        return APIResponse(response)
+
+    async def _send_with_retries(self, method: str, url: str, host: str, **kwargs) -> AsyncResponse:
+        can_retry = method in self.allowed_methods
+        attempt = 0
+        while True:
+            try:
+                response = await self._send(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if (
+                    not (can_retry or isinstance(e, aiohttp.ClientConnectorError))
+                    or attempt >= self.retry_total
+                    or not self.resilience.allow_retry(host)
+                ):
+                    raise
+                attempt += 1
+                await asyncio.sleep(self._get_backoff_time(attempt))
+                continue
+
+            if (
+                not can_retry
+                or response.status_code not in self.status_forcelist
+                or attempt >= self.retry_total
+                or not self.resilience.allow_retry(host)
+            ):
+                return response
+
+            attempt += 1
+            retry_after = self._get_retry_after(response)
+            await asyncio.sleep(
+                retry_after
+                if retry_after is not None
+                else self._get_backoff_time(attempt)
+            )
+
+    async def get(
+        self, endpoint: str, params: Optional[Dict] = None, **kwargs
+    ) -> APIResponse:
+        return await self.request("GET", endpoint, params=params, **kwargs)
+
+    async def post(
+        self,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+        **kwargs,
+    ) -> APIResponse:
+        return await self.request("POST", endpoint, data=data, json=json, **kwargs)
+
+    async def put(
+        self,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+        **kwargs,
+    ) -> APIResponse:
+        return await self.request("PUT", endpoint, data=data, json=json, **kwargs)
+
+    async def delete(self, endpoint: str, **kwargs) -> APIResponse:
+        return await self.request("DELETE", endpoint, **kwargs)
+
+    async def patch(
+        self,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+        **kwargs,
+    ) -> APIResponse:
+        return await self.request("PATCH", endpoint, data=data, json=json, **kwargs)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
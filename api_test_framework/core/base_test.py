@@ -1,12 +1,12 @@
-import json
 from typing import Any, Dict, Optional
 
 import allure
 import pytest
 
-from core.http_client import HTTPClient
+from core.capture import get_capture_policy
+from core.client_registry import shared_client
 from core.validator import ResponseValidator
-from utils.logger import get_logger
+from utils.logger import LazyBody, LazyJSON, get_logger
 
 logger = get_logger(__name__)
 
@@ -14,26 +14,22 @@ logger = get_logger(__name__)
 class BaseAPITest:
     @pytest.fixture(autouse=True)
     def setup(self):
-        self.client = HTTPClient()
+        self.client = shared_client()
         self.validator = ResponseValidator()
         logger.info(f"开始测试: {self.__class__.__name__}")
         yield
-        self.client.close()
         logger.info(f"结束测试: {self.__class__.__name__}")
 
     def log_request(self, method: str, endpoint: str, **kwargs):
-        logger.info(f"请求: {method.upper()} {endpoint}")
+        logger.info("请求: %s %s", method.upper(), endpoint)
         if kwargs.get("params"):
-            logger.info(f"参数: {kwargs['params']}")
+            logger.info("参数: %s", kwargs["params"])
         if kwargs.get("json"):
-            logger.info(f"请求体: {json.dumps(kwargs['json'], ensure_ascii=False)}")
+            logger.info("请求体: %s", LazyJSON(kwargs["json"]))
 
     def log_response(self, response):
-        logger.info(f"响应状态: {response.status_code}")
-        try:
-            logger.info(f"响应体: {json.dumps(response.json(), ensure_ascii=False)}")
-        except:
-            logger.info(f"响应体: {response.text}")
+        logger.info("响应状态: %s", response.status_code)
+        logger.info("响应体: %s", LazyBody(response, get_capture_policy().truncate))
 
     @allure.step("发送GET请求")
     def get(self, endpoint: str, expected_status: int = 200, **kwargs):
@@ -92,8 +88,8 @@ class BaseAPITest:
         self.validator.validate_array_length(response, field_path, expected_length)
 
     @allure.step("验证响应时间")
-    def assert_response_time(self, response, max_time_ms: int):
-        self.validator.validate_response_time(response, max_time_ms)
+    def assert_response_time(self, response, max_time_ms: int, phase: Optional[str] = None):
+        self.validator.validate_response_time(response, max_time_ms, phase)
 
     @allure.step("验证JSON Schema")
     def assert_schema(self, response, schema: Dict[str, Any]):
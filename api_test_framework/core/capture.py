@@ -0,0 +1,129 @@
+import hashlib
+import random
+from threading import Lock
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+import allure
+from allure_commons import plugin_manager
+
+from config.settings import config
+
+TEXT = allure.attachment_type.TEXT
+
+
+def _reporters() -> List[Any]:
+    return [plugin.allure_logger for plugin in plugin_manager.get_plugins() if hasattr(plugin, "allure_logger")]
+
+
+class CapturePolicy:
+    def __init__(
+        self,
+        max_body_kb: float = 64,
+        success_sample_rate: float = 1.0,
+        dedupe: bool = True,
+        max_pending: int = 20,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.max_body_bytes = int(max_body_kb * 1024)
+        self.success_sample_rate = success_sample_rate
+        self.dedupe = dedupe
+        self.max_pending = max_pending
+        self._rng = rng
+        self._lock = Lock()
+        self._sampled: Optional[bool] = None
+        self._pending: List[Tuple[Union[str, bytes], str, Any]] = []
+        self.stored = 0
+        self.dropped = 0
+
+    @classmethod
+    def from_config(cls) -> "CapturePolicy":
+        settings = config.get("capture", {}) or {}
+        return cls(
+            max_body_kb=float(settings.get("max_body_kb", 64)),
+            success_sample_rate=float(settings.get("success_sample_rate", 1.0)),
+            dedupe=bool(settings.get("dedupe", True)),
+            max_pending=int(settings.get("max_pending", 20)),
+        )
+
+    def truncate(self, text: str) -> str:
+        if self.max_body_bytes <= 0 or len(text) * 4 <= self.max_body_bytes:
+            return text
+        data = text.encode("utf-8")
+        if len(data) <= self.max_body_bytes:
+            return text
+        head = data[: self.max_body_bytes].decode("utf-8", errors="ignore")
+        return f"{head}\n...（已截断，原始大小 {len(data)} 字节）"
+
+    def _draw(self) -> bool:
+        return self.success_sample_rate >= 1 or self._rng() < self.success_sample_rate
+
+    def begin(self):
+        with self._lock:
+            self._sampled = self._draw()
+            self._pending = []
+
+    def end(self, failed: bool):
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._sampled = None
+        if failed:
+            for body, name, attachment_type in pending:
+                self._store(body, name, attachment_type)
+        else:
+            self.dropped += len(pending)
+
+    def _store(self, body: Union[str, bytes], name: str, attachment_type: Any):
+        self.stored += 1
+        if not self.dedupe:
+            allure.attach(body, name=name, attachment_type=attachment_type)
+            return
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        digest = hashlib.sha1(data).hexdigest()
+        for reporter in _reporters():
+            reporter.attach_data(digest, body, name=name, attachment_type=attachment_type)
+
+    def attach(self, body: Union[str, bytes], name: str, attachment_type: Any = TEXT, failed: bool = False):
+        if isinstance(body, str):
+            body = self.truncate(body)
+        with self._lock:
+            sampled = self._sampled
+            if not failed and sampled is False:
+                if len(self._pending) < self.max_pending:
+                    self._pending.append((body, name, attachment_type))
+                else:
+                    self.dropped += 1
+                return
+        if failed or sampled or self._draw():
+            self._store(body, name, attachment_type)
+        else:
+            self.dropped += 1
+
+    def attach_response(self, response: Any, failed: Optional[bool] = None):
+        if failed is None:
+            failed = response.status_code >= 400
+        self.attach(f"状态码: {response.status_code}", name="响应状态", failed=True)
+        self.attach(response.text, name="响应内容", failed=failed)
+
+
+_policy: Optional[CapturePolicy] = None
+
+
+def get_capture_policy() -> CapturePolicy:
+    global _policy
+    if _policy is None:
+        _policy = CapturePolicy.from_config()
+    return _policy
+
+
+def set_capture_policy(policy: Optional[CapturePolicy]) -> Optional[CapturePolicy]:
+    global _policy
+    previous, _policy = _policy, policy
+    return previous
+
+
+def attach(body: Union[str, bytes], name: str, attachment_type: Any = TEXT, failed: bool = False):
+    get_capture_policy().attach(body, name, attachment_type, failed)
+
+
+def attach_response(response: Any, failed: Optional[bool] = None):
+    get_capture_policy().attach_response(response, failed)
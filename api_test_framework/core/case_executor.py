@@ -0,0 +1,162 @@
+import importlib
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+
+from core.api.api_context import APIContext
+from core.api.auth_api import AuthAPI
+from core.api.base_api import BaseAPI
+from core.api.batch import BatchResult
+from core.api.standalone_transfer_api import StandaloneTransferAPI
+from core.api.user_api import UserAPI
+from core.http_client import HTTPClient
+from utils.data_reader import DataReader
+
+BUILTIN_APIS: Dict[str, Type[BaseAPI]] = {cls.__name__: cls for cls in (AuthAPI, UserAPI, StandaloneTransferAPI)}
+
+
+def resolve_api(name: str) -> Type[BaseAPI]:
+    if name in BUILTIN_APIS:
+        return BUILTIN_APIS[name]
+    module_name, _, class_name = name.rpartition(".")
+    if not module_name:
+        raise ValueError(f"未知的API类: {name}")
+    api_class = getattr(importlib.import_module(module_name), class_name, None)
+    if not isinstance(api_class, type) or not issubclass(api_class, BaseAPI):
+        raise ValueError(f"{name} 不是BaseAPI的子类")
+    return api_class
+
+
+@dataclass
+class CaseSuite:
+    path: Path
+    api: Type[BaseAPI]
+    cases: List[Dict[str, Any]]
+    operations: Dict[str, str] = field(default_factory=dict)
+    auth: Optional[Dict[str, str]] = None
+    markers: List[str] = field(default_factory=list)
+    max_workers: Optional[int] = None
+
+    @classmethod
+    def load(cls, path: Union[str, Path], reader: Optional[DataReader] = None) -> Optional["CaseSuite"]:
+        path = Path(path)
+        data = (reader or DataReader(path.parent)).read_file(path)
+        if not isinstance(data, dict) or "api" not in data:
+            return None
+        return cls(
+            path=path,
+            api=resolve_api(data["api"]),
+            cases=list(data.get("test_cases") or []),
+            operations={method.upper(): name for method, name in (data.get("operations") or {}).items()},
+            auth=data.get("auth"),
+            markers=list(data.get("markers") or []),
+            max_workers=data.get("max_workers"),
+        )
+
+    def operation(self, case: Dict[str, Any]) -> str:
+        name = case.get("operation") or self.operations.get(str(case.get("method", "")).upper())
+        if not name or not callable(getattr(self.api, name, None)):
+            raise ValueError(f"用例{case.get('case_id', '')}没有对应的接口方法: {self.api.__name__}.{name}")
+        return name
+
+
+@dataclass
+class CaseResult:
+    case: Dict[str, Any]
+    response: Any = None
+    error: Optional[BaseException] = None
+    failures: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def case_id(self) -> str:
+        return str(self.case.get("case_id", ""))
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None and not self.failures
+
+
+def check_case(api: BaseAPI, case: Dict[str, Any], response: Any) -> List[str]:
+    checks = [
+        ("expected_status", api._validate_status_code),
+        ("expected_code", api._validate_response_code),
+        ("expected_message", api._validate_message_contains),
+    ]
+    failures = []
+    for key, validate in checks:
+        if key not in case:
+            continue
+        try:
+            validate(response, case[key])
+        except AssertionError as e:
+            failures.append(str(e))
+        except ValueError as e:
+            failures.append(f"响应不是有效的JSON: {e}")
+            break
+    return failures
+
+
+class CaseExecutor:
+    def __init__(
+        self,
+        suite: CaseSuite,
+        client: Optional[HTTPClient] = None,
+        token: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.suite = suite
+        self.api = suite.api(client=client, context=APIContext(f"session:cases:{suite.path.stem}"))
+        self.max_workers = max_workers or suite.max_workers
+        self.api.context.clear()
+        if token:
+            self.api.context.set("token", token)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], **kwargs) -> "CaseExecutor":
+        suite = CaseSuite.load(path)
+        if suite is None:
+            raise ValueError(f"用例文件缺少api声明: {path}")
+        return cls(suite, **kwargs)
+
+    def _spec(self, case: Dict[str, Any]) -> Callable[[], Any]:
+        method = getattr(self.api, self.suite.operation(case))
+        return partial(method, **(case.get("params") or {}))
+
+    def _result(self, case: Dict[str, Any], batch_result: BatchResult) -> CaseResult:
+        result = CaseResult(case, batch_result.response, batch_result.error, elapsed_ms=batch_result.elapsed_ms)
+        if result.error is None:
+            result.failures = check_case(self.api, case, result.response)
+        return result
+
+    def _iter(self, cases: List[Dict[str, Any]]) -> Iterator[Tuple[int, CaseResult]]:
+        specs = []
+        for case in cases:
+            try:
+                specs.append(self._spec(case))
+            except ValueError as e:
+                specs.append(partial(_raise, e))
+        for batch_result in self.api.iter_batch(specs, self.max_workers):
+            yield batch_result.index, self._result(cases[batch_result.index], batch_result)
+
+    def iter_results(self, cases: Optional[Iterable[Dict[str, Any]]] = None) -> Iterator[CaseResult]:
+        for _, result in self._iter(list(self.suite.cases if cases is None else cases)):
+            yield result
+
+    def run(
+        self,
+        cases: Optional[Iterable[Dict[str, Any]]] = None,
+        on_result: Optional[Callable[[CaseResult], Any]] = None,
+    ) -> List[CaseResult]:
+        cases = list(self.suite.cases if cases is None else cases)
+        results: List[Optional[CaseResult]] = [None] * len(cases)
+        for index, result in self._iter(cases):
+            results[index] = result
+            if on_result is not None:
+                on_result(result)
+        return results
+
+
+def _raise(error: BaseException):
+    raise error
@@ -0,0 +1,230 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from datetime import timedelta
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from config.settings import config
+from utils.file_lock import file_lock
+
+
+_DECODED_HEADERS = ("content-encoding", "transfer-encoding", "content-length")
+
+
+class CassetteMiss(LookupError):
+    pass
+
+
+class CassetteStore:
+    INDEX_RECORD = struct.Struct(">20sQI")
+    RECORD_HEADER = struct.Struct(">II")
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.data_path = self.path / "data.bin"
+        self.index_path = self.path / "index.bin"
+        self.lock_path = self.path / "store.lock"
+        self.data_path.touch(exist_ok=True)
+        self.index_path.touch(exist_ok=True)
+
+        self._lock = Lock()
+        self._index: Dict[bytes, Tuple[int, int]] = {}
+        self._index_size = 0
+        self._data_file = open(self.data_path, "rb")
+        self._data_map: Optional[mmap.mmap] = None
+        self._refresh_index()
+
+    def _refresh_index(self):
+        size = os.path.getsize(self.index_path)
+        usable = size - size % self.INDEX_RECORD.size
+        if usable <= self._index_size:
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_size)
+            buf = f.read(usable - self._index_size)
+        for key, offset, length in self.INDEX_RECORD.iter_unpack(buf):
+            self._index[key] = (offset, length)
+        self._index_size = usable
+
+    def _view(self, end: int) -> mmap.mmap:
+        if self._data_map is None or len(self._data_map) < end:
+            if self._data_map is not None:
+                self._data_map.close()
+            self._data_map = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._data_map
+
+    def get(self, key: bytes) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                self._refresh_index()
+                entry = self._index.get(key)
+                if entry is None:
+                    return None
+            offset, length = entry
+            view = self._view(offset + length)
+            meta_len, body_len = self.RECORD_HEADER.unpack_from(view, offset)
+            start = offset + self.RECORD_HEADER.size
+            meta = json.loads(view[start : start + meta_len])
+            body = view[start + meta_len : start + meta_len + body_len]
+        return meta, body
+
+    def put(self, key: bytes, meta: Dict[str, Any], body: bytes):
+        meta_bytes = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+        record = self.RECORD_HEADER.pack(len(meta_bytes), len(body)) + meta_bytes + body
+        with self._lock, file_lock(self.lock_path):
+            with open(self.data_path, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(record)
+            with open(self.index_path, "ab") as f:
+                f.write(self.INDEX_RECORD.pack(key, offset, len(record)))
+            self._refresh_index()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh_index()
+            return len(self._index)
+
+    def __contains__(self, key: bytes) -> bool:
+        with self._lock:
+            if key not in self._index:
+                self._refresh_index()
+            return key in self._index
+
+    def close(self):
+        with self._lock:
+            if self._data_map is not None:
+                self._data_map.close()
+                self._data_map = None
+            self._data_file.close()
+
+
+class Cassette:
+    MODES = ("off", "record", "replay", "auto")
+
+    def __init__(self, path: Union[str, Path], mode: str = "auto"):
+        if mode not in self.MODES:
+            raise ValueError(f"不支持的录制回放模式: {mode}")
+        self.mode = mode
+        self.store = CassetteStore(path)
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+    @property
+    def can_replay(self) -> bool:
+        return self.mode in ("replay", "auto")
+
+    @property
+    def can_record(self) -> bool:
+        return self.mode in ("record", "auto")
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        parts = urlsplit(url)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit(
+            (parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, "")
+        )
+
+    @staticmethod
+    def body_digest(prepared: requests.PreparedRequest) -> str:
+        body = prepared.body
+        if body is None:
+            return ""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if not isinstance(body, bytes):
+            return type(body).__name__
+
+        content_type = prepared.headers.get("Content-Type", "")
+        if "json" in content_type:
+            try:
+                body = json.dumps(
+                    json.loads(body), sort_keys=True, separators=(",", ":")
+                ).encode("utf-8")
+            except ValueError:
+                pass
+        elif "x-www-form-urlencoded" in content_type:
+            pairs = parse_qsl(body.decode("utf-8"), keep_blank_values=True)
+            body = urlencode(sorted(pairs)).encode("utf-8")
+        return hashlib.sha1(body).hexdigest()
+
+    @classmethod
+    def request_key(cls, prepared: requests.PreparedRequest) -> bytes:
+        fingerprint = "\n".join(
+            (prepared.method.upper(), cls.normalize_url(prepared.url), cls.body_digest(prepared))
+        )
+        return hashlib.sha1(fingerprint.encode("utf-8")).digest()
+
+    def replay(self, prepared: requests.PreparedRequest) -> Optional[requests.Response]:
+        found = self.store.get(self.request_key(prepared))
+        if found is None:
+            self.misses += 1
+            if self.mode == "replay":
+                raise CassetteMiss(f"回放模式下未找到录制的请求: {prepared.method} {prepared.url}")
+            return None
+
+        self.hits += 1
+        meta, body = found
+        response = requests.Response()
+        response.status_code = meta["status_code"]
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.url = meta["url"]
+        response.reason = meta["reason"]
+        response.encoding = meta["encoding"]
+        response.elapsed = timedelta(seconds=meta["elapsed"])
+        response._content = body
+        response._content_consumed = True
+        response.request = prepared
+        return response
+
+    def record(self, prepared: requests.PreparedRequest, response: requests.Response):
+        meta = {
+            "status_code": response.status_code,
+            "headers": [
+                (name, value)
+                for name, value in response.headers.items()
+                if name.lower() not in _DECODED_HEADERS
+            ],
+            "url": response.url,
+            "reason": response.reason,
+            "encoding": response.encoding,
+            "elapsed": response.elapsed.total_seconds(),
+        }
+        self.store.put(self.request_key(prepared), meta, response.content)
+        self.recorded += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self.store),
+            "hits": self.hits,
+            "misses": self.misses,
+            "recorded": self.recorded,
+        }
+
+    def close(self):
+        self.store.close()
+
+
+@lru_cache(maxsize=None)
+def open_cassette(path: str, mode: str) -> Cassette:
+    return Cassette(path, mode)
+
+
+def cassette_from_config() -> Optional[Cassette]:
+    settings = config.cassette
+    mode = os.getenv("CASSETTE_MODE") or settings.get("mode") or "off"
+    if mode == "off":
+        return None
+    return open_cassette(str(config.base_dir / settings.get("path", "fixtures/cassettes")), mode)
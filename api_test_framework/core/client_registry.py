@@ -0,0 +1,103 @@
+import atexit
+import os
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+from config.settings import config
+from core.http_client import HTTPClient
+from core.response import APIResponse
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ClientKey = Tuple[str, int, Tuple[Tuple[str, str], ...]]
+
+
+class ClientRegistry:
+    def __init__(self):
+        self._lock = Lock()
+        self._clients: Dict[ClientKey, HTTPClient] = {}
+        self._pid = os.getpid()
+
+    def _key(
+        self,
+        base_url: Optional[str],
+        timeout: Optional[int],
+        headers: Optional[Dict[str, str]],
+    ) -> ClientKey:
+        merged = config.headers.copy() if headers is None else dict(headers)
+        return (
+            (base_url or config.base_url).rstrip("/"),
+            int(timeout or config.timeout),
+            tuple(sorted(merged.items())),
+        )
+
+    def _check_fork(self):
+        if self._pid != os.getpid():
+            self._clients = {}
+            self._pid = os.getpid()
+
+    def get(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Optional[int] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> HTTPClient:
+        key = self._key(base_url, timeout, headers)
+        with self._lock:
+            self._check_fork()
+            client = self._clients.get(key)
+            if client is None:
+                client = HTTPClient(base_url=key[0], timeout=key[1], headers=dict(key[2]))
+                self._clients[key] = client
+                logger.debug(f"创建共享客户端: {key[0]}")
+            return client
+
+    def close_all(self):
+        with self._lock:
+            clients = list(self._clients.values()) if self._pid == os.getpid() else []
+            self._clients = {}
+            self._pid = os.getpid()
+        for client in clients:
+            client.close()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __contains__(self, client: HTTPClient) -> bool:
+        return any(existing is client for existing in self._clients.values())
+
+
+class HeaderClient:
+    def __init__(self, client: HTTPClient, headers: Dict[str, str]):
+        self.client = client
+        self.extra_headers = dict(headers)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {**self.client.headers, **self.extra_headers}
+
+    def request(self, method: str, endpoint: str, **kwargs) -> APIResponse:
+        kwargs["headers"] = {**self.extra_headers, **(kwargs.get("headers") or {})}
+        return self.client.request(method, endpoint, **kwargs)
+
+    get = HTTPClient.get
+    post = HTTPClient.post
+    put = HTTPClient.put
+    delete = HTTPClient.delete
+    patch = HTTPClient.patch
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+
+client_registry = ClientRegistry()
+atexit.register(client_registry.close_all)
+
+
+def shared_client(
+    base_url: Optional[str] = None,
+    timeout: Optional[int] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> HTTPClient:
+    return client_registry.get(base_url, timeout, headers)
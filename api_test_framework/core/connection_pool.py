@@ -0,0 +1,186 @@
+import time
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from requests.adapters import DEFAULT_POOLBLOCK, HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
+
+from core.timing import TimingHTTPConnection, TimingHTTPSConnection, current_timings
+
+
+class PoolStats:
+    def __init__(self, maxsize: int):
+        self._lock = Lock()
+        self.maxsize = maxsize
+        self.checkouts = 0
+        self.reused = 0
+        self.new_connections = 0
+        self.waits = 0
+        self.wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.discards = 0
+        self.grown = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+
+    def checkout(self, reused: bool, waited: bool, elapsed_ms: float):
+        with self._lock:
+            self.checkouts += 1
+            if reused:
+                self.reused += 1
+            else:
+                self.new_connections += 1
+            if waited:
+                self.waits += 1
+                self.wait_ms += elapsed_ms
+                self.max_wait_ms = max(self.max_wait_ms, elapsed_ms)
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def release(self, discarded: bool):
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+            if discarded:
+                self.discards += 1
+
+    def grow(self, maxsize: int):
+        with self._lock:
+            self.maxsize = maxsize
+            self.grown += 1
+
+    @property
+    def reuse_ratio(self) -> float:
+        return self.reused / self.checkouts if self.checkouts else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "maxsize": self.maxsize,
+                "checkouts": self.checkouts,
+                "reused": self.reused,
+                "new_connections": self.new_connections,
+                "reuse_ratio": round(self.reuse_ratio, 4),
+                "waits": self.waits,
+                "wait_ms": round(self.wait_ms, 3),
+                "max_wait_ms": round(self.max_wait_ms, 3),
+                "discards": self.discards,
+                "grown": self.grown,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+            }
+
+
+class _InstrumentedPoolMixin:
+    stats: Optional[PoolStats] = None
+    adaptive_limit = 0
+
+    def _grow(self) -> bool:
+        with self.stats._lock:
+            queue = self.pool
+            if queue is None or queue.maxsize >= self.adaptive_limit or not queue.empty():
+                return False
+            queue.maxsize += 1
+            queue.put(None, block=False)
+            maxsize = queue.maxsize
+        self.stats.grow(maxsize)
+        return True
+
+    def _get_conn(self, timeout=None):
+        timings = current_timings()
+        if self.stats is None and timings is None:
+            return super()._get_conn(timeout)
+
+        queue = self.pool
+        exhausted = queue is not None and queue.empty()
+        if exhausted and self.stats is not None and self.adaptive_limit:
+            exhausted = not self._grow()
+
+        start = time.perf_counter()
+        conn = super()._get_conn(timeout)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        reused = getattr(conn, "sock", None) is not None
+        if timings is not None:
+            timings.add("pool", elapsed_ms)
+            if reused:
+                timings.reused += 1
+        if self.stats is not None:
+            self.stats.checkout(reused, exhausted and self.block, elapsed_ms)
+        return conn
+
+    def _put_conn(self, conn):
+        if self.stats is None:
+            return super()._put_conn(conn)
+        queue = self.pool
+        discarded = queue is not None and queue.full()
+        try:
+            super()._put_conn(conn)
+        finally:
+            self.stats.release(discarded)
+
+
+class InstrumentedHTTPConnectionPool(_InstrumentedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = TimingHTTPConnection
+
+
+class InstrumentedHTTPSConnectionPool(_InstrumentedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = TimingHTTPSConnection
+
+
+class InstrumentedPoolManager(PoolManager):
+    def __init__(self, *args, adaptive_limit: int = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.adaptive_limit = adaptive_limit
+        self.pool_classes_by_scheme = {
+            "http": InstrumentedHTTPConnectionPool,
+            "https": InstrumentedHTTPSConnectionPool,
+        }
+        self.pool_stats: Dict[str, PoolStats] = {}
+        self._stats_lock = Lock()
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        key = f"{scheme}://{host}:{port}"
+        with self._stats_lock:
+            stats = self.pool_stats.get(key)
+            if stats is None:
+                stats = self.pool_stats[key] = PoolStats(pool.pool.maxsize)
+        if stats.maxsize > pool.pool.maxsize:
+            for _ in range(stats.maxsize - pool.pool.maxsize):
+                pool.pool.maxsize += 1
+                pool.pool.put(None, block=False)
+        pool.stats = stats
+        pool.adaptive_limit = self.adaptive_limit
+        return pool
+
+
+class InstrumentedHTTPAdapter(HTTPAdapter):
+    def __init__(self, *args, adaptive: bool = False, max_pool_size: int = 100, **kwargs):
+        self.adaptive = adaptive
+        self.max_pool_size = max_pool_size
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=DEFAULT_POOLBLOCK, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        adaptive = getattr(self, "adaptive", False)
+        self.poolmanager = InstrumentedPoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            adaptive_limit=max(maxsize, getattr(self, "max_pool_size", maxsize)) if adaptive else 0,
+            **pool_kwargs,
+        )
+
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {key: stats.to_dict() for key, stats in self.poolmanager.pool_stats.items()}
+
+    def send(self, request, stream=False, **kwargs):
+        response = super().send(request, stream=stream, **kwargs)
+        timings = current_timings()
+        if timings is not None and not stream:
+            with timings.measure("body"):
+                response.content
+        return response
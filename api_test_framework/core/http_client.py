@@ -1,10 +1,23 @@
-from typing import Dict, Optional
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
 
 import requests
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 
 from config.settings import config
+from core.cassette import Cassette, cassette_from_config
+from core.connection_pool import InstrumentedHTTPAdapter
+from core.resilience import ResiliencePolicy, retry_from_config
+from core.response import APIResponse
+from core.timing import (
+    MetricsSink,
+    RequestTimings,
+    endpoint_template,
+    get_metrics_sink,
+    recording,
+)
+
+_REQUEST_FIELDS = ("params", "data", "json", "headers", "files", "auth", "cookies", "hooks")
 
 
 class HTTPClient:
@@ -13,24 +26,30 @@ class HTTPClient:
         base_url: Optional[str] = None,
         timeout: Optional[int] = None,
         headers: Optional[Dict[str, str]] = None,
+        cassette: Optional[Cassette] = None,
+        metrics_sink: Optional[MetricsSink] = None,
+        resilience: Optional[ResiliencePolicy] = None,
     ):
         self.base_url = base_url or config.base_url
         self.timeout = timeout or config.timeout
         self.headers = headers or config.headers.copy()
         self.session = self._create_session()
+        self.cassette = cassette or cassette_from_config()
+        self.metrics_sink = metrics_sink
+        self.resilience = resilience or ResiliencePolicy()
 
     def _create_session(self) -> requests.Session:
         session = requests.Session()
 
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS", "POST", "PUT", "DELETE"],
-        )
-
-        adapter = HTTPAdapter(
-            max_retries=retry_strategy, pool_connections=10, pool_maxsize=10
+        retry_strategy = retry_from_config()
+        pool_config = config.pool
+        adapter = InstrumentedHTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=int(pool_config.get("connections", 10)),
+            pool_maxsize=int(pool_config.get("maxsize", 10)),
+            pool_block=bool(pool_config.get("block", False)),
+            adaptive=bool(pool_config.get("adaptive", False)),
+            max_pool_size=int(pool_config.get("max_size", 100)),
         )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
@@ -49,18 +68,73 @@ class HTTPClient:
             merged_headers.update(headers)
         return merged_headers
 
-    def request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+    def request(self, method: str, endpoint: str, **kwargs) -> APIResponse:
         url = self._build_url(endpoint)
         kwargs.setdefault("timeout", self.timeout)
         kwargs.setdefault("headers", {})
         kwargs["headers"] = self._update_headers(kwargs["headers"])
 
-        response = self.session.request(method.upper(), url, **kwargs)
+        timings = RequestTimings(
+            endpoint_template(method, url), self.metrics_sink or get_metrics_sink()
+        )
+        start = time.perf_counter()
+        try:
+            with recording(timings):
+                if self.cassette is None:
+                    response = self._send(method.upper(), url, **kwargs)
+                else:
+                    response = self._request_with_cassette(method.upper(), url, **kwargs)
+        except Exception as e:
+            timings.publish((time.perf_counter() - start) * 1000, error=e)
+            raise
+        timings.publish((time.perf_counter() - start) * 1000, response.status_code)
+        return APIResponse(response, timings)
+
+    def _send(
+        self, method: str, url: str, prepared: Optional[requests.PreparedRequest] = None, **kwargs
+    ) -> requests.Response:
+        host = urlsplit(url).netloc
+        self.resilience.before_request(host)
+        try:
+            with self.resilience.activate(host):
+                if prepared is None:
+                    response = self.session.request(method, url, **kwargs)
+                else:
+                    response = self._send_prepared(prepared, **kwargs)
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.RetryError) as e:
+            self.resilience.record_result(host, error=e)
+            raise
+        except BaseException:
+            self.resilience.release(host)
+            raise
+        self.resilience.record_result(host, response.status_code)
+        return response
+
+    def _request_with_cassette(self, method: str, url: str, **kwargs) -> requests.Response:
+        request_kwargs = {k: kwargs[k] for k in _REQUEST_FIELDS if k in kwargs}
+        prepared = self.session.prepare_request(requests.Request(method, url, **request_kwargs))
+
+        if self.cassette.can_replay:
+            response = self.cassette.replay(prepared)
+            if response is not None:
+                return response
+
+        response = self._send(method, url, prepared, **kwargs)
+        if self.cassette.can_record:
+            self.cassette.record(prepared, response)
         return response
 
+    def _send_prepared(self, prepared: requests.PreparedRequest, **kwargs) -> requests.Response:
+        settings = self.session.merge_environment_settings(
+            prepared.url, kwargs.get("proxies") or {}, kwargs.get("stream"), kwargs.get("verify"), kwargs.get("cert")
+        )
+        return self.session.send(
+            prepared, timeout=kwargs.get("timeout"), allow_redirects=kwargs.get("allow_redirects", True), **settings
+        )
+
     def get(
         self, endpoint: str, params: Optional[Dict] = None, **kwargs
-    ) -> requests.Response:
+    ) -> APIResponse:
         return self.request("GET", endpoint, params=params, **kwargs)
 
     def post(
@@ -69,7 +143,7 @@ class HTTPClient:
         data: Optional[Dict] = None,
         json: Optional[Dict] = None,
         **kwargs,
-    ) -> requests.Response:
+    ) -> APIResponse:
         return self.request("POST", endpoint, data=data, json=json, **kwargs)
 
     def put(
@@ -78,10 +152,10 @@ class HTTPClient:
         data: Optional[Dict] = None,
         json: Optional[Dict] = None,
         **kwargs,
-    ) -> requests.Response:
+    ) -> APIResponse:
         return self.request("PUT", endpoint, data=data, json=json, **kwargs)
 
-    def delete(self, endpoint: str, **kwargs) -> requests.Response:
+    def delete(self, endpoint: str, **kwargs) -> APIResponse:
         return self.request("DELETE", endpoint, **kwargs)
 
     def patch(
@@ -90,9 +164,15 @@ class HTTPClient:
         data: Optional[Dict] = None,
         json: Optional[Dict] = None,
         **kwargs,
-    ) -> requests.Response:
+    ) -> APIResponse:
         return self.request("PATCH", endpoint, data=data, json=json, **kwargs)
 
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        adapter = self.session.get_adapter(self.base_url)
+        if isinstance(adapter, InstrumentedHTTPAdapter):
+            return adapter.pool_stats()
+        return {}
+
     def close(self):
         self.session.close()
 
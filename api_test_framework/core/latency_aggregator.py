@@ -0,0 +1,218 @@
+import json
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Union
+
+from core.load.histogram import LatencyHistogram
+from core.timing import PHASES, HistogramSink
+
+OVERFLOW_ENDPOINT = "OTHER"
+
+
+class EndpointStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.status_codes: Counter = Counter()
+        self.exceptions: Counter = Counter()
+        self.first_seen: Optional[float] = None
+        self.last_seen: Optional[float] = None
+
+    def record(self, status_code: Optional[int], error: Optional[BaseException], now: float):
+        self.count += 1
+        if error is not None:
+            self.errors += 1
+            self.exceptions[type(error).__name__] += 1
+        elif status_code is not None:
+            self.status_codes[str(status_code)] += 1
+            if status_code >= 400:
+                self.errors += 1
+        if self.first_seen is None or now < self.first_seen:
+            self.first_seen = now
+        if self.last_seen is None or now > self.last_seen:
+            self.last_seen = now
+
+    def merge(self, other: "EndpointStats"):
+        self.count += other.count
+        self.errors += other.errors
+        self.status_codes.update(other.status_codes)
+        self.exceptions.update(other.exceptions)
+        for seen in (other.first_seen, other.last_seen):
+            if seen is None:
+                continue
+            if self.first_seen is None or seen < self.first_seen:
+                self.first_seen = seen
+            if self.last_seen is None or seen > self.last_seen:
+                self.last_seen = seen
+
+    @property
+    def window(self) -> float:
+        if self.first_seen is None or self.last_seen is None:
+            return 0.0
+        return self.last_seen - self.first_seen
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "status_codes": dict(self.status_codes),
+            "exceptions": dict(self.exceptions),
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EndpointStats":
+        stats = cls()
+        stats.count = data["count"]
+        stats.errors = data["errors"]
+        stats.status_codes.update(data["status_codes"])
+        stats.exceptions.update(data["exceptions"])
+        stats.first_seen = data["first_seen"]
+        stats.last_seen = data["last_seen"]
+        return stats
+
+
+class LatencyAggregator(HistogramSink):
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self, max_endpoints: int = 500):
+        super().__init__()
+        self.max_endpoints = max_endpoints
+        self._endpoints: Dict[str, EndpointStats] = {}
+        self._counters: Dict[str, Counter] = {}
+        self._admitted: Set[str] = set()
+
+    def _admit(self, endpoint: str) -> str:
+        if endpoint not in self._admitted:
+            if endpoint == OVERFLOW_ENDPOINT or len(self._admitted) >= self.max_endpoints:
+                return OVERFLOW_ENDPOINT
+            self._admitted.add(endpoint)
+        return endpoint
+
+    def _key(self, endpoint: str) -> str:
+        if endpoint in self._admitted:
+            return endpoint
+        with self._lock:
+            return self._admit(endpoint)
+
+    def observe(self, endpoint: str, phase: str, value_ms: float):
+        super().observe(self._key(endpoint), phase, value_ms)
+
+    def record_request(
+        self,
+        endpoint: str,
+        total_ms: float,
+        status_code: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ):
+        now = time.time()
+        with self._lock:
+            key = self._admit(endpoint)
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = EndpointStats()
+            stats.record(status_code, error, now)
+
+    def increment(self, key: str, metric: str, value: int = 1):
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = Counter()
+            counter[metric] += value
+
+    def merge(self, other: "LatencyAggregator"):
+        for (endpoint, phase), histogram in list(other._histograms.items()):
+            self.merge_histogram(self._key(endpoint), phase, histogram)
+        with self._lock:
+            for endpoint, stats in other._endpoints.items():
+                key = self._admit(endpoint)
+                if key not in self._endpoints:
+                    self._endpoints[key] = EndpointStats()
+                self._endpoints[key].merge(stats)
+            for key, counter in other._counters.items():
+                self._counters.setdefault(key, Counter()).update(counter)
+
+    def clear(self):
+        super().clear()
+        with self._lock:
+            self._endpoints.clear()
+            self._counters.clear()
+            self._admitted.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "histograms": [
+                    {"endpoint": endpoint, "phase": phase, "histogram": histogram.to_dict()}
+                    for (endpoint, phase), histogram in self._histograms.items()
+                ],
+                "endpoints": {endpoint: stats.to_dict() for endpoint, stats in self._endpoints.items()},
+                "counters": {key: dict(counter) for key, counter in self._counters.items()},
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_endpoints: int = 500) -> "LatencyAggregator":
+        aggregator = cls(max_endpoints)
+        for item in data["histograms"]:
+            aggregator._histograms[(item["endpoint"], item["phase"])] = LatencyHistogram.from_dict(item["histogram"])
+        for endpoint, stats in data["endpoints"].items():
+            aggregator._endpoints[endpoint] = EndpointStats.from_dict(stats)
+        for key, counter in data.get("counters", {}).items():
+            aggregator._counters[key] = Counter(counter)
+        aggregator._admitted.update(aggregator._endpoints)
+        aggregator._admitted.update(endpoint for endpoint, _ in aggregator._histograms)
+        aggregator._admitted.discard(OVERFLOW_ENDPOINT)
+        return aggregator
+
+    def _latency(self, histogram: Optional[LatencyHistogram]) -> Dict[str, float]:
+        if histogram is None:
+            return {}
+        summary = histogram.summary(self.PERCENTILES)
+        summary.pop("min")
+        return summary
+
+    def report(self) -> Dict[str, Any]:
+        endpoints = {}
+        with self._lock:
+            for endpoint in sorted(self._endpoints):
+                stats = self._endpoints[endpoint]
+                window = stats.window
+                endpoints[endpoint] = {
+                    "count": stats.count,
+                    "throughput": round(stats.count / window, 2) if window > 0 else None,
+                    "error_rate": round(stats.errors / stats.count, 4) if stats.count else 0.0,
+                    "status_codes": dict(stats.status_codes),
+                    "exceptions": dict(stats.exceptions),
+                    "latency_ms": self._latency(self._histograms.get((endpoint, "total"))),
+                    "phases_ms": {
+                        phase: self._latency(self._histograms[(endpoint, phase)])
+                        for phase in PHASES
+                        if (endpoint, phase) in self._histograms
+                    },
+                }
+            counters = {key: dict(counter) for key, counter in sorted(self._counters.items())}
+        return {
+            "requests": sum(item["count"] for item in endpoints.values()),
+            "endpoints": endpoints,
+            "counters": counters,
+        }
+
+    def write_report(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def table(self) -> str:
+        lines = [f"{'接口':<48} {'请求数':>8} {'错误率':>8} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}"]
+        for endpoint, row in self.report()["endpoints"].items():
+            latency = row["latency_ms"]
+            lines.append(
+                f"{endpoint:<50} {row['count']:>8} {row['error_rate']:>9.2%} "
+                f"{latency.get('p50', 0):>9.1f} {latency.get('p90', 0):>9.1f} "
+                f"{latency.get('p99', 0):>9.1f} {latency.get('max', 0):>9.1f}"
+            )
+        return "\n".join(lines)
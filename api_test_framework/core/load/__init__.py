@@ -0,0 +1,4 @@
+from .histogram import LatencyHistogram
+from .engine import LoadEngine, LoadReport, LoadStage
+
+__all__ = ["LatencyHistogram", "LoadEngine", "LoadReport", "LoadStage"]
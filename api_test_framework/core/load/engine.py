@@ -0,0 +1,214 @@
+import asyncio
+import contextvars
+import inspect
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from core.load.histogram import LatencyHistogram
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class LoadStage:
+    duration: float
+    target_rate: float
+
+
+@dataclass
+class LoadReport:
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    dropped: int = 0
+    duration: float = 0.0
+    max_in_flight: int = 0
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    status_codes: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.duration if self.duration > 0 else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.failed / self.total if self.total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "duration": round(self.duration, 3),
+            "throughput": round(self.throughput, 2),
+            "error_rate": round(self.error_rate, 4),
+            "max_in_flight": self.max_in_flight,
+            "latency_ms": self.histogram.summary(),
+            "status_codes": {str(k): v for k, v in self.status_codes.items()},
+            "errors": dict(self.errors),
+        }
+
+    def summary(self) -> str:
+        latency = self.histogram.summary()
+        lines = [
+            "压测报告",
+            f"持续时间: {self.duration:.2f}s",
+            f"请求总数: {self.total} (成功 {self.succeeded}, 失败 {self.failed}, 丢弃 {self.dropped})",
+            f"吞吐量: {self.throughput:.2f} req/s",
+            f"错误率: {self.error_rate:.2%}",
+            "=" * 50,
+            f"p50: {latency['p50']}ms  p95: {latency['p95']}ms  "
+            f"p99: {latency['p99']}ms  p999: {latency['p999']}ms",
+            f"min: {latency['min']}ms  mean: {latency['mean']}ms  max: {latency['max']}ms",
+        ]
+        return "\n".join(lines)
+
+
+def _default_success_check(response: Any) -> bool:
+    return getattr(response, "status_code", 500) < 400
+
+
+class LoadEngine:
+    def __init__(
+        self,
+        target: Callable[..., Any],
+        stages: Optional[List[LoadStage]] = None,
+        rate: Optional[float] = None,
+        duration: Optional[float] = None,
+        ramp_up: float = 0,
+        start_rate: float = 0,
+        concurrency: int = 100,
+        kwargs_factory: Optional[Callable[[int], Dict[str, Any]]] = None,
+        success_check: Callable[[Any], bool] = _default_success_check,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        if stages is None:
+            if rate is None or duration is None:
+                raise ValueError("必须指定stages，或同时指定rate和duration")
+            stages = []
+            if ramp_up > 0:
+                stages.append(LoadStage(ramp_up, rate))
+            else:
+                start_rate = rate
+            stages.append(LoadStage(duration, rate))
+
+        self.target = target
+        self.stages = stages
+        self.start_rate = start_rate
+        self.concurrency = concurrency
+        self.kwargs_factory = kwargs_factory
+        self.success_check = success_check
+        self.clock = clock
+        self.total_duration = sum(stage.duration for stage in stages)
+
+    @property
+    def is_async(self) -> bool:
+        owner = getattr(self.target, "__self__", None)
+        return inspect.iscoroutinefunction(self.target) or bool(
+            getattr(owner, "is_async", False)
+        )
+
+    def expected_arrivals(self, elapsed: float) -> float:
+        arrivals = 0.0
+        stage_start = 0.0
+        previous_rate = self.start_rate
+        for stage in self.stages:
+            if elapsed <= stage_start:
+                break
+            span = min(elapsed, stage_start + stage.duration) - stage_start
+            slope = (stage.target_rate - previous_rate) / stage.duration if stage.duration else 0
+            arrivals += previous_rate * span + 0.5 * slope * span * span
+            stage_start += stage.duration
+            previous_rate = stage.target_rate
+        return arrivals
+
+    def _call_sync(self, index: int):
+        kwargs = self.kwargs_factory(index) if self.kwargs_factory else {}
+        start = time.perf_counter()
+        try:
+            return self.target(**kwargs), None, time.perf_counter() - start
+        except Exception as e:
+            return None, e, time.perf_counter() - start
+
+    async def _call_async(self, index: int):
+        kwargs = self.kwargs_factory(index) if self.kwargs_factory else {}
+        start = time.perf_counter()
+        try:
+            return await self.target(**kwargs), None, time.perf_counter() - start
+        except Exception as e:
+            return None, e, time.perf_counter() - start
+
+    def _record(self, report: LoadReport, response: Any, error: Optional[Exception], elapsed: float):
+        report.total += 1
+        report.histogram.record(elapsed * 1000)
+        if error is not None:
+            report.failed += 1
+            report.errors[type(error).__name__] += 1
+            return
+
+        status_code = getattr(response, "status_code", None)
+        if status_code is not None:
+            report.status_codes[status_code] += 1
+        try:
+            success = self.success_check(response)
+        except Exception as e:
+            report.errors[type(e).__name__] += 1
+            success = False
+        if success:
+            report.succeeded += 1
+        else:
+            report.failed += 1
+
+    async def run_async(self) -> LoadReport:
+        loop = asyncio.get_running_loop()
+        report = LoadReport()
+        executor = None if self.is_async else ThreadPoolExecutor(max_workers=self.concurrency)
+        in_flight: set = set()
+        issued = 0
+
+        async def _execute(index: int):
+            if executor is None:
+                result = await self._call_async(index)
+            else:
+                context = contextvars.copy_context()
+                result = await loop.run_in_executor(executor, context.run, self._call_sync, index)
+            self._record(report, *result)
+
+        started = self.clock()
+        try:
+            while True:
+                elapsed = self.clock() - started
+                if elapsed >= self.total_duration:
+                    break
+
+                due = int(self.expected_arrivals(elapsed)) - issued
+                for _ in range(due):
+                    if len(in_flight) >= self.concurrency:
+                        report.dropped += 1
+                    else:
+                        task = loop.create_task(_execute(issued))
+                        in_flight.add(task)
+                        task.add_done_callback(in_flight.discard)
+                        report.max_in_flight = max(report.max_in_flight, len(in_flight))
+                    issued += 1
+
+                await asyncio.sleep(0.001)
+
+            if in_flight:
+                await asyncio.gather(*in_flight)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        report.duration = self.clock() - started
+        logger.info(report.summary())
+        return report
+
+    def run(self) -> LoadReport:
+        return asyncio.run(self.run_async())
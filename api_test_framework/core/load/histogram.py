@@ -0,0 +1,115 @@
+from typing import Any, Dict, List, Optional
+
+
+class LatencyHistogram:
+    def __init__(self, max_value_ms: float = 3_600_000, sub_bucket_bits: int = 7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.max_value_us = int(max_value_ms * 1000)
+        self._half = 1 << (sub_bucket_bits - 1)
+        self._counts: List[int] = [0] * (self._index_of(self.max_value_us) + 1)
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us: Optional[int] = None
+
+    def _index_of(self, value_us: int) -> int:
+        shift = value_us.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return value_us
+        return shift * self._half + (value_us >> shift)
+
+    def _highest_equivalent(self, index: int) -> int:
+        shift = index // self._half - 1
+        if shift <= 0:
+            return index
+        mantissa = index - shift * self._half
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value_ms: float, count: int = 1):
+        value_us = min(max(int(value_ms * 1000), 0), self.max_value_us)
+        self._counts[self._index_of(value_us)] += count
+        self.count += count
+        self.total_us += value_us * count
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+        if self.max_us is None or value_us > self.max_us:
+            self.max_us = value_us
+
+    def percentile(self, percent: float) -> float:
+        if self.count == 0:
+            return 0.0
+        target = max(1, int(percent / 100.0 * self.count + 0.5))
+        running = 0
+        for index, bucket_count in enumerate(self._counts):
+            running += bucket_count
+            if running >= target:
+                value_us = min(self._highest_equivalent(index), self.max_us or 0)
+                return value_us / 1000.0
+        return (self.max_us or 0) / 1000.0
+
+    @property
+    def mean(self) -> float:
+        return self.total_us / self.count / 1000.0 if self.count else 0.0
+
+    @property
+    def min(self) -> float:
+        return (self.min_us or 0) / 1000.0
+
+    @property
+    def max(self) -> float:
+        return (self.max_us or 0) / 1000.0
+
+    def merge(self, other: "LatencyHistogram"):
+        if (
+            other.sub_bucket_bits != self.sub_bucket_bits
+            or other.max_value_us != self.max_value_us
+        ):
+            raise ValueError("直方图精度或量程不一致，无法合并")
+        for index, bucket_count in enumerate(other._counts):
+            if bucket_count:
+                self._counts[index] += bucket_count
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        if other.max_us is not None and (self.max_us is None or other.max_us > self.max_us):
+            self.max_us = other.max_us
+
+    def summary(self, percentiles=(50, 95, 99, 99.9)) -> Dict[str, float]:
+        result = {
+            f"p{str(p).replace('.', '')}": round(self.percentile(p), 3)
+            for p in percentiles
+        }
+        result.update(
+            {
+                "min": round(self.min, 3),
+                "mean": round(self.mean, 3),
+                "max": round(self.max, 3),
+            }
+        )
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sub_bucket_bits": self.sub_bucket_bits,
+            "max_value_us": self.max_value_us,
+            "count": self.count,
+            "total_us": self.total_us,
+            "min_us": self.min_us,
+            "max_us": self.max_us,
+            "counts": {str(i): c for i, c in enumerate(self._counts) if c},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(
+            max_value_ms=data["max_value_us"] / 1000.0,
+            sub_bucket_bits=data["sub_bucket_bits"],
+        )
+        for index, bucket_count in data["counts"].items():
+            histogram._counts[int(index)] = bucket_count
+        histogram.count = data["count"]
+        histogram.total_us = data["total_us"]
+        histogram.min_us = data["min_us"]
+        histogram.max_us = data["max_us"]
+        return histogram
@@ -0,0 +1,337 @@
+import contextvars
+import email.utils
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import requests
+from requests.packages.urllib3.exceptions import MaxRetryError
+from requests.packages.urllib3.util.retry import Retry
+
+from config.settings import config
+from core.timing import get_metrics_sink
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+IDEMPOTENT_METHODS = ("HEAD", "GET", "OPTIONS", "PUT", "DELETE")
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    pass
+
+
+def full_jitter(attempt: int, backoff_factor: float, backoff_max: float, rng: Callable[[], float] = random.random) -> float:
+    if attempt <= 1 or backoff_factor <= 0:
+        return 0.0
+    return rng() * min(backoff_max, backoff_factor * (2 ** (attempt - 1)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed is None:
+        return None
+    return max(0.0, parsed.timestamp() - time.time())
+
+
+class RetryBudget:
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_per_second: float = 1.0,
+        capacity: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def deposit(self):
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.recovery_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release(self):
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> bool:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+                self.trips += 1
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        with self._lock:
+            return max(0.0, self.recovery_timeout - (self._clock() - self._opened_at))
+
+
+class _HostState:
+    def __init__(self, budget: RetryBudget, breaker: Optional[CircuitBreaker]):
+        self.budget = budget
+        self.breaker = breaker
+        self.counters: Counter = Counter()
+        self.lock = Lock()
+
+    def count(self, metric: str):
+        with self.lock:
+            self.counters[metric] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.counters)
+
+
+class ResiliencePolicy:
+    def __init__(
+        self,
+        retry_config: Optional[Dict[str, Any]] = None,
+        breaker_config: Optional[Dict[str, Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        retry_config = config.retry if retry_config is None else retry_config
+        breaker_config = dict(config.get("api.circuit_breaker", {}) or {}) if breaker_config is None else breaker_config
+
+        self.backoff_factor = float(retry_config.get("backoff_factor", 1))
+        self.backoff_max = float(retry_config.get("backoff_max", 10))
+        self.retry_after_max = float(retry_config.get("retry_after_max", 30))
+        budget = dict(retry_config.get("budget", {}) or {})
+        self.budget_ratio = float(budget.get("ratio", 0.2))
+        self.budget_min_per_second = float(budget.get("min_per_second", 1))
+        self.budget_capacity = float(budget.get("capacity", 10))
+
+        self.breaker_enabled = bool(breaker_config.get("enabled", True))
+        self.failure_threshold = int(breaker_config.get("failure_threshold", 5))
+        self.recovery_timeout = float(breaker_config.get("recovery_timeout", 30))
+        self.failure_statuses = frozenset(breaker_config.get("failure_statuses", [500, 502, 503, 504]))
+
+        self._clock = clock
+        self._lock = Lock()
+        self._hosts: Dict[str, _HostState] = {}
+
+    def _host(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            with self._lock:
+                state = self._hosts.get(host)
+                if state is None:
+                    budget = RetryBudget(
+                        self.budget_ratio, self.budget_min_per_second, self.budget_capacity, self._clock
+                    )
+                    breaker = (
+                        CircuitBreaker(self.failure_threshold, self.recovery_timeout, self._clock)
+                        if self.breaker_enabled
+                        else None
+                    )
+                    state = self._hosts[host] = _HostState(budget, breaker)
+        return state
+
+    def _count(self, host: str, metric: str):
+        self._host(host).count(metric)
+        get_metrics_sink().increment(host, metric)
+
+    def before_request(self, host: str):
+        state = self._host(host)
+        state.budget.deposit()
+        if state.breaker is not None and not state.breaker.allow():
+            self._count(host, "breaker_rejections")
+            raise CircuitOpenError(
+                f"熔断器已打开，{host} 暂时不可用，{state.breaker.retry_in():.1f}秒后重试"
+            )
+
+    def allow_retry(self, host: str) -> bool:
+        if self._host(host).budget.withdraw():
+            self._count(host, "retries")
+            return True
+        self._count(host, "retries_denied")
+        logger.warning(f"重试预算已耗尽，放弃重试: {host}")
+        return False
+
+    def record_result(self, host: str, status_code: Optional[int] = None, error: Optional[BaseException] = None):
+        breaker = self._host(host).breaker
+        if breaker is None or isinstance(error, CircuitOpenError):
+            return
+        if error is not None or status_code in self.failure_statuses:
+            if breaker.record_failure():
+                self._count(host, "breaker_trips")
+                logger.warning(f"熔断器打开: {host}，{self.recovery_timeout:.0f}秒内快速失败")
+        else:
+            breaker.record_success()
+
+    def release(self, host: str):
+        breaker = self._host(host).breaker
+        if breaker is not None:
+            breaker.release()
+
+    def backoff(self, attempt: int) -> float:
+        return full_jitter(attempt, self.backoff_factor, self.backoff_max)
+
+    def retry_after(self, host: str, value: Optional[str]) -> Optional[float]:
+        seconds = parse_retry_after(value)
+        if seconds is None:
+            return None
+        self._count(host, "retry_after")
+        return min(seconds, self.retry_after_max)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            hosts = list(self._hosts.items())
+        return {
+            host: {
+                **state.snapshot(),
+                "budget_tokens": round(state.budget.tokens, 2),
+                "breaker": state.breaker.state if state.breaker is not None else None,
+            }
+            for host, state in hosts
+        }
+
+    @contextmanager
+    def activate(self, host: str) -> Iterator[None]:
+        token = _active.set((self, host))
+        try:
+            yield
+        finally:
+            _active.reset(token)
+
+
+_active: "contextvars.ContextVar[Optional[Tuple[ResiliencePolicy, str]]]" = contextvars.ContextVar(
+    "resilience_policy", default=None
+)
+
+
+class BudgetedRetry(Retry):
+    def _can_retry_again(self) -> bool:
+        return self.total is None or self.total is False or self.total > 0
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if not super().is_retry(method, status_code, has_retry_after):
+            return False
+        active = _active.get()
+        if active is None or not self._can_retry_again():
+            return True
+        policy, host = active
+        return policy.allow_retry(host)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        active = _active.get()
+        if error is not None and active is not None:
+            policy, host = active
+            if not policy.allow_retry(host):
+                raise MaxRetryError(_pool, url, error)
+        return retry
+
+    def get_backoff_time(self) -> float:
+        active = _active.get()
+        if active is None:
+            return super().get_backoff_time()
+        policy, _ = active
+        return random.random() * min(policy.backoff_max, super().get_backoff_time())
+
+    def get_retry_after(self, response) -> Optional[float]:
+        active = _active.get()
+        if active is None:
+            return super().get_retry_after(response)
+        policy, host = active
+        return policy.retry_after(host, response.headers.get("Retry-After"))
+
+
+def retry_from_config(retry_config: Optional[Dict[str, Any]] = None) -> BudgetedRetry:
+    retry_config = config.retry if retry_config is None else retry_config
+    return BudgetedRetry(
+        total=retry_config.get("total", 3),
+        backoff_factor=retry_config.get("backoff_factor", 1),
+        status_forcelist=retry_config.get("status_forcelist", [429, 500, 502, 503, 504]),
+        allowed_methods=retry_config.get("allowed_methods", IDEMPOTENT_METHODS),
+    )
+
@@ -0,0 +1,63 @@
+import time
+from typing import Any, Optional
+
+_UNSET = object()
+
+
+class APIResponse:
+    def __init__(self, response: Any, timings: Optional[Any] = None):
+        object.__setattr__(self, "_response", response)
+        object.__setattr__(self, "_json", _UNSET)
+        object.__setattr__(self, "_json_error", None)
+        object.__setattr__(self, "timings", timings)
+
+    @property
+    def wrapped(self) -> Any:
+        return self._response
+
+    @property
+    def is_json_decoded(self) -> bool:
+        return self._json is not _UNSET
+
+    def json(self, **kwargs) -> Any:
+        if kwargs:
+            return self._response.json(**kwargs)
+        if self._json_error is not None:
+            raise self._json_error
+        if self._json is _UNSET:
+            start = time.perf_counter()
+            try:
+                object.__setattr__(self, "_json", self._response.json())
+            except ValueError as e:
+                object.__setattr__(self, "_json_error", e)
+                raise
+            finally:
+                if self.timings is not None:
+                    self.timings.add("decode", (time.perf_counter() - start) * 1000)
+        return self._json
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "_response":
+            raise AttributeError(name)
+        return getattr(self._response, name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._response, name, value)
+
+    def __bool__(self) -> bool:
+        return bool(self._response)
+
+    def __iter__(self):
+        return iter(self._response)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        close = getattr(self._response, "close", None)
+        if close is not None:
+            close()
+
+    def __repr__(self) -> str:
+        return repr(self._response)
+
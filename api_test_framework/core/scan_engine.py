@@ -0,0 +1,407 @@
+import codecs
+import re
+from functools import lru_cache
+from json.decoder import scanstring
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+_SCANNABLE = (dict, list, str)
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_STRING_PART = re.compile(r'(?:[^"\\]+|\\u[0-9a-fA-F]{4}|\\[^u])*')
+_HIGH_SURROGATE_END = re.compile(r"\\u[dD][89abAB][0-9a-fA-F]{2}$")
+_LITERAL = re.compile(r"[^\s,\]\}:\[\{\"]+")
+
+
+_SEGMENT_BOUNDARY = (".", "[", "]")
+
+
+class ScanPath:
+    __slots__ = ("parent", "key", "is_index", "_text", "_keyword_mask")
+
+    def __init__(self, parent: Optional["ScanPath"] = None, key: Any = None, is_index: bool = False):
+        self.parent = parent
+        self.key = key
+        self.is_index = is_index
+        self._text: Any = None if parent is not None else ""
+        self._keyword_mask: Optional[Tuple[Any, int]] = None
+
+    @property
+    def text(self) -> Any:
+        if self._text is None:
+            parent_text = self.parent.text
+            if self.is_index:
+                self._text = f"{parent_text}[{self.key}]"
+            else:
+                self._text = f"{parent_text}.{self.key}" if parent_text else self.key
+        return self._text
+
+
+ROOT_PATH = ScanPath()
+
+
+class CompiledPatternSet:
+    def __init__(self, patterns: Sequence[str], flags: int = re.IGNORECASE):
+        self.patterns = list(patterns)
+        self._compiled = [re.compile(pattern, flags) for pattern in self.patterns]
+        self._group_to_pattern: Dict[int, int] = {}
+        self._combined = self._compile_combined(flags)
+
+    def _compile_combined(self, flags: int):
+        if not self.patterns or any(_BACKREFERENCE.search(p) for p in self.patterns):
+            return None
+
+        parts = []
+        group = 1
+        for index, compiled in enumerate(self._compiled):
+            self._group_to_pattern[group] = index
+            parts.append(f"({compiled.pattern})")
+            group += compiled.groups + 1
+
+        try:
+            return re.compile("|".join(parts), flags)
+        except re.error:
+            return None
+
+    def first_match(self, value: str) -> Optional[str]:
+        if self._combined is None:
+            for index, compiled in enumerate(self._compiled):
+                if compiled.search(value):
+                    return self.patterns[index]
+            return None
+
+        match = self._combined.search(value)
+        if match is None:
+            return None
+
+        hit = self._group_to_pattern[match.lastindex]
+        for index in range(hit):
+            if self._compiled[index].search(value):
+                return self.patterns[index]
+        return self.patterns[hit]
+
+
+@lru_cache(maxsize=64)
+def compile_patterns(patterns: Tuple[str, ...]) -> CompiledPatternSet:
+    return CompiledPatternSet(patterns)
+
+
+class ScanRule:
+    def __init__(
+        self,
+        name: str,
+        vuln_type: str,
+        severity: str,
+        patterns: Sequence[str] = (),
+        keywords: Sequence[str] = (),
+    ):
+        self.name = name
+        self.vuln_type = vuln_type
+        self.severity = severity
+        self.pattern_set = compile_patterns(tuple(patterns)) if patterns else None
+        self.keywords = [(keyword, keyword.lower()) for keyword in keywords]
+        self._segment_keywords = [
+            (1 << index, keyword_lower)
+            for index, (_, keyword_lower) in enumerate(self.keywords)
+            if not any(boundary in keyword_lower for boundary in _SEGMENT_BOUNDARY)
+        ]
+        self._index_keywords = [
+            (bit, keyword_lower) for bit, keyword_lower in self._segment_keywords if keyword_lower.isdigit()
+        ]
+        self._spanning_keywords = [
+            (1 << index, keyword_lower)
+            for index, (_, keyword_lower) in enumerate(self.keywords)
+            if any(boundary in keyword_lower for boundary in _SEGMENT_BOUNDARY)
+        ]
+        self._key_masks: Dict[str, int] = {}
+
+    @staticmethod
+    def _mask_of(segment: str, keywords: List[Tuple[int, str]]) -> int:
+        mask = 0
+        for bit, keyword_lower in keywords:
+            if keyword_lower in segment:
+                mask |= bit
+        return mask
+
+    def _segment_mask(self, path: ScanPath) -> int:
+        if path.is_index:
+            return self._mask_of(str(path.key), self._index_keywords) if self._index_keywords else 0
+        key = path.key
+        if type(key) is not str:
+            return self._mask_of(str(key).lower(), self._segment_keywords)
+        mask = self._key_masks.get(key)
+        if mask is None:
+            if len(self._key_masks) >= 4096:
+                self._key_masks.clear()
+            mask = self._key_masks[key] = self._mask_of(key.lower(), self._segment_keywords)
+        return mask
+
+    def _path_mask(self, path: ScanPath) -> int:
+        if path.parent is None:
+            return 0
+        cached = path._keyword_mask
+        if cached is not None and cached[0] is self:
+            return cached[1]
+        mask = self._path_mask(path.parent) | self._segment_mask(path)
+        path._keyword_mask = (self, mask)
+        return mask
+
+    def _first_keyword(self, path: ScanPath) -> Optional[str]:
+        mask = self._segment_mask(path) | self._path_mask(path.parent) if path.parent is not None else 0
+        if self._spanning_keywords:
+            mask |= self._mask_of(path.text.lower(), self._spanning_keywords)
+        if not mask:
+            return None
+        return self.keywords[(mask & -mask).bit_length() - 1][0]
+
+    def match(self, path: ScanPath, value: str, sample: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        if self.pattern_set is not None:
+            pattern = self.pattern_set.first_match(value)
+            if pattern is not None:
+                return {
+                    "type": self.vuln_type,
+                    "severity": self.severity,
+                    "location": path.text,
+                    "value": value[:100] if sample is None else sample,
+                    "pattern": pattern,
+                }
+        elif self.keywords:
+            keyword = self._first_keyword(path)
+            if keyword is not None:
+                return {
+                    "type": self.vuln_type,
+                    "severity": self.severity,
+                    "location": path.text,
+                    "value": value[:100] if sample is None else sample,
+                    "keyword": keyword,
+                }
+        return None
+
+
+class ScanEngine:
+    def __init__(self, rules: Sequence[ScanRule]):
+        self.rules = list(rules)
+
+    def new_results(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {rule.name: [] for rule in self.rules}
+
+    def scan_string(self, path: ScanPath, value: str, results: Dict[str, List[Dict[str, Any]]]):
+        for rule in self.rules:
+            finding = rule.match(path, value)
+            if finding is not None:
+                results[rule.name].append(finding)
+
+    def iter_string_findings(self, path: ScanPath, value: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for rule in self.rules:
+            finding = rule.match(path, value)
+            if finding is not None:
+                yield rule.name, finding
+
+    def scan(self, data: Any) -> Dict[str, List[Dict[str, Any]]]:
+        results = self.new_results()
+        if not self.rules:
+            return results
+
+        def walk(value, path):
+            if isinstance(value, dict):
+                for key, val in value.items():
+                    if isinstance(val, _SCANNABLE):
+                        walk(val, ScanPath(path, key))
+            elif isinstance(value, list):
+                for i, val in enumerate(value):
+                    if isinstance(val, _SCANNABLE):
+                        walk(val, ScanPath(path, i, is_index=True))
+            elif isinstance(value, str):
+                self.scan_string(path, value, results)
+
+        walk(data, ROOT_PATH)
+        return results
+
+
+class SegmentScanner:
+    def __init__(self, engine: ScanEngine, window: int = 65536, overlap: int = 4096):
+        self.engine = engine
+        self.window = window
+        self.overlap = overlap
+        self._reset(None)
+
+    def _reset(self, path: Optional[ScanPath]):
+        self._path = path
+        self._parts: List[str] = []
+        self._size = 0
+        self._sample: Optional[str] = None
+        self._fired: set = set()
+
+    def feed(self, path: ScanPath, text: str, done: bool) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        if path is not self._path:
+            self._reset(path)
+        if text:
+            self._parts.append(text)
+            self._size += len(text)
+
+        if done and self._sample is None:
+            value = "".join(self._parts)
+            self._reset(None)
+            yield from self.engine.iter_string_findings(path, value)
+            return
+        if not done and self._size < self.window:
+            return
+
+        value = "".join(self._parts)
+        if self._sample is None:
+            self._sample = value[:100]
+        for rule in self.engine.rules:
+            if rule.name in self._fired:
+                continue
+            finding = rule.match(path, value, self._sample)
+            if finding is not None:
+                self._fired.add(rule.name)
+                yield rule.name, finding
+
+        if done:
+            self._reset(None)
+        else:
+            tail = value[-self.overlap :] if self.overlap else ""
+            self._parts = [tail]
+            self._size = len(tail)
+
+
+class _OpenString:
+    __slots__ = ("path", "is_key", "parts")
+
+    def __init__(self, path: Optional[ScanPath]):
+        self.path = path
+        self.is_key = path is None
+        self.parts: List[str] = []
+
+
+class _Frame:
+    __slots__ = ("is_object", "path", "key", "expect_key", "index")
+
+    def __init__(self, is_object: bool, path: ScanPath):
+        self.is_object = is_object
+        self.path = path
+        self.key: Any = None
+        self.expect_key = is_object
+        self.index = 0
+
+
+class JSONStringStream:
+    def __init__(self, encoding: str = "utf-8"):
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._buffer = ""
+        self._stack: List[_Frame] = []
+        self._string: Optional[_OpenString] = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._stack)
+
+    def _value_path(self) -> ScanPath:
+        if not self._stack:
+            return ROOT_PATH
+        frame = self._stack[-1]
+        if frame.is_object:
+            return ScanPath(frame.path, frame.key)
+        return ScanPath(frame.path, frame.index, is_index=True)
+
+    def feed(self, chunk: Union[bytes, str]) -> List[Tuple[ScanPath, str, bool]]:
+        self._buffer += chunk if isinstance(chunk, str) else self._decoder.decode(chunk)
+        return list(self._parse(final=False))
+
+    def close(self) -> List[Tuple[ScanPath, str, bool]]:
+        self._buffer += self._decoder.decode(b"", final=True)
+        strings = list(self._parse(final=True))
+        if self._stack or self._string is not None or self._buffer.strip():
+            raise ValueError("JSON数据不完整")
+        return strings
+
+    def _set_key(self, key: str):
+        top = self._stack[-1]
+        top.key = key
+        top.expect_key = False
+
+    def _continue_string(self, buffer: str, pos: int) -> Tuple[int, Optional[Tuple[ScanPath, str, bool]]]:
+        end = _STRING_PART.match(buffer, pos).end()
+        closed = end < len(buffer) and buffer[end] == '"'
+        if not closed and len(buffer) - end > 6:
+            raise ValueError(f"无效的JSON: 位置{end}处的转义序列无效")
+        if not closed and _HIGH_SURROGATE_END.search(buffer, max(pos, end - 6), end):
+            end -= 6
+        text = scanstring(buffer[pos:end] + '"', 0)[0] if end > pos else ""
+
+        string = self._string
+        if string.is_key:
+            string.parts.append(text)
+            if closed:
+                self._string = None
+                self._set_key("".join(string.parts))
+            return (end + 1 if closed else end), None
+        if closed:
+            self._string = None
+        if not text and not closed:
+            return end, None
+        return (end + 1 if closed else end), (string.path, text, closed)
+
+    def _parse(self, final: bool) -> Iterator[Tuple[ScanPath, str, bool]]:
+        buffer = self._buffer
+        stack = self._stack
+        size = len(buffer)
+        pos = 0
+
+        try:
+            while True:
+                if self._string is not None:
+                    pos, segment = self._continue_string(buffer, pos)
+                    if segment is not None:
+                        yield segment
+                    if self._string is not None:
+                        break
+                    continue
+
+                pos = _WHITESPACE.match(buffer, pos).end()
+                if pos >= size:
+                    break
+
+                char = buffer[pos]
+                if char == '"':
+                    top = stack[-1] if stack else None
+                    is_key = top is not None and top.expect_key
+                    if _STRING_TAIL.match(buffer, pos + 1) is None:
+                        self._string = _OpenString(None if is_key else self._value_path())
+                        pos += 1
+                        continue
+                    value, end = scanstring(buffer, pos + 1)
+                    if is_key:
+                        self._set_key(value)
+                    else:
+                        yield self._value_path(), value, True
+                    pos = end
+                elif char == "{" or char == "[":
+                    stack.append(_Frame(char == "{", self._value_path()))
+                    pos += 1
+                elif char == "}" or char == "]":
+                    if not stack or stack[-1].is_object != (char == "}"):
+                        raise ValueError(f"无效的JSON: 位置{pos}处意外的'{char}'")
+                    stack.pop()
+                    pos += 1
+                elif char == ",":
+                    if not stack:
+                        raise ValueError(f"无效的JSON: 位置{pos}处意外的','")
+                    top = stack[-1]
+                    if top.is_object:
+                        top.expect_key = True
+                    else:
+                        top.index += 1
+                    pos += 1
+                elif char == ":":
+                    pos += 1
+                else:
+                    match = _LITERAL.match(buffer, pos)
+                    if match is None:
+                        raise ValueError(f"无效的JSON: 位置{pos}处意外的'{char}'")
+                    if match.end() >= size and not final:
+                        break
+                    pos = match.end()
+        finally:
+            self._buffer = buffer[pos:]
@@ -0,0 +1,124 @@
+import hashlib
+import json
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple, Union
+
+import yaml
+from jsonschema import validators
+from jsonschema.exceptions import best_match
+from referencing import Registry, Resource
+from referencing.exceptions import NoSuchResource
+from referencing.jsonschema import DRAFT202012
+
+from config.settings import config
+
+
+class SchemaRegistry:
+    IDENTITY_CACHE_SIZE = 1024
+
+    def __init__(self, schema_dir: Optional[Union[str, Path]] = None):
+        if schema_dir is None:
+            schema_dir = config.base_dir / config.get("validator.schema_dir", "schemas")
+        self.schema_dir = Path(schema_dir)
+        self.hits = 0
+        self.misses = 0
+        self._validators: Dict[str, Any] = {}
+        self._by_identity: Dict[int, Tuple[Any, Any]] = {}
+        self._schemas: Dict[str, Any] = {}
+        self._resources: Dict[str, Resource] = {}
+        self._lock = Lock()
+        self._registry = Registry(retrieve=self._retrieve)
+
+    def _read_file(self, name: str) -> Any:
+        file_path = (self.schema_dir / name).resolve()
+        if self.schema_dir.resolve() not in file_path.parents or not file_path.is_file():
+            raise FileNotFoundError(f"Schema文件不存在: {file_path}")
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            if file_path.suffix in (".yaml", ".yml"):
+                return yaml.safe_load(f)
+            return json.load(f)
+
+    def _retrieve(self, uri: str) -> Resource:
+        resource = self._resources.get(uri)
+        if resource is None:
+            name = uri[len("file://") :] if uri.startswith("file://") else uri
+            try:
+                contents = self._read_file(name)
+            except FileNotFoundError:
+                raise NoSuchResource(ref=uri)
+            resource = Resource.from_contents(contents, default_specification=DRAFT202012)
+            self._resources[uri] = resource
+        return resource
+
+    def load(self, name: str) -> Any:
+        schema = self._schemas.get(name)
+        if schema is None:
+            for candidate in (name, f"{name}.json", f"{name}.yaml", f"{name}.yml"):
+                try:
+                    schema = self._read_file(candidate)
+                    break
+                except FileNotFoundError:
+                    continue
+            else:
+                raise FileNotFoundError(f"Schema文件不存在: {self.schema_dir / name}")
+            self._schemas[name] = schema
+        return schema
+
+    @staticmethod
+    def schema_key(schema: Any) -> str:
+        if isinstance(schema, dict) and isinstance(schema.get("$id"), str):
+            return schema["$id"]
+        canonical = json.dumps(schema, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get_validator(self, schema: Any):
+        entry = self._by_identity.get(id(schema))
+        if entry is not None and entry[0] is schema:
+            self.hits += 1
+            return entry[1]
+
+        key = self.schema_key(schema)
+        with self._lock:
+            validator = self._validators.get(key)
+            if validator is None:
+                self.misses += 1
+                validator_class = validators.validator_for(schema)
+                validator_class.check_schema(schema)
+                validator = validator_class(schema, registry=self._registry)
+                self._validators[key] = validator
+            else:
+                self.hits += 1
+            if len(self._by_identity) >= self.IDENTITY_CACHE_SIZE:
+                self._by_identity.clear()
+            self._by_identity[id(schema)] = (schema, validator)
+        return validator
+
+    def validate(self, instance: Any, schema: Union[str, Dict], first_error_only: bool = False):
+        if isinstance(schema, str):
+            schema = self.load(schema)
+        validator = self.get_validator(schema)
+
+        if first_error_only:
+            error = next(validator.iter_errors(instance), None)
+        else:
+            error = best_match(validator.iter_errors(instance))
+
+        if error is not None:
+            raise error
+
+    def clear(self):
+        with self._lock:
+            self._validators.clear()
+            self._by_identity.clear()
+            self._schemas.clear()
+            self._resources.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"validators": len(self._validators), "hits": self.hits, "misses": self.misses}
+
+
+schema_registry = SchemaRegistry()
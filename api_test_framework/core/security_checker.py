@@ -1,7 +1,6 @@
-import json
-import re
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+from core.scan_engine import JSONStringStream, ScanEngine, ScanRule, SegmentScanner
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -69,189 +68,106 @@ class SecurityChecker:
         self.security_rules = self.config.get("security", {})
         self.sensitive_keywords = self.security_rules.get("sensitive_keywords", [])
         self.blocked_patterns = self.security_rules.get("blocked_patterns", [])
+        self._rules = self._build_rules()
+        self._engines: Dict[Tuple[str, ...], ScanEngine] = {}
+
+    def _build_rules(self) -> Dict[str, ScanRule]:
+        return {
+            "sql_injection": ScanRule(
+                "sql_injection", "SQL注入", "HIGH", patterns=self.SQL_INJECTION_PATTERNS
+            ),
+            "xss": ScanRule("xss", "XSS攻击", "HIGH", patterns=self.XSS_PATTERNS),
+            "path_traversal": ScanRule(
+                "path_traversal", "路径遍历", "HIGH", patterns=self.PATH_TRAVERSAL_PATTERNS
+            ),
+            "command_injection": ScanRule(
+                "command_injection",
+                "命令注入",
+                "CRITICAL",
+                patterns=self.COMMAND_INJECTION_PATTERNS,
+            ),
+            "sensitive_data": ScanRule(
+                "sensitive_data", "敏感数据泄露", "MEDIUM", keywords=self.sensitive_keywords
+            ),
+            "blocked_patterns": ScanRule(
+                "blocked_patterns", "禁止模式", "MEDIUM", patterns=self.blocked_patterns
+            ),
+        }
+
+    def _get_engine(self, names: Tuple[str, ...]) -> ScanEngine:
+        engine = self._engines.get(names)
+        if engine is None:
+            engine = ScanEngine([self._rules[name] for name in names])
+            self._engines[names] = engine
+        return engine
+
+    def _enabled_checks(self) -> Tuple[str, ...]:
+        names = []
+
+        if self.security_rules.get("enable_sql_injection_check", True):
+            names.append("sql_injection")
+
+        if self.security_rules.get("enable_xss_check", True):
+            names.append("xss")
+
+        if self.security_rules.get("enable_auth_bypass_check", True):
+            names.append("path_traversal")
+            names.append("command_injection")
+
+        if self.security_rules.get("enable_sensitive_data_check", True):
+            names.append("sensitive_data")
+
+        names.append("blocked_patterns")
+        return tuple(names)
 
     def check_sql_injection(self, data: Any) -> List[Dict[str, str]]:
-        vulnerabilities = []
-
-        def check_value(value, path=""):
-            if isinstance(value, dict):
-                for key, val in value.items():
-                    check_value(val, f"{path}.{key}" if path else key)
-            elif isinstance(value, list):
-                for i, val in enumerate(value):
-                    check_value(val, f"{path}[{i}]")
-            elif isinstance(value, str):
-                for pattern in self.SQL_INJECTION_PATTERNS:
-                    if re.search(pattern, value, re.IGNORECASE):
-                        vulnerabilities.append(
-                            {
-                                "type": "SQL注入",
-                                "severity": "HIGH",
-                                "location": path,
-                                "value": value[:100],
-                                "pattern": pattern,
-                            }
-                        )
-                        break
-
-        check_value(data)
-        return vulnerabilities
+        return self._get_engine(("sql_injection",)).scan(data)["sql_injection"]
 
     def check_xss(self, data: Any) -> List[Dict[str, str]]:
-        vulnerabilities = []
-
-        def check_value(value, path=""):
-            if isinstance(value, dict):
-                for key, val in value.items():
-                    check_value(val, f"{path}.{key}" if path else key)
-            elif isinstance(value, list):
-                for i, val in enumerate(value):
-                    check_value(val, f"{path}[{i}]")
-            elif isinstance(value, str):
-                for pattern in self.XSS_PATTERNS:
-                    if re.search(pattern, value, re.IGNORECASE):
-                        vulnerabilities.append(
-                            {
-                                "type": "XSS攻击",
-                                "severity": "HIGH",
-                                "location": path,
-                                "value": value[:100],
-                                "pattern": pattern,
-                            }
-                        )
-                        break
-
-        check_value(data)
-        return vulnerabilities
+        return self._get_engine(("xss",)).scan(data)["xss"]
 
     def check_path_traversal(self, data: Any) -> List[Dict[str, str]]:
-        vulnerabilities = []
-
-        def check_value(value, path=""):
-            if isinstance(value, dict):
-                for key, val in value.items():
-                    check_value(val, f"{path}.{key}" if path else key)
-            elif isinstance(value, list):
-                for i, val in enumerate(value):
-                    check_value(val, f"{path}[{i}]")
-            elif isinstance(value, str):
-                for pattern in self.PATH_TRAVERSAL_PATTERNS:
-                    if re.search(pattern, value, re.IGNORECASE):
-                        vulnerabilities.append(
-                            {
-                                "type": "路径遍历",
-                                "severity": "HIGH",
-                                "location": path,
-                                "value": value[:100],
-                                "pattern": pattern,
-                            }
-                        )
-                        break
-
-        check_value(data)
-        return vulnerabilities
+        return self._get_engine(("path_traversal",)).scan(data)["path_traversal"]
 
     def check_command_injection(self, data: Any) -> List[Dict[str, str]]:
-        vulnerabilities = []
-
-        def check_value(value, path=""):
-            if isinstance(value, dict):
-                for key, val in value.items():
-                    check_value(val, f"{path}.{key}" if path else key)
-            elif isinstance(value, list):
-                for i, val in enumerate(value):
-                    check_value(val, f"{path}[{i}]")
-            elif isinstance(value, str):
-                for pattern in self.COMMAND_INJECTION_PATTERNS:
-                    if re.search(pattern, value, re.IGNORECASE):
-                        vulnerabilities.append(
-                            {
-                                "type": "命令注入",
-                                "severity": "CRITICAL",
-                                "location": path,
-                                "value": value[:100],
-                                "pattern": pattern,
-                            }
-                        )
-                        break
-
-        check_value(data)
-        return vulnerabilities
+        return self._get_engine(("command_injection",)).scan(data)["command_injection"]
 
     def check_sensitive_data(self, data: Any) -> List[Dict[str, str]]:
-        vulnerabilities = []
-
-        def check_value(value, path=""):
-            if isinstance(value, dict):
-                for key, val in value.items():
-                    check_value(val, f"{path}.{key}" if path else key)
-            elif isinstance(value, list):
-                for i, val in enumerate(value):
-                    check_value(val, f"{path}[{i}]")
-            elif isinstance(value, str):
-                for keyword in self.sensitive_keywords:
-                    if keyword.lower() in path.lower():
-                        vulnerabilities.append(
-                            {
-                                "type": "敏感数据泄露",
-                                "severity": "MEDIUM",
-                                "location": path,
-                                "value": value[:100],
-                                "keyword": keyword,
-                            }
-                        )
-                        break
-
-        check_value(data)
-        return vulnerabilities
+        return self._get_engine(("sensitive_data",)).scan(data)["sensitive_data"]
 
     def check_blocked_patterns(self, data: Any) -> List[Dict[str, str]]:
-        vulnerabilities = []
-
-        def check_value(value, path=""):
-            if isinstance(value, dict):
-                for key, val in value.items():
-                    check_value(val, f"{path}.{key}" if path else key)
-            elif isinstance(value, list):
-                for i, val in enumerate(value):
-                    check_value(val, f"{path}[{i}]")
-            elif isinstance(value, str):
-                for pattern in self.blocked_patterns:
-                    if re.search(pattern, value, re.IGNORECASE):
-                        vulnerabilities.append(
-                            {
-                                "type": "禁止模式",
-                                "severity": "MEDIUM",
-                                "location": path,
-                                "value": value[:100],
-                                "pattern": pattern,
-                            }
-                        )
-                        break
-
-        check_value(data)
-        return vulnerabilities
+        return self._get_engine(("blocked_patterns",)).scan(data)["blocked_patterns"]
 
     def check_all(self, data: Any) -> Dict[str, List[Dict[str, str]]]:
-        results = {}
-
-        if self.security_rules.get("enable_sql_injection_check", True):
-            results["sql_injection"] = self.check_sql_injection(data)
-
-        if self.security_rules.get("enable_xss_check", True):
-            results["xss"] = self.check_xss(data)
-
-        if self.security_rules.get("enable_auth_bypass_check", True):
-            results["path_traversal"] = self.check_path_traversal(data)
-            results["command_injection"] = self.check_command_injection(data)
-
-        if self.security_rules.get("enable_sensitive_data_check", True):
-            results["sensitive_data"] = self.check_sensitive_data(data)
-
-        results["blocked_patterns"] = self.check_blocked_patterns(data)
-
+        return self._get_engine(self._enabled_checks()).scan(data)
+
+    def check_response(self, response) -> Dict[str, List[Dict[str, str]]]:
+        return self.check_all(response.json())
+
+    def iter_stream_findings(
+        self, chunks: Iterable[Union[bytes, str]]
+    ) -> Iterator[Tuple[str, Dict[str, str]]]:
+        scanner = SegmentScanner(self._get_engine(self._enabled_checks()))
+        stream = JSONStringStream()
+        for chunk in chunks:
+            for path, text, done in stream.feed(chunk):
+                yield from scanner.feed(path, text, done)
+        for path, text, done in stream.close():
+            yield from scanner.feed(path, text, done)
+
+    def check_stream(
+        self, chunks: Iterable[Union[bytes, str]]
+    ) -> Dict[str, List[Dict[str, str]]]:
+        results = self._get_engine(self._enabled_checks()).new_results()
+        for name, finding in self.iter_stream_findings(chunks):
+            results[name].append(finding)
         return results
 
+    def check_response_stream(
+        self, response, chunk_size: int = 65536
+    ) -> Dict[str, List[Dict[str, str]]]:
+        return self.check_stream(response.iter_content(chunk_size=chunk_size))
+
     def generate_report(self, results: Dict[str, List[Dict[str, str]]]) -> str:
         total_vulnerabilities = sum(len(vulns) for vulns in results.values())
 
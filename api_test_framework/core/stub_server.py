@@ -0,0 +1,445 @@
+import argparse
+import asyncio
+import base64
+import inspect
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+from urllib.parse import parse_qsl
+
+from core.api.api_context import APIContext
+from core.api.auth_api import AuthAPI
+from core.api.base_api import BaseAPI
+from core.api.standalone_transfer_api import StandaloneTransferAPI
+from core.api.user_api import UserAPI
+
+DEFAULT_API_CLASSES: Tuple[Type[BaseAPI], ...] = (AuthAPI, UserAPI, StandaloneTransferAPI)
+
+_MARKER_BASE = 987650000
+_REASONS = {
+    200: b"OK",
+    400: b"Bad Request",
+    401: b"Unauthorized",
+    404: b"Not Found",
+    500: b"Internal Server Error",
+}
+
+
+@dataclass
+class StubRoute:
+    method: str
+    template: str
+    name: str
+    params: Tuple[str, ...] = ()
+    body_fields: Tuple[str, ...] = ()
+    auth_required: bool = True
+    pattern: Optional[re.Pattern] = field(default=None, repr=False)
+
+    @property
+    def kind(self) -> str:
+        if "login" in self.name or "token" in self.name:
+            return "token"
+        if self.method == "GET" and "page" in self.params:
+            return "list"
+        return "object"
+
+
+class _NullResponse:
+    status_code = 0
+    text = ""
+    content = b""
+
+    def json(self) -> Dict[str, Any]:
+        return {}
+
+
+class _RecordingClient:
+    base_url = ""
+
+    def __init__(self):
+        self.calls: List[Tuple[str, str, Dict[str, Any]]] = []
+
+    def request(self, method: str, endpoint: str, **kwargs) -> _NullResponse:
+        self.calls.append((method.upper(), endpoint, kwargs))
+        return _NullResponse()
+
+    def get(self, endpoint: str, params: Optional[Dict] = None, **kwargs) -> _NullResponse:
+        return self.request("GET", endpoint, params=params, **kwargs)
+
+    def post(self, endpoint: str, data=None, json=None, **kwargs) -> _NullResponse:
+        return self.request("POST", endpoint, data=data, json=json, **kwargs)
+
+    def put(self, endpoint: str, data=None, json=None, **kwargs) -> _NullResponse:
+        return self.request("PUT", endpoint, data=data, json=json, **kwargs)
+
+    def delete(self, endpoint: str, **kwargs) -> _NullResponse:
+        return self.request("DELETE", endpoint, **kwargs)
+
+    def patch(self, endpoint: str, data=None, json=None, **kwargs) -> _NullResponse:
+        return self.request("PATCH", endpoint, data=data, json=json, **kwargs)
+
+
+def _placeholder_args(func) -> Dict[str, Any]:
+    args = {}
+    for index, (name, param) in enumerate(inspect.signature(func).parameters.items()):
+        if name == "self" or param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        if param.default is not inspect.Parameter.empty:
+            continue
+        annotation = param.annotation
+        if annotation is int:
+            args[name] = _MARKER_BASE + index
+        elif annotation is str:
+            args[name] = f"stub-{name}"
+        else:
+            args[name] = {}
+    return args
+
+
+def discover_routes(api_classes: Sequence[Type[BaseAPI]] = DEFAULT_API_CLASSES) -> List[StubRoute]:
+    routes: Dict[Tuple[str, str], StubRoute] = {}
+    context = APIContext("session", "stub-server")
+
+    for api_class in api_classes:
+        client = _RecordingClient()
+        api = api_class(client=client, context=context)
+        for name, func in inspect.getmembers(api_class, inspect.isfunction):
+            if name.startswith("_") or hasattr(BaseAPI, name):
+                continue
+            args = _placeholder_args(func)
+            del client.calls[:]
+            getattr(api, name)(**args)
+
+            markers = {str(v): k for k, v in args.items() if isinstance(v, int)}
+            for method, endpoint, kwargs in client.calls:
+                template = "/" + "/".join(
+                    f"{{{markers[part]}}}" if part in markers else part
+                    for part in endpoint.strip("/").split("/")
+                )
+                key = (method, template)
+                if key in routes:
+                    continue
+                routes[key] = StubRoute(
+                    method=method,
+                    template=template,
+                    name=name,
+                    params=tuple(kwargs.get("params") or ()),
+                    body_fields=tuple(kwargs.get("json") or ()),
+                    auth_required=not template.startswith("/auth/"),
+                )
+
+    for route in routes.values():
+        if "{" in route.template:
+            route.pattern = re.compile(
+                "^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", route.template) + "$"
+            )
+    routes[("GET", "/system/ping")] = StubRoute("GET", "/system/ping", "ping", auth_required=False)
+    return list(routes.values())
+
+
+def _fake_jwt(subject: str, ttl: int = 3600) -> str:
+    def _encode(data: Dict[str, Any]) -> str:
+        raw = base64.urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+        return raw.rstrip(b"=").decode("ascii")
+
+    now = int(time.time())
+    claims = {"sub": subject, "iat": now, "exp": now + ttl}
+    return f"{_encode({'alg': 'HS256', 'typ': 'JWT'})}.{_encode(claims)}.stub"
+
+
+class StubServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        prefix: str = "",
+        latency_ms: float = 0,
+        latency_jitter_ms: float = 0,
+        error_rate: float = 0,
+        list_size: Optional[int] = None,
+        payload_bytes: int = 0,
+        api_classes: Sequence[Type[BaseAPI]] = DEFAULT_API_CLASSES,
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.prefix = "/" + prefix.strip("/") if prefix.strip("/") else ""
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.list_size = list_size
+        self.payload_bytes = payload_bytes
+        self.routes = discover_routes(api_classes)
+        self.requests: Counter = Counter()
+
+        self._random = random.Random(seed)
+        self._static = {(r.method, r.template): r for r in self.routes if r.pattern is None}
+        self._dynamic = [r for r in self.routes if r.pattern is not None]
+        self._padding = "x" * payload_bytes
+        self._body_cache: Dict[Tuple[str, str], bytes] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}{self.prefix}"
+
+    def match(self, method: str, path: str) -> Tuple[Optional[StubRoute], Dict[str, str]]:
+        route = self._static.get((method, path))
+        if route is not None:
+            return route, {}
+        for route in self._dynamic:
+            if route.method == method:
+                found = route.pattern.match(path)
+                if found:
+                    return route, found.groupdict()
+        return None, {}
+
+    def _pad(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if self._padding:
+            data["padding"] = self._padding
+        return data
+
+    @staticmethod
+    def _envelope(code: int, message: str, data: Any = None) -> bytes:
+        payload = {"code": code, "message": message, "data": data}
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _list_body(self, route: StubRoute, query: str) -> bytes:
+        key = (route.template, query)
+        body = self._body_cache.get(key)
+        if body is None:
+            params = dict(parse_qsl(query))
+            try:
+                page = int(params.get("page", 1) or 1)
+                page_size = int(params.get("page_size") or params.get("pageSize") or 10)
+            except ValueError:
+                return self._envelope(500, "分页参数错误")
+            if page < 1 or page_size < 1:
+                return self._envelope(500, "分页参数错误")
+            size = self.list_size if self.list_size is not None else page_size
+            start = (page - 1) * page_size
+            rows = [
+                self._pad({"id": start + i + 1, "name": f"{route.name}-{start + i + 1}"})
+                for i in range(size)
+            ]
+            data = {"list": rows, "total": start + size, "page": page, "page_size": page_size}
+            body = self._envelope(200, "查询成功", data)
+            if len(self._body_cache) >= 1024:
+                self._body_cache.clear()
+            self._body_cache[key] = body
+        return body
+
+    def handle(
+        self, method: str, target: str, headers: Dict[str, str], body: bytes
+    ) -> Tuple[int, bytes]:
+        path, _, query = target.partition("?")
+        if self.prefix and path.startswith(self.prefix):
+            path = path[len(self.prefix) :] or "/"
+        route, path_params = self.match(method, path)
+        if route is None:
+            self.requests["404"] += 1
+            return 404, self._envelope(404, f"接口不存在: {method} {path}")
+        self.requests[route.name] += 1
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            return 500, self._envelope(500, "服务器内部错误")
+        if route.auth_required and not headers.get("authorization"):
+            return 401, self._envelope(401, "缺少认证信息")
+        if route.template == "/system/ping":
+            return 200, self._envelope(200, "pong", self._pad({"status": "ok"}))
+        if route.kind == "list":
+            return 200, self._list_body(route, query)
+
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            return 400, self._envelope(400, "请求体不是有效的JSON")
+        if isinstance(payload, dict):
+            for name in route.body_fields:
+                if payload.get(name) in ("", None):
+                    return 200, self._envelope(400, f"{name}不能为空")
+        else:
+            payload = {}
+
+        if route.kind == "token":
+            subject = str(payload.get("phone", "stub"))
+            token = _fake_jwt(subject)
+            return 200, self._envelope(
+                200, "登录成功", {"access_token": token, "token_type": "bearer"}
+            )
+        data: Dict[str, Any] = {"id": 1}
+        for value in path_params.values():
+            if value.isdigit():
+                data["id"] = int(value)
+        data.update(payload)
+        return 200, self._envelope(200, "操作成功", self._pad(data))
+
+    def _delay(self) -> float:
+        delay = self.latency_ms
+        if self.latency_jitter_ms:
+            delay += self._random.uniform(0, self.latency_jitter_ms)
+        return delay / 1000
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._server = await self._loop.create_server(
+            lambda: _StubProtocol(self), self.host, self.port, backlog=2048
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self):
+        await self.start()
+        await self._server.serve_forever()
+
+    def start_in_thread(self) -> "StubServer":
+        started = threading.Event()
+
+        def _run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.start())
+            started.set()
+            loop.run_forever()
+            loop.run_until_complete(self.stop())
+            loop.close()
+
+        self._thread = threading.Thread(target=_run, name="stub-server", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop_thread(self):
+        if self._thread is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "StubServer":
+        return self.start_in_thread()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop_thread()
+
+
+class _StubProtocol(asyncio.Protocol):
+    def __init__(self, server: StubServer):
+        self.server = server
+        self.transport: Optional[asyncio.Transport] = None
+        self.buffer = bytearray()
+        self.pending: Optional[asyncio.Future] = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data: bytes):
+        self.buffer.extend(data)
+        while True:
+            head_end = self.buffer.find(b"\r\n\r\n")
+            if head_end < 0:
+                return
+            lines = bytes(self.buffer[:head_end]).decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                self._write(400, StubServer._envelope(400, "请求行格式错误"), False)
+                return
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            try:
+                length = int(headers.get("content-length", 0) or 0)
+            except ValueError:
+                self._write(400, StubServer._envelope(400, "Content-Length格式错误"), False)
+                return
+            end = head_end + 4 + length
+            if len(self.buffer) < end:
+                return
+            body = bytes(self.buffer[head_end + 4 : end])
+            del self.buffer[:end]
+
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+            status, payload = self.server.handle(method.upper(), target, headers, body)
+
+            delay = self.server._delay()
+            if delay or self.pending is not None:
+                self.pending = asyncio.ensure_future(
+                    self._respond_later(self.pending, delay, status, payload, keep_alive)
+                )
+            else:
+                self._write(status, payload, keep_alive)
+
+    async def _respond_later(self, previous, delay: float, status: int, payload: bytes, keep_alive: bool):
+        if delay:
+            await asyncio.sleep(delay)
+        if previous is not None:
+            await previous
+        self._write(status, payload, keep_alive)
+        if self.pending is asyncio.current_task():
+            self.pending = None
+
+    def _write(self, status: int, payload: bytes, keep_alive: bool):
+        if self.transport is None or self.transport.is_closing():
+            return
+        head = (
+            b"HTTP/1.1 %d %s\r\n"
+            b"Content-Type: application/json; charset=utf-8\r\n"
+            b"Content-Length: %d\r\n"
+            b"Connection: %s\r\n\r\n"
+        ) % (status, _REASONS.get(status, b"OK"), len(payload), b"keep-alive" if keep_alive else b"close")
+        self.transport.write(head + payload)
+        if not keep_alive:
+            self.transport.close()
+
+    def connection_lost(self, exc):
+        self.transport = None
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="本地桩服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--prefix", default="")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--list-size", type=int, default=None)
+    parser.add_argument("--payload-bytes", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = StubServer(
+        host=args.host,
+        port=args.port,
+        prefix=args.prefix,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        list_size=args.list_size,
+        payload_bytes=args.payload_bytes,
+    )
+    for route in server.routes:
+        print(f"{route.method:6} {server.prefix}{route.template}")
+    print(f"桩服务已启动: {server.base_url}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+import contextvars
+import re
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+
+from core.load.histogram import LatencyHistogram
+
+TRANSPORT_PHASES = ("pool", "connect", "tls", "send", "ttfb", "body")
+CLIENT_PHASES = ("decode", "validation")
+PHASES = TRANSPORT_PHASES + CLIENT_PHASES
+
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{24,})$"
+)
+
+
+def endpoint_template(method: str, url: str) -> str:
+    path = urlsplit(url).path or "/"
+    segments = ["{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")]
+    return f"{method.upper()} {'/'.join(segments)}"
+
+
+class MetricsSink:
+    def observe(self, endpoint: str, phase: str, value_ms: float):
+        pass
+
+    def record_request(
+        self,
+        endpoint: str,
+        total_ms: float,
+        status_code: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ):
+        pass
+
+    def increment(self, key: str, metric: str, value: int = 1):
+        pass
+
+
+class HistogramSink(MetricsSink):
+    def __init__(self):
+        self._lock = Lock()
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def observe(self, endpoint: str, phase: str, value_ms: float):
+        with self._lock:
+            histogram = self._histograms.get((endpoint, phase))
+            if histogram is None:
+                histogram = self._histograms[(endpoint, phase)] = LatencyHistogram()
+            histogram.record(value_ms)
+
+    def histogram(self, endpoint: str, phase: str) -> Optional[LatencyHistogram]:
+        return self._histograms.get((endpoint, phase))
+
+    def merge_histogram(self, endpoint: str, phase: str, histogram: LatencyHistogram):
+        with self._lock:
+            existing = self._histograms.get((endpoint, phase))
+            if existing is None:
+                existing = self._histograms[(endpoint, phase)] = LatencyHistogram(
+                    max_value_ms=histogram.max_value_us / 1000.0,
+                    sub_bucket_bits=histogram.sub_bucket_bits,
+                )
+            existing.merge(histogram)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = [
+                {"endpoint": endpoint, "phase": phase, "count": histogram.count, **histogram.summary()}
+                for (endpoint, phase), histogram in self._histograms.items()
+            ]
+        order = {phase: i for i, phase in enumerate(PHASES + ("total",))}
+        return sorted(rows, key=lambda row: (row["endpoint"], order.get(row["phase"], len(order))))
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+_metrics_sink: MetricsSink = HistogramSink()
+
+
+def get_metrics_sink() -> MetricsSink:
+    return _metrics_sink
+
+
+def set_metrics_sink(sink: Optional[MetricsSink]) -> MetricsSink:
+    global _metrics_sink
+    previous = _metrics_sink
+    _metrics_sink = sink if sink is not None else MetricsSink()
+    return previous
+
+
+class RequestTimings:
+    def __init__(self, endpoint: str, sink: Optional[MetricsSink] = None):
+        self.endpoint = endpoint
+        self.sink = sink
+        self.phases: Dict[str, float] = {}
+        self.total = 0.0
+        self.connections = 0
+        self.reused = 0
+        self._published = False
+
+    def add(self, phase: str, value_ms: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + value_ms
+        if self._published and self.sink is not None:
+            self.sink.observe(self.endpoint, phase, value_ms)
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, (time.perf_counter() - start) * 1000)
+
+    def publish(
+        self,
+        total_ms: float,
+        status_code: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ):
+        self.total = total_ms
+        self._published = True
+        if self.sink is None:
+            return
+        for phase, value_ms in self.phases.items():
+            self.sink.observe(self.endpoint, phase, value_ms)
+        self.sink.observe(self.endpoint, "total", total_ms)
+        self.sink.record_request(self.endpoint, total_ms, status_code, error)
+
+    @property
+    def server_ms(self) -> float:
+        return self.phases.get("ttfb", 0.0)
+
+    @property
+    def client_ms(self) -> float:
+        return sum(self.phases.get(phase, 0.0) for phase in CLIENT_PHASES)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "endpoint": self.endpoint,
+            **{phase: round(self.phases.get(phase, 0.0), 3) for phase in PHASES},
+            "total": round(self.total, 3),
+            "connections": self.connections,
+            "reused": self.reused,
+        }
+
+    def summary(self) -> str:
+        parts = [f"{phase}={self.phases[phase]:.2f}ms" for phase in PHASES if phase in self.phases]
+        return f"{self.endpoint} total={self.total:.2f}ms " + " ".join(parts)
+
+    def __repr__(self) -> str:
+        return f"<RequestTimings {self.summary()}>"
+
+
+_current: "contextvars.ContextVar[Optional[RequestTimings]]" = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+@contextmanager
+def recording(timings: RequestTimings) -> Iterator[RequestTimings]:
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed_phase(response: Any, phase: str) -> Iterator[None]:
+    timings = getattr(response, "timings", None)
+    if not isinstance(timings, RequestTimings):
+        yield
+        return
+    with timings.measure(phase):
+        yield
+
+
+class _TimingConnectionMixin:
+    _connect_ms = 0.0
+
+    def _new_conn(self):
+        timings = _current.get()
+        if timings is None:
+            return super()._new_conn()
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            self._tcp_ms = (time.perf_counter() - start) * 1000
+            timings.add("connect", self._tcp_ms)
+
+    def connect(self):
+        timings = _current.get()
+        if timings is None:
+            return super().connect()
+        self._tcp_ms = 0.0
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            total_ms = (time.perf_counter() - start) * 1000
+            self._connect_ms += total_ms
+            timings.connections += 1
+            if isinstance(self, HTTPSConnection):
+                timings.add("tls", max(0.0, total_ms - self._tcp_ms))
+
+    def request(self, *args, **kwargs):
+        timings = _current.get()
+        if timings is None:
+            return super().request(*args, **kwargs)
+        self._connect_ms = 0.0
+        start = time.perf_counter()
+        try:
+            return super().request(*args, **kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            timings.add("send", max(0.0, elapsed_ms - self._connect_ms))
+
+    def getresponse(self, *args, **kwargs):
+        timings = _current.get()
+        if timings is None:
+            return super().getresponse(*args, **kwargs)
+        with timings.measure("ttfb"):
+            return super().getresponse(*args, **kwargs)
+
+
+class TimingHTTPConnection(_TimingConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimingHTTPSConnection(_TimingConnectionMixin, HTTPSConnection):
+    pass
@@ -1,11 +1,137 @@
 import json
 import re
-from typing import Any, Dict, List, Optional, Type
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+from urllib.parse import urlsplit
 
-from jmespath import search as jmespath_search
-from jsonschema import ValidationError, validate
-from pydantic import BaseModel
+import jmespath
+from jsonschema import ValidationError
+from pydantic import BaseModel, TypeAdapter
 from pydantic import ValidationError as PydanticValidationError
+from typing_extensions import TypedDict
+
+from config.settings import config
+from core.schema_registry import schema_registry
+from core.timing import PHASES, timed_phase
+
+
+class ExpressionCache:
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, expression: str):
+        with self._lock:
+            compiled = self._cache.get(expression)
+            if compiled is not None:
+                self._cache.move_to_end(expression)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        compiled = jmespath.compile(expression)
+        with self._lock:
+            self._cache[expression] = compiled
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return compiled
+
+    def search(self, expression: str, data: Any) -> Any:
+        return self.get(expression).search(data)
+
+    def search_many(self, expressions: Iterable[str], data: Any) -> Dict[str, Any]:
+        return {expression: self.get(expression).search(data) for expression in expressions}
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._cache),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+expression_cache = ExpressionCache(int(config.get("validator.expression_cache_size", 1024)))
+
+_SIMPLE_FIELD_PATH = re.compile(r"^[A-Za-z_]\w*(\.[A-Za-z_]\w*)*$")
+
+
+@lru_cache(maxsize=256)
+def get_type_adapter(model: Any, many: bool = False, field_path: Optional[str] = None) -> TypeAdapter:
+    annotation = List[model] if many else model  # type: ignore[valid-type]
+    if field_path:
+        for key in reversed(field_path.split(".")):
+            annotation = TypedDict("Envelope", {key: annotation})  # type: ignore[operator]
+    return TypeAdapter(annotation)
+
+
+@dataclass
+class ModelValidationResult:
+    model: str
+    endpoint: str
+    count: int
+    elapsed_ms: float
+    source: str
+    value: Any = field(default=None, repr=False)
+
+
+class ValidationTimings:
+    def __init__(self):
+        self._lock = Lock()
+        self._stats: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    def record(self, result: ModelValidationResult):
+        with self._lock:
+            stats = self._stats.setdefault(
+                (result.endpoint, result.model),
+                {"calls": 0, "items": 0, "total_ms": 0.0, "max_ms": 0.0},
+            )
+            stats["calls"] += 1
+            stats["items"] += result.count
+            stats["total_ms"] += result.elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], result.elapsed_ms)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = [
+                {
+                    "endpoint": endpoint,
+                    "model": model,
+                    **stats,
+                    "avg_ms": stats["total_ms"] / stats["calls"],
+                }
+                for (endpoint, model), stats in self._stats.items()
+            ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+
+validation_timings = ValidationTimings()
+
+
+def _response_endpoint(response) -> str:
+    url = getattr(response, "url", None)
+    path = urlsplit(url).path if isinstance(url, str) else "unknown"
+    method = getattr(getattr(response, "request", None), "method", None)
+    return f"{method} {path}" if isinstance(method, str) else path
 
 
 class ResponseValidator:
@@ -17,32 +143,99 @@ class ResponseValidator:
         ), f"状态码不匹配: 期望 {expected_status}, 实际 {actual_status}"
 
     @staticmethod
-    def validate_json_schema(response, schema: Dict):
+    def validate_json_schema(
+        response, schema: Union[str, Dict], first_error_only: bool = False
+    ):
         try:
             data = response.json()
-            validate(instance=data, schema=schema)
+            with timed_phase(response, "validation"):
+                schema_registry.validate(data, schema, first_error_only=first_error_only)
         except json.JSONDecodeError:
             raise AssertionError("响应不是有效的JSON格式")
         except ValidationError as e:
             raise AssertionError(f"JSON Schema验证失败: {e.message}")
 
     @staticmethod
-    def validate_pydantic_model(response, model: Type[BaseModel]):
+    def _validate_model(
+        response, model: Any, many: bool, field_path: Optional[str]
+    ) -> ModelValidationResult:
+        start = time.perf_counter()
+        content = getattr(response, "content", None)
+        from_json = (
+            isinstance(content, (bytes, str))
+            and not getattr(response, "is_json_decoded", False)
+            and (not field_path or _SIMPLE_FIELD_PATH.match(field_path) is not None)
+        )
+
         try:
-            data = response.json()
-            model(**data)
+            if from_json:
+                with timed_phase(response, "validation"):
+                    value = get_type_adapter(model, many, field_path).validate_json(content)
+                    for key in field_path.split(".") if field_path else []:
+                        value = value[key]
+            else:
+                data = response.json()
+                with timed_phase(response, "validation"):
+                    if field_path:
+                        data = expression_cache.search(field_path, data)
+                    value = get_type_adapter(model, many).validate_python(data)
         except json.JSONDecodeError:
             raise AssertionError("响应不是有效的JSON格式")
         except PydanticValidationError as e:
+            if any(error["type"] == "json_invalid" for error in e.errors()):
+                raise AssertionError("响应不是有效的JSON格式")
             raise AssertionError(f"Pydantic模型验证失败: {e}")
 
+        result = ModelValidationResult(
+            model=getattr(model, "__name__", str(model)),
+            endpoint=_response_endpoint(response),
+            count=len(value) if many else 1,
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+            source="json" if from_json else "python",
+            value=value,
+        )
+        validation_timings.record(result)
+        return result
+
+    @staticmethod
+    def validate_pydantic_model(
+        response, model: Type[BaseModel], field_path: Optional[str] = None
+    ) -> ModelValidationResult:
+        return ResponseValidator._validate_model(response, model, False, field_path)
+
+    @staticmethod
+    def validate_pydantic_models(
+        response, model: Type[BaseModel], field_path: Optional[str] = None
+    ) -> ModelValidationResult:
+        return ResponseValidator._validate_model(response, model, True, field_path)
+
     @staticmethod
     def extract_value(response, expression: str) -> Any:
         try:
             data = response.json()
-            return jmespath_search(expression, data)
         except json.JSONDecodeError:
             raise AssertionError("响应不是有效的JSON格式")
+        with timed_phase(response, "validation"):
+            return expression_cache.search(expression, data)
+
+    @staticmethod
+    def extract_values(response, expressions: Iterable[str]) -> Dict[str, Any]:
+        try:
+            data = response.json()
+        except json.JSONDecodeError:
+            raise AssertionError("响应不是有效的JSON格式")
+        with timed_phase(response, "validation"):
+            return expression_cache.search_many(expressions, data)
+
+    @staticmethod
+    def validate_fields(response, expected_values: Dict[str, Any]):
+        actual_values = ResponseValidator.extract_values(response, expected_values)
+        mismatches = [
+            f"[{field_path}]: 期望 {expected}, 实际 {actual_values[field_path]}"
+            for field_path, expected in expected_values.items()
+            if actual_values[field_path] != expected
+        ]
+        assert not mismatches, "字段值不匹配 " + "; ".join(mismatches)
 
     @staticmethod
     def validate_field(response, field_path: str, expected_value: Any):
@@ -72,11 +265,24 @@ class ResponseValidator:
         ), f"数组长度不匹配 [{field_path}]: 期望 {expected_length}, 实际 {len(value)}"
 
     @staticmethod
-    def validate_response_time(response, max_time_ms: int):
-        elapsed_ms = response.elapsed.total_seconds() * 1000
+    def validate_response_time(response, max_time_ms: int, phase: Optional[str] = None):
+        if phase is None:
+            elapsed_ms = response.elapsed.total_seconds() * 1000
+            assert (
+                elapsed_ms <= max_time_ms
+            ), f"响应时间超限: {elapsed_ms:.2f}ms > {max_time_ms}ms"
+            return
+        if phase not in PHASES + ("total",):
+            raise ValueError(f"未知的耗时阶段: {phase}，可选值: {', '.join(PHASES + ('total',))}")
+        timings = getattr(response, "timings", None)
+        if timings is None:
+            raise AssertionError("响应没有分阶段耗时数据")
+        if phase != "total" and phase not in timings.phases:
+            raise AssertionError(f"响应没有{phase}阶段的耗时数据")
+        elapsed_ms = timings.total if phase == "total" else timings.phases[phase]
         assert (
             elapsed_ms <= max_time_ms
-        ), f"响应时间超限: {elapsed_ms:.2f}ms > {max_time_ms}ms"
+        ), f"{phase}阶段耗时超限: {elapsed_ms:.2f}ms > {max_time_ms}ms"
 
     @staticmethod
     def validate_headers(response, expected_headers: Dict[str, str]):
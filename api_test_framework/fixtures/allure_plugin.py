@@ -0,0 +1,67 @@
+import time
+
+import allure_commons
+import pytest
+from allure_commons.logger import AllureFileLogger
+
+from config.settings import config as settings
+from core.allure_writer import DedupAllureWriter, pack
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _writer_settings():
+    return settings.get("allure_writer", {}) or {}
+
+
+def pytest_addoption(parser):
+    parser.getgroup("reporting").addoption(
+        "--allure-blob-dir", default=None, help="Allure附件去重存储目录，默认读取 allure_writer.blob_dir"
+    )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    options = _writer_settings()
+    if not options.get("enabled", True):
+        return
+    file_loggers = [p for p in allure_commons.plugin_manager.get_plugins() if type(p) is AllureFileLogger]
+    if not file_loggers:
+        return
+
+    file_logger = file_loggers[0]
+    blob_dir = config.getoption("--allure-blob-dir") or options.get("blob_dir")
+    writer = DedupAllureWriter(
+        file_logger._report_dir,
+        blob_dir=settings.base_dir / blob_dir if blob_dir else None,
+        batch_size=int(options.get("batch_size", 200)),
+        flush_interval=float(options.get("flush_interval", 0.5)),
+    )
+    allure_commons.plugin_manager.unregister(file_logger)
+    allure_commons.plugin_manager.register(writer)
+    config._allure_writer = writer
+
+    def _restore():
+        writer.close()
+        allure_commons.plugin_manager.unregister(writer)
+        allure_commons.plugin_manager.register(file_logger)
+
+    config.add_cleanup(_restore)
+
+
+def pytest_unconfigure(config):
+    writer = getattr(config, "_allure_writer", None)
+    if writer is None:
+        return
+    writer.close()
+    stats = writer.stats()
+    if stats.get("attachments"):
+        logger.info(
+            f"Allure附件 {stats['attachments']} 个，新增存储 {stats.get('blob_bytes', 0)} 字节，"
+            f"去重节省 {stats.get('deduped_bytes', 0)} 字节"
+        )
+    archive_dir = _writer_settings().get("archive_dir")
+    if archive_dir and not hasattr(config, "workerinput"):
+        archive = settings.base_dir / archive_dir / f"allure-results-{time.strftime('%Y%m%d-%H%M%S')}.tar.gz"
+        logger.info(f"Allure结果已打包: {pack(writer.report_dir, archive)}")
@@ -0,0 +1,122 @@
+import json
+from fnmatch import fnmatch
+from typing import Dict, Optional
+
+import allure
+import pytest
+
+from core.api.token_manager import TokenManager
+from core.capture import attach, attach_response
+from core.case_executor import CaseExecutor, CaseResult, CaseSuite
+
+DEFAULT_CASE_FILES = "*_test_cases.yaml *_test_cases.yml *_test_cases.json"
+WHOLE_FILE_DIST_MODES = ("loadfile", "loadscope", "loadgroup")
+
+
+class CaseFailure(AssertionError):
+    pass
+
+
+def pytest_addoption(parser):
+    parser.addini("case_files", "由用例执行器直接运行的用例文件匹配模式", type="args", default=DEFAULT_CASE_FILES.split())
+
+
+def pytest_collect_file(file_path, parent):
+    if any(fnmatch(file_path.name, pattern) for pattern in parent.config.getini("case_files")):
+        return CaseFile.from_parent(parent, path=file_path)
+    return None
+
+
+def pytest_unconfigure(config):
+    manager = getattr(config, "_case_token_manager", None)
+    if manager is not None:
+        manager.stop()
+
+
+def _runs_whole_file(config) -> bool:
+    if not hasattr(config, "workerinput"):
+        return True
+    return config.getoption("dist", "no") in WHOLE_FILE_DIST_MODES
+
+
+def _token_manager(config) -> TokenManager:
+    manager = getattr(config, "_case_token_manager", None)
+    if manager is None:
+        manager = config._case_token_manager = TokenManager()
+    return manager
+
+
+class CaseFile(pytest.File):
+    suite: Optional[CaseSuite] = None
+    _executor: Optional[CaseExecutor] = None
+    _results: Optional[Dict[str, CaseResult]] = None
+
+    def collect(self):
+        self.suite = CaseSuite.load(self.path)
+        if self.suite is None:
+            return
+        names = [str(case.get("case_id") or f"case{index + 1}") for index, case in enumerate(self.suite.cases)]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise self.CollectError(f"用例编号重复: {', '.join(duplicates)}")
+
+        group = pytest.mark.xdist_group(str(self.path)) if self.config.pluginmanager.hasplugin("xdist") else None
+        for name, case in zip(names, self.suite.cases):
+            item = CaseItem.from_parent(self, name=name, case=case)
+            for marker in self.suite.markers:
+                item.add_marker(marker)
+            if group is not None:
+                item.add_marker(group)
+            yield item
+
+    def executor(self) -> CaseExecutor:
+        if self._executor is None:
+            token = None
+            if self.suite.auth:
+                token = _token_manager(self.config).get_token(**self.suite.auth) or ""
+            self._executor = CaseExecutor(self.suite, token=token)
+        return self._executor
+
+    def result(self, item: "CaseItem") -> CaseResult:
+        if self._results is None:
+            self._results = {}
+            if _runs_whole_file(self.config):
+                selected = [other for other in self.session.items if other.parent is self]
+                results = self.executor().run([other.case for other in selected])
+                self._results = {other.nodeid: result for other, result in zip(selected, results)}
+        result = self._results.pop(item.nodeid, None)
+        if result is None:
+            result = self.executor().run([item.case])[0]
+        return result
+
+
+class CaseItem(pytest.Item):
+    def __init__(self, *, case, **kwargs):
+        super().__init__(**kwargs)
+        self.case = case
+
+    def runtest(self):
+        result = self.parent.result(self)
+        allure.dynamic.title(f"{result.case_id} {self.case.get('case_name', '')}".strip())
+        if self.case.get("description"):
+            allure.dynamic.description(self.case["description"])
+        attach(
+            json.dumps(self.case.get("params") or {}, ensure_ascii=False, indent=2),
+            name="请求参数",
+            attachment_type=allure.attachment_type.JSON,
+            failed=not result.passed,
+        )
+        if result.response is not None:
+            attach_response(result.response, failed=not result.passed)
+        if result.error is not None:
+            raise result.error
+        if result.failures:
+            raise CaseFailure("\n".join(result.failures))
+
+    def repr_failure(self, excinfo):
+        if isinstance(excinfo.value, CaseFailure):
+            return f"{self.case.get('case_name', self.name)}: {excinfo.value}"
+        return super().repr_failure(excinfo)
+
+    def reportinfo(self):
+        return self.path, None, f"{self.name} {self.case.get('case_name', '')}".strip()
@@ -1,6 +1,7 @@
 import pytest
 import allure
-from core.http_client import HTTPClient
+from core.capture import attach, attach_response
+from core.client_registry import shared_client
 from core.validator import ResponseValidator
 from core.security_checker import SecurityChecker
 
@@ -10,7 +11,7 @@ from core.security_checker import SecurityChecker
 class TestPingAPI:
     @pytest.fixture(autouse=True)
     def setup(self):
-        self.client = HTTPClient()
+        self.client = shared_client()
         self.validator = ResponseValidator()
         self.security_checker = SecurityChecker()
 
@@ -22,17 +23,7 @@ class TestPingAPI:
         with allure.step("发送 GET 请求到 /system/ping"):
             response = self.client.get("/system/ping")
             
-            allure.attach(
-                f"状态码: {response.status_code}",
-                name="响应状态",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            
-            allure.attach(
-                response.text,
-                name="响应内容",
-                attachment_type=allure.attachment_type.TEXT
-            )
+            attach_response(response)
 
         with allure.step("验证响应状态码"):
             self.validator.validate_status_code(response, 200)
@@ -42,7 +33,7 @@ class TestPingAPI:
                 response_data = response.json()
                 assert isinstance(response_data, dict), "响应应该是JSON对象"
                 
-                allure.attach(
+                attach(
                     str(response_data),
                     name="JSON响应",
                     attachment_type=allure.attachment_type.JSON
@@ -88,7 +79,7 @@ class TestPingAPI:
                 response_times.append(response_time_ms)
                 
                 allure.attach(
-                    f"请求 {i+1}: {response_time_ms:.2f}ms",
+                    f"请求 {i+1}: {response_time_ms:.2f}ms\n{response.timings.summary()}",
                     name="响应时间",
                     attachment_type=allure.attachment_type.TEXT
                 )
@@ -125,6 +116,11 @@ class TestPingAPI:
                 name="并发请求结果",
                 attachment_type=allure.attachment_type.TEXT
             )
+            allure.attach(
+                str(self.client.pool_stats()),
+                name="连接池统计",
+                attachment_type=allure.attachment_type.TEXT
+            )
 
         with allure.step("验证所有请求都成功"):
             assert success_count == 10, f"部分请求失败: {success_count}/10"
@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+
+import allure
+import pytest
+
+from config.settings import config
+from utils.benchmark import BenchmarkSuite
+
+BENCHMARK_DIR = Path(__file__).parent
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--framework-bench"):
+        return
+    skip = pytest.mark.skip(reason="基准测试需要使用 --framework-bench 运行")
+    for item in items:
+        if BENCHMARK_DIR in Path(str(item.fspath)).parents:
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    suite = getattr(config, "_bench_suite", None)
+    if suite is None or not suite.results:
+        return
+    terminalreporter.write_sep("-", "基准测试结果")
+    for line in suite.report().splitlines():
+        terminalreporter.write_line(line)
+    if config.getoption("--framework-bench-save"):
+        terminalreporter.write_line(f"基线已保存: {suite.baseline_path}")
+
+
+@pytest.fixture(scope="session")
+def bench_suite(request):
+    options = request.config
+    baseline = options.getoption("--framework-bench-baseline") or config.get(
+        "benchmark.baseline_file", ".framework-bench/baseline.json"
+    )
+    threshold = options.getoption("--framework-bench-threshold")
+    if threshold is None:
+        threshold = float(config.get("benchmark.threshold", 0.3))
+
+    suite = BenchmarkSuite(config.base_dir / baseline, threshold)
+    suite.calibrate()
+    request.config._bench_suite = suite
+    yield suite
+
+    if not suite.results:
+        return
+    results_file = config.base_dir / config.get("benchmark.results_file", "reports/benchmark.json")
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(results_file, "w", encoding="utf-8") as f:
+        json.dump({name: r.to_dict() for name, r in suite.results.items()}, f, ensure_ascii=False, indent=2)
+
+    if options.getoption("--framework-bench-save"):
+        suite.save()
+
+
+@pytest.fixture
+def bench(bench_suite, request):
+    def _run(name, func, **kwargs):
+        result = bench_suite.run(name, func, **kwargs)
+        allure.attach(
+            json.dumps(result.to_dict(), ensure_ascii=False, indent=2),
+            name=f"基准测试: {name}",
+            attachment_type=allure.attachment_type.JSON,
+        )
+        if not request.config.getoption("--framework-bench-save"):
+            regression = bench_suite.compare(result)
+            if regression:
+                pytest.fail(regression)
+        return result
+
+    return _run
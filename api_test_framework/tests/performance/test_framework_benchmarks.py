@@ -0,0 +1,171 @@
+import json
+import random
+import string
+
+import pytest
+import requests
+import yaml
+
+from core.api.api_context import APIContext
+from core.api.base_api import BaseAPI
+from core.api_spec_validator import APISpecValidator
+from core.http_client import HTTPClient
+from core.response import APIResponse
+from core.security_checker import SecurityChecker
+from core.stub_server import StubServer
+from core.validator import ResponseValidator
+from utils.data_generator import DataGenerator
+from utils.data_reader import DataReader
+
+TRANSFER_SCHEMA = {
+    "type": "object",
+    "required": ["code", "message", "data"],
+    "properties": {
+        "code": {"type": "integer"},
+        "message": {"type": "string"},
+        "data": {
+            "type": "object",
+            "properties": {"list": {"type": "array", "items": {"type": "object", "required": ["id"]}}},
+        },
+    },
+}
+
+
+def make_rows(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "platform": rng.choice(["taobao", "jd", "pdd"]),
+            "platform_order_sn": "".join(rng.choices(string.digits, k=12)),
+            "receipt_account_name": "".join(rng.choices(string.ascii_letters, k=16)),
+            "remark": " ".join("".join(rng.choices(string.ascii_lowercase, k=8)) for _ in range(6)),
+        }
+        for i in range(count)
+    ]
+
+
+def payload_of_size(size: int):
+    row_size = len(json.dumps(make_rows(1)[0]))
+    return {"code": 200, "message": "查询成功", "data": {"list": make_rows(max(1, size // row_size))}}
+
+
+def canned_response(body, status_code: int = 200) -> APIResponse:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body, ensure_ascii=False).encode("utf-8")
+    response._content_consumed = True
+    response.headers["Content-Type"] = "application/json; charset=utf-8"
+    response.headers["Content-Length"] = str(len(response._content))
+    response.url = "http://bench.local/api/standalone-transfer"
+    return APIResponse(response)
+
+
+class _NoopClient:
+    base_url = "http://bench.local"
+
+    def __init__(self):
+        self.response = canned_response({"code": 200})
+
+    def request(self, method, endpoint, **kwargs):
+        return self.response
+
+    def get(self, endpoint, params=None, **kwargs):
+        return self.response
+
+    def post(self, endpoint, data=None, json=None, **kwargs):
+        return self.response
+
+    put = patch = post
+
+    def delete(self, endpoint, **kwargs):
+        return self.response
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    with StubServer() as server:
+        yield server
+
+
+@pytest.fixture(scope="module")
+def data_dir(tmp_path_factory):
+    path = tmp_path_factory.mktemp("benchmark_data")
+    cases = [
+        {
+            "case_id": f"TC{i:05d}",
+            "case_name": f"用例{i}",
+            "method": "GET",
+            "params": {"page": i % 50 + 1, "page_size": 10},
+            "expected_status": 200,
+            "expected_code": 200,
+        }
+        for i in range(5000)
+    ]
+    with open(path / "large_cases.yaml", "w", encoding="utf-8") as f:
+        yaml.safe_dump({"test_cases": cases[:2000]}, f, allow_unicode=True)
+    with open(path / "large_cases_json.json", "w", encoding="utf-8") as f:
+        json.dump({"test_cases": cases}, f, ensure_ascii=False)
+    return path
+
+
+@pytest.mark.performance
+class TestFrameworkBenchmarks:
+
+    def test_http_client_request(self, bench, stub_server):
+        client = HTTPClient(base_url=stub_server.base_url)
+        bench("http_client.request", lambda: client.get("/system/ping"))
+        client.close()
+
+    def test_base_api_dispatch(self, bench):
+        api = BaseAPI(client=_NoopClient(), context=APIContext("session:benchmark"))
+        api.context.set("token", "bench-token")
+        params = {"page": 1, "page_size": 10}
+
+        bench("base_api._request", lambda: api._request("GET", "/standalone-transfer", params=params))
+        bench("base_api._get_headers", lambda: api._get_headers({"X-Trace": "bench"}))
+
+    def test_response_validator(self, bench):
+        body = payload_of_size(10 * 1024)
+
+        def assertions():
+            response = canned_response(body)
+            ResponseValidator.validate_status_code(response, 200)
+            ResponseValidator.validate_field(response, "code", 200)
+            ResponseValidator.validate_field_exists(response, "data.list[0].id")
+            ResponseValidator.validate_json_schema(response, TRANSFER_SCHEMA)
+
+        bench("response_validator.assertions", assertions)
+
+    @pytest.mark.parametrize("label,size", [("1kb", 1024), ("100kb", 100 * 1024), ("10mb", 10 * 1024 * 1024)])
+    def test_security_check_all(self, bench, label, size):
+        checker = SecurityChecker()
+        payload = payload_of_size(size)
+        rounds = 3 if size > 1024 * 1024 else 5
+
+        bench(f"security_checker.check_all[{label}]", lambda: checker.check_all(payload), rounds=rounds)
+
+    def test_api_spec_validator(self, bench):
+        validator = APISpecValidator()
+        response = canned_response({"code": 200, "message": "ok", "data": {}})
+        request_data = {"page": 1, "page_size": 10}
+
+        bench(
+            "api_spec_validator.validate_endpoint",
+            lambda: validator.validate_endpoint("GET", "/standalone-transfer", response, request_data),
+        )
+
+    @pytest.mark.parametrize("file_name", ["large_cases", "large_cases_json"])
+    def test_data_reader_get_test_cases(self, bench, data_dir, file_name):
+        reader = DataReader(data_dir)
+        assert reader.get_test_cases(file_name)
+
+        bench(f"data_reader.get_test_cases[{file_name}]", lambda: reader.get_test_cases(file_name), rounds=3)
+
+    def test_data_generator_bulk(self, bench):
+        def generate():
+            for _ in range(100):
+                DataGenerator.generate_user_data()
+                DataGenerator.generate_order_data()
+
+        bench("data_generator.bulk[100]", generate, rounds=3)
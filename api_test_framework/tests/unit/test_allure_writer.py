@@ -0,0 +1,141 @@
+import json
+import os
+import tarfile
+from pathlib import Path
+
+import pytest
+from allure_commons.model2 import Status
+from allure_commons.model2 import TestResult as AllureResult
+
+from core.allure_writer import DedupAllureWriter, pack, prune, unpack
+
+pytest_plugins = ["pytester"]
+
+
+@pytest.fixture
+def writer(tmp_path):
+    writer = DedupAllureWriter(tmp_path / "results", blob_dir=tmp_path / "blobs", flush_interval=0.01)
+    yield writer
+    writer.close()
+
+
+class TestDedupAllureWriter:
+
+    def test_identical_attachments_share_one_blob(self, writer, tmp_path):
+        body = "响应内容" * 100
+        writer.report_attached_data(body, "a-attachment.txt")
+        writer.report_attached_data(body, "b-attachment.txt")
+        writer.report_attached_data("other", "c-attachment.txt")
+        writer.report_attached_data(body, "a-attachment.txt")
+        writer.close()
+
+        results = tmp_path / "results"
+        assert (results / "a-attachment.txt").read_text(encoding="utf-8") == body
+        assert os.path.samefile(results / "a-attachment.txt", results / "b-attachment.txt")
+        assert len(list((tmp_path / "blobs").glob("*/*"))) == 2
+        stats = writer.stats()
+        assert stats["attachments"] == 4
+        assert stats["blobs"] == 2
+        assert stats["deduped_bytes"] == 2 * len(body.encode("utf-8"))
+
+    def test_blobs_are_shared_across_runs(self, tmp_path):
+        for run in ("run1", "run2"):
+            writer = DedupAllureWriter(tmp_path / run, blob_dir=tmp_path / "blobs", flush_interval=0.01)
+            writer.report_attached_data("同一份响应", "x-attachment.txt")
+            writer.close()
+
+        assert os.path.samefile(tmp_path / "run1" / "x-attachment.txt", tmp_path / "run2" / "x-attachment.txt")
+
+    def test_results_written_by_background_thread(self, writer, tmp_path):
+        for i in range(5):
+            writer.report_result(AllureResult(uuid=str(i), name=f"test_{i}", status=Status.PASSED))
+        writer.close()
+
+        files = sorted((tmp_path / "results").glob("*-result.json"))
+        assert len(files) == 5
+        assert {json.loads(f.read_text(encoding="utf-8"))["name"] for f in files} == {f"test_{i}" for i in range(5)}
+        assert not list((tmp_path / "results").glob("*.tmp"))
+
+    def test_attached_file(self, writer, tmp_path):
+        source = tmp_path / "source.log"
+        source.write_text("log", encoding="utf-8")
+        writer.report_attached_file(source, "log-attachment.txt")
+        writer.close()
+
+        assert (tmp_path / "results" / "log-attachment.txt").read_text(encoding="utf-8") == "log"
+
+
+class TestArchive:
+
+    def test_pack_and_unpack(self, writer, tmp_path):
+        body = "x" * 10000
+        for i in range(10):
+            writer.report_attached_data(body, f"{i}-attachment.txt")
+        writer.report_result(AllureResult(uuid="1", name="test", status=Status.PASSED))
+        writer.close()
+
+        archive = pack(tmp_path / "results", tmp_path / "archive" / "run.tar.gz")
+        with tarfile.open(archive) as tar:
+            members = tar.getmembers()
+        assert len(members) == 11
+        assert sum(member.islnk() for member in members) == 9
+
+        restored = unpack(archive, tmp_path / "restored")
+        assert (restored / "9-attachment.txt").read_text(encoding="utf-8") == body
+
+    @pytest.mark.parametrize(
+        "name, kind, linkname",
+        [
+            ("../escape.txt", tarfile.REGTYPE, ""),
+            ("link.txt", tarfile.LNKTYPE, "../../etc/passwd"),
+            ("link.txt", tarfile.SYMTYPE, "0-attachment.txt"),
+        ],
+        ids=["path", "hardlink", "symlink"],
+    )
+    def test_unpack_rejects_unsafe_members(self, tmp_path, name, kind, linkname):
+        member = tarfile.TarInfo(name)
+        member.type = kind
+        member.linkname = linkname
+        archive = tmp_path / "evil.tar.gz"
+        with tarfile.open(archive, "w:gz") as tar:
+            tar.addfile(member)
+
+        with pytest.raises(ValueError, match="归档中包含非法"):
+            unpack(archive, tmp_path / "restored")
+
+    def test_prune_removes_only_unreferenced_blobs(self, writer, tmp_path):
+        writer.report_attached_data("kept", "kept-attachment.txt")
+        writer.report_attached_data("dropped", "dropped-attachment.txt")
+        writer.close()
+        (tmp_path / "results" / "dropped-attachment.txt").unlink()
+
+        assert prune(tmp_path / "blobs", min_age_days=1) == 0
+        assert prune(tmp_path / "blobs", min_age_days=0) == 1
+        assert len(list((tmp_path / "blobs").glob("*/*"))) == 1
+
+
+class TestAllurePlugin:
+
+    def test_replaces_file_logger(self, pytester, tmp_path, monkeypatch):
+        monkeypatch.setenv("PYTHONPATH", str(Path(__file__).parents[2]))
+        pytester.makepyfile(
+            """
+            import allure
+
+            def test_one():
+                allure.attach("相同内容", name="响应内容")
+
+            def test_two():
+                allure.attach("相同内容", name="响应内容")
+            """
+        )
+        results = tmp_path / "allure-results"
+
+        result = pytester.runpytest_subprocess(
+            "-p", "fixtures.allure_plugin", f"--alluredir={results}", f"--allure-blob-dir={tmp_path / 'blobs'}"
+        )
+
+        result.assert_outcomes(passed=2)
+        assert len(list(results.glob("*-result.json"))) == 2
+        assert len(list(results.glob("*-attachment*"))) == 2
+        assert len(list((tmp_path / "blobs").glob("*/*"))) == 1
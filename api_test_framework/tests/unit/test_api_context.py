@@ -0,0 +1,140 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.api.api_context import APIContext
+from core.api.api_manager import APIManager
+from core.load import LoadEngine
+
+
+class TestAPIContext:
+
+    @pytest.fixture(autouse=True)
+    def clean_context(self):
+        for scope in ("task", "thread", "worker", "shared", "session:alice"):
+            APIContext(scope).clear()
+        yield
+        for scope in ("task", "thread", "worker", "shared", "session:alice"):
+            APIContext(scope).clear()
+
+    def test_same_scope_returns_same_instance(self):
+        assert APIContext() is APIContext("shared")
+        assert APIContext("session:alice") is APIContext("session", "alice")
+        assert APIContext("session:alice") is not APIContext("session:bob")
+
+    def test_default_scope_is_process_wide(self):
+        def login():
+            APIContext().set("token", "from-thread")
+
+        async def async_login():
+            APIContext().set("user_id", 1)
+
+        thread = threading.Thread(target=login)
+        thread.start()
+        thread.join()
+        asyncio.run(async_login())
+
+        assert APIContext().get_all() == {"token": "from-thread", "user_id": 1}
+
+    def test_invalid_scope(self):
+        with pytest.raises(ValueError, match="不支持的上下文作用域"):
+            APIContext("galaxy")
+        with pytest.raises(ValueError, match="需要指定名称"):
+            APIContext("session")
+
+    @pytest.mark.parametrize("scope", ["task", "thread"])
+    def test_threads_are_isolated(self, scope):
+        context = APIContext(scope)
+        context.set("token", "main")
+        seen = {}
+        barrier = threading.Barrier(8)
+
+        def user(index: int):
+            context.set("token", f"user-{index}")
+            barrier.wait()
+            seen[index] = context.get("token")
+
+        threads = [threading.Thread(target=user, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert seen == {i: f"user-{i}" for i in range(8)}
+        assert context.get("token") == "main"
+
+    def test_tasks_are_isolated(self):
+        context = APIContext("task")
+        context.set("base", 1)
+
+        async def user(index: int):
+            context.set("token", f"user-{index}")
+            await asyncio.sleep(0)
+            return context.get("token"), context.get("base")
+
+        async def main():
+            return await asyncio.gather(*[user(i) for i in range(20)])
+
+        results = asyncio.run(main())
+
+        assert results == [(f"user-{i}", 1) for i in range(20)]
+        assert not context.has("token")
+
+    def test_worker_and_session_scopes_are_shared_across_threads(self):
+        worker = APIContext("worker")
+        session = APIContext("session:alice")
+
+        def writer():
+            worker.set("token", "worker-token")
+            session.update({"token": "alice-token"})
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        thread.join()
+
+        assert worker.get("token") == "worker-token"
+        assert session.get("token") == "alice-token"
+        assert not APIContext("session:bob").has("token")
+
+    def test_shared_namespace_is_explicit(self):
+        context = APIContext("task")
+        context.shared.set("tenant", "zhijian")
+
+        assert not context.has("tenant")
+        assert APIContext("thread").shared.get("tenant") == "zhijian"
+
+        context.shared.remove("tenant")
+        assert context.shared.get_all() == {}
+
+    def test_managers_in_parallel_threads_keep_their_own_token(self):
+        seen = {}
+
+        def login(index: int):
+            manager = APIManager(client=object(), scope="thread")
+            manager.set_context("token", f"token-{index}")
+            seen[index] = manager.get_context_value("token")
+
+        threads = [threading.Thread(target=login, args=(i,)) for i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert seen == {i: f"token-{i}" for i in range(10)}
+
+    def test_load_engine_threads_inherit_caller_context(self):
+        context = APIContext("task")
+        context.set("token", "caller")
+        seen = []
+
+        def target():
+            seen.append(context.get("token"))
+            context.set("token", "worker")
+            return None
+
+        engine = LoadEngine(target, rate=200, duration=0.1, success_check=lambda r: True)
+        engine.run()
+
+        assert seen and set(seen) == {"caller"}
+        assert context.get("token") == "caller"
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from core.api.api_context import APIContext
+from core.api.api_manager import APIManager
+from core.api.auth_api import AuthAPI
+from core.async_http_client import AsyncHTTPClient
+
+
+def run_with_server(routes, scenario):
+    async def _main():
+        app = web.Application()
+        app.add_routes(routes)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        client = AsyncHTTPClient(base_url=f"http://127.0.0.1:{port}")
+        try:
+            return await scenario(client)
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    return asyncio.run(_main())
+
+
+class TestAsyncHTTPClient:
+
+    @pytest.fixture(autouse=True)
+    def clean_context(self):
+        APIContext().clear()
+        yield
+        APIContext().clear()
+
+    def test_get_with_params_and_headers(self):
+        async def ping(request):
+            return web.json_response(
+                {
+                    "code": 200,
+                    "page": request.query.get("page"),
+                    "trace": request.headers.get("X-Trace"),
+                }
+            )
+
+        async def scenario(client):
+            return await client.get(
+                "/system/ping", params={"page": 1, "skip": None}, headers={"X-Trace": "t1"}
+            )
+
+        response = run_with_server([web.get("/system/ping", ping)], scenario)
+        assert response.status_code == 200
+        assert response.json() == {"code": 200, "page": "1", "trace": "t1"}
+        assert response.headers["content-type"].startswith("application/json")
+
+    def test_retry_on_server_error(self, monkeypatch):
+        calls = []
+
+        async def flaky(request):
+            calls.append(1)
+            if len(calls) < 3:
+                return web.json_response({"code": 503}, status=503)
+            return web.json_response({"code": 200})
+
+        async def scenario(client):
+            monkeypatch.setattr(client, "_get_backoff_time", lambda attempt: 0)
+            return await client.get("/flaky")
+
+        response = run_with_server([web.get("/flaky", flaky)], scenario)
+        assert response.status_code == 200
+        assert len(calls) == 3
+
+    def test_concurrent_requests(self):
+        async def slow(request):
+            await asyncio.sleep(0.05)
+            return web.json_response({"code": 200})
+
+        async def scenario(client):
+            return await asyncio.gather(*[client.get("/slow") for _ in range(100)])
+
+        responses = run_with_server([web.get("/slow", slow)], scenario)
+        assert all(r.status_code == 200 for r in responses)
+
+    def test_api_layer_async_variant(self):
+        async def login(request):
+            body = await request.json()
+            return web.json_response(
+                {"code": 200, "data": {"access_token": f"token-{body['phone']}"}}
+            )
+
+        async def scenario(client):
+            manager = APIManager(client=client)
+            auth_api = manager.register_api("auth", AuthAPI)
+            assert auth_api.is_async
+            return await auth_api.login_and_extract_token("18800000000", "pwd")
+
+        token = run_with_server([web.post("/auth/login", login)], scenario)
+        assert token == "token-18800000000"
+        assert APIContext().get("token") == token
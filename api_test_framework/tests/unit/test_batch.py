@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+from functools import partial
+
+import pytest
+
+from core.api.api_context import APIContext
+from core.api.base_api import BaseAPI
+from core.api.batch import BatchResult, RequestSpec
+from core.api.standalone_transfer_api import StandaloneTransferAPI
+from core.async_http_client import AsyncHTTPClient
+from core.http_client import HTTPClient
+from core.stub_server import StubServer
+
+AUTH = {"Authorization": "Bearer stub"}
+
+
+@pytest.fixture(scope="module")
+def server():
+    with StubServer(latency_ms=30) as server:
+        yield server
+
+
+@pytest.fixture
+def api(server):
+    client = HTTPClient(base_url=server.base_url, headers=AUTH)
+    yield StandaloneTransferAPI(client=client)
+    client.close()
+
+
+class TestRequestSpec:
+
+    def test_from_dict_moves_unknown_keys_to_kwargs(self):
+        spec = RequestSpec.from_dict(
+            {"method": "GET", "endpoint": "/x", "params": {"page": 1}, "timeout": 5, "kwargs": {"verify": False}}
+        )
+
+        assert spec.params == {"page": 1}
+        assert spec.kwargs == {"timeout": 5, "verify": False}
+
+
+class TestBatch:
+
+    def test_results_in_input_order(self, api):
+        specs = [
+            partial(api.get_transfer_list, page=page) for page in range(1, 6)
+        ] + [{"method": "GET", "endpoint": "/standalone-transfer", "params": {"page": 9}}]
+
+        results = api.batch(specs, max_workers=3)
+
+        assert [result.index for result in results] == list(range(6))
+        assert all(result.ok and result.response.status_code == 200 for result in results)
+        assert results[-1].response.json()["data"]["page"] == 9
+
+    def test_runs_concurrently_within_bound(self, api):
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def call():
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            try:
+                return api.get_transfer_list()
+            finally:
+                with lock:
+                    in_flight[0] -= 1
+
+        start = time.perf_counter()
+        results = api.batch([call] * 8, max_workers=4)
+        elapsed = time.perf_counter() - start
+
+        assert all(result.ok for result in results)
+        assert in_flight[1] == 4
+        assert elapsed < 8 * 0.03
+
+    def test_streams_results_and_captures_errors(self, api):
+        def boom():
+            raise ValueError("坏数据")
+
+        seen = []
+        results = api.batch(
+            [(api.get_transfer_list, {"page": 2}), boom, object()],
+            on_result=seen.append,
+        )
+
+        assert sorted(result.index for result in seen) == [0, 1, 2]
+        assert results[0].ok
+        assert isinstance(results[1].error, ValueError)
+        assert isinstance(results[2].error, TypeError)
+        with pytest.raises(ValueError, match="坏数据"):
+            results[1].unwrap()
+
+    def test_iter_batch_yields_as_completed(self, api):
+        def slow():
+            time.sleep(0.2)
+            return "slow"
+
+        order = [result.index for result in api.iter_batch([slow, api.get_transfer_list], max_workers=2)]
+
+        assert order == [1, 0]
+
+    def test_workers_see_caller_context(self, api):
+        APIContext().set("tenant", "t1")
+        try:
+            results = api.batch([lambda: APIContext().get("tenant")] * 3)
+        finally:
+            APIContext().clear()
+
+        assert [result.response for result in results] == ["t1"] * 3
+
+    def test_empty_batch(self, api):
+        assert api.batch([]) == []
+
+
+class TestAsyncBatch:
+
+    def test_async_client_batch(self, server):
+        async def scenario():
+            client = AsyncHTTPClient(base_url=server.base_url, headers=AUTH)
+            try:
+                api = StandaloneTransferAPI(client=client)
+                seen = []
+                results = await api.batch(
+                    [partial(api.get_transfer_list, page=page) for page in range(1, 5)],
+                    max_workers=2,
+                    on_result=seen.append,
+                )
+            finally:
+                await client.close()
+            return results, seen
+
+        results, seen = asyncio.run(scenario())
+
+        assert len(seen) == 4
+        assert [result.response.json()["data"]["page"] for result in results] == [1, 2, 3, 4]
+        assert all(isinstance(result, BatchResult) for result in results)
+
+    def test_iter_batch_requires_sync_client(self):
+        with pytest.raises(TypeError):
+            list(BaseAPI(client=AsyncHTTPClient(base_url="http://127.0.0.1:9")).iter_batch([]))
@@ -0,0 +1,52 @@
+import json
+from dataclasses import replace
+
+from utils.benchmark import BenchmarkResult, BenchmarkSuite, measure
+
+
+def make_result(name: str, ops: float) -> BenchmarkResult:
+    return BenchmarkResult(
+        name=name,
+        ops_per_sec=ops,
+        best_ops_per_sec=ops,
+        mean_us=1e6 / ops,
+        stdev_pct=0.0,
+        rounds=5,
+        iterations=1,
+        alloc_kb=0.0,
+    )
+
+
+class TestBenchmarkSuite:
+
+    def test_measure_reports_throughput_and_allocations(self):
+        result = measure("alloc", lambda: [0] * 50000, rounds=3, min_round_time=0.005)
+
+        assert result.ops_per_sec > 0
+        assert result.best_ops_per_sec >= result.ops_per_sec
+        assert result.iterations >= 1
+        assert result.alloc_kb >= 50000 * 8 / 1024 * 0.9
+
+    def test_save_and_compare_against_calibrated_baseline(self, tmp_path):
+        baseline_path = tmp_path / "baseline.json"
+        suite = BenchmarkSuite(baseline_path, threshold=0.25)
+        suite._calibration = 1000.0
+        suite.results["fast"] = make_result("fast", 200.0)
+        suite.save()
+
+        assert json.loads(baseline_path.read_text("utf-8"))["machine"]["calibration_ops"] == 1000.0
+
+        slower_machine = BenchmarkSuite(baseline_path, threshold=0.25)
+        slower_machine._calibration = 500.0
+        assert slower_machine.expected_ops("fast") == 100.0
+        assert slower_machine.compare(make_result("fast", 80.0)) is None
+
+        regression = slower_machine.compare(make_result("fast", 70.0))
+        assert "fast 性能回退 -30.0%" in regression
+
+    def test_unknown_benchmark_has_no_baseline(self, tmp_path):
+        suite = BenchmarkSuite(tmp_path / "missing.json")
+
+        assert suite.compare(make_result("new", 1.0)) is None
+        suite.results["new"] = replace(make_result("new", 1.0), alloc_kb=2.0)
+        assert "new" in suite.report()
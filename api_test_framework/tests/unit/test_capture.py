@@ -0,0 +1,104 @@
+import pytest
+
+from core.capture import CapturePolicy
+
+
+class FakeReporter:
+    def __init__(self):
+        self.calls = []
+
+    def attach_data(self, uuid, body, name=None, attachment_type=None, extension=None):
+        self.calls.append((uuid, name, body))
+
+
+class FakeResponse:
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+
+@pytest.fixture
+def reporter(monkeypatch):
+    reporter = FakeReporter()
+    monkeypatch.setattr("core.capture._reporters", lambda: [reporter])
+    return reporter
+
+
+class TestTruncate:
+
+    def test_short_text_untouched(self):
+        assert CapturePolicy(max_body_kb=1).truncate("ok") == "ok"
+
+    def test_long_text_cut_at_byte_limit(self):
+        text = CapturePolicy(max_body_kb=1).truncate("x" * 5000)
+
+        assert text.startswith("x" * 1024 + "\n")
+        assert text.endswith("（已截断，原始大小 5000 字节）")
+
+    def test_multibyte_not_split(self):
+        text = CapturePolicy(max_body_kb=1).truncate("转" * 1000)
+
+        assert text.split("\n")[0] == "转" * 341
+
+
+class TestSampling:
+
+    def test_unsampled_success_is_dropped(self, reporter):
+        policy = CapturePolicy(success_sample_rate=0)
+        policy.begin()
+        policy.attach("body", "响应内容")
+        policy.end(failed=False)
+
+        assert reporter.calls == []
+        assert policy.dropped == 1
+
+    def test_failure_keeps_pending_bodies(self, reporter):
+        policy = CapturePolicy(success_sample_rate=0)
+        policy.begin()
+        policy.attach("first", "响应内容")
+        policy.attach("second", "响应内容")
+        assert reporter.calls == []
+        policy.end(failed=True)
+
+        assert [body for _, _, body in reporter.calls] == ["first", "second"]
+
+    def test_pending_is_bounded(self, reporter):
+        policy = CapturePolicy(success_sample_rate=0, max_pending=2)
+        policy.begin()
+        for i in range(5):
+            policy.attach(str(i), "响应内容")
+        policy.end(failed=True)
+
+        assert len(reporter.calls) == 2
+        assert policy.dropped == 3
+
+    def test_error_response_always_kept(self, reporter):
+        policy = CapturePolicy(success_sample_rate=0)
+        policy.begin()
+        policy.attach_response(FakeResponse(500, "boom"))
+        policy.attach_response(FakeResponse(200, "fine"))
+
+        assert [(name, body) for _, name, body in reporter.calls] == [
+            ("响应状态", "状态码: 500"),
+            ("响应内容", "boom"),
+            ("响应状态", "状态码: 200"),
+        ]
+
+    def test_sampled_test_keeps_everything(self, reporter):
+        policy = CapturePolicy(success_sample_rate=0.5, rng=lambda: 0.1)
+        policy.begin()
+        policy.attach("body", "响应内容")
+
+        assert len(reporter.calls) == 1
+
+
+class TestDedupe:
+
+    def test_identical_bodies_share_one_blob(self, reporter):
+        policy = CapturePolicy()
+        policy.attach("same", "响应内容")
+        policy.attach("same", "响应内容")
+        policy.attach("other", "响应内容")
+
+        uuids = [uuid for uuid, _, _ in reporter.calls]
+        assert uuids[0] == uuids[1] != uuids[2]
@@ -0,0 +1,152 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from config.settings import Config, config
+from core.api.standalone_transfer_api import StandaloneTransferAPI
+from core.case_executor import CaseExecutor, CaseSuite, resolve_api
+from core.http_client import HTTPClient
+from core.stub_server import StubServer
+
+pytest_plugins = ["pytester"]
+
+SUITE = {
+    "api": "StandaloneTransferAPI",
+    "operations": {"GET": "get_transfer_list", "POST": "create_transfer"},
+    "auth": {"phone": "13800138000", "password": "secret"},
+    "markers": ["api"],
+    "test_cases": [
+        {"case_id": "TC001", "case_name": "查询", "method": "GET", "params": {"page": 1}, "expected_status": 200, "expected_code": 200},
+        {"case_id": "TC002", "case_name": "非法页码", "method": "GET", "params": {"page": -1}, "expected_status": 200, "expected_code": 500},
+        {"case_id": "TC003", "case_name": "期望错误", "method": "GET", "params": {"page": 2}, "expected_code": 400},
+        {"case_id": "TC004", "case_name": "未知方法", "method": "PATCH", "params": {}},
+    ],
+}
+
+
+@pytest.fixture(scope="module")
+def server():
+    with StubServer() as server:
+        yield server
+
+
+@pytest.fixture
+def suite_file(tmp_path):
+    path = tmp_path / "transfer_test_cases.yaml"
+    path.write_text(yaml.safe_dump(SUITE, allow_unicode=True), encoding="utf-8")
+    return path
+
+
+class TestCaseSuite:
+
+    def test_load(self, suite_file):
+        suite = CaseSuite.load(suite_file)
+
+        assert suite.api is StandaloneTransferAPI
+        assert suite.operation(suite.cases[0]) == "get_transfer_list"
+        assert suite.operation({"operation": "create_transfer"}) == "create_transfer"
+        with pytest.raises(ValueError, match="TC004"):
+            suite.operation(suite.cases[3])
+
+    def test_plain_data_file_is_not_a_suite(self, tmp_path):
+        path = tmp_path / "login_test_cases.yaml"
+        path.write_text("test_cases:\n  - case_id: TC001\n", encoding="utf-8")
+
+        assert CaseSuite.load(path) is None
+
+    def test_resolve_api(self):
+        assert resolve_api("core.api.standalone_transfer_api.StandaloneTransferAPI") is StandaloneTransferAPI
+        with pytest.raises(ValueError):
+            resolve_api("Unknown")
+        with pytest.raises(ValueError):
+            resolve_api("core.http_client.HTTPClient")
+
+
+class TestCaseExecutor:
+
+    def test_run_checks_every_case(self, server, suite_file):
+        client = HTTPClient(base_url=server.base_url)
+        executor = CaseExecutor.from_file(suite_file, client=client, token="stub", max_workers=2)
+        seen = []
+
+        results = executor.run(on_result=seen.append)
+        client.close()
+
+        assert [result.case_id for result in results] == ["TC001", "TC002", "TC003", "TC004"]
+        assert len(seen) == 4
+        assert results[0].passed and results[1].passed
+        assert results[2].failures == ["响应码应该为400，实际为200"]
+        assert isinstance(results[3].error, ValueError)
+
+    def test_without_token_requests_are_rejected(self, server, suite_file):
+        client = HTTPClient(base_url=server.base_url)
+        results = CaseExecutor.from_file(suite_file, client=client).run(SUITE["test_cases"][:1])
+        client.close()
+
+        assert results[0].failures[0] == "状态码应该为200，实际为401"
+
+
+class TestCasePlugin:
+
+    @pytest.fixture(autouse=True)
+    def token_cache(self, tmp_path, monkeypatch):
+        cache_file = tmp_path / "token_cache.json"
+        monkeypatch.setitem(config.config["token_manager"], "cache_file", str(cache_file))
+        monkeypatch.setenv("TOKEN_CACHE_FILE", str(cache_file))
+        return cache_file
+
+    def test_one_report_per_case(self, server, suite_file, pytester, monkeypatch, token_cache):
+        monkeypatch.setattr(Config, "base_url", property(lambda self: server.base_url))
+        pytester.makeini("[pytest]\ncase_files = *_test_cases.yaml\n")
+        (pytester.path / suite_file.name).write_text(suite_file.read_text(encoding="utf-8"), encoding="utf-8")
+
+        result = pytester.runpytest_inprocess("-p", "fixtures.case_plugin", "-p", "no:cacheprovider", "-m", "api")
+
+        result.assert_outcomes(passed=2, failed=2)
+        result.stdout.fnmatch_lines(["*TC003*期望错误: 响应码应该为400，实际为200*"])
+        assert token_cache.exists()
+
+    def test_duplicate_case_ids_rejected_at_collection(self, tmp_path, pytester):
+        suite = {**SUITE, "test_cases": SUITE["test_cases"][:2] + [dict(SUITE["test_cases"][0])]}
+        pytester.makeini("[pytest]\ncase_files = *_test_cases.yaml\n")
+        (pytester.path / "dup_test_cases.yaml").write_text(yaml.safe_dump(suite, allow_unicode=True), encoding="utf-8")
+
+        result = pytester.runpytest_inprocess("-p", "fixtures.case_plugin", "-p", "no:cacheprovider")
+
+        result.assert_outcomes(errors=1)
+        result.stdout.fnmatch_lines(["*用例编号重复: TC001*"])
+
+    def test_rerun_executes_single_case(self, server, suite_file, pytester, monkeypatch):
+        pytest.importorskip("pytest_rerunfailures")
+        monkeypatch.setattr(Config, "base_url", property(lambda self: server.base_url))
+        pytester.makeini("[pytest]\ncase_files = *_test_cases.yaml\n")
+        (pytester.path / suite_file.name).write_text(suite_file.read_text(encoding="utf-8"), encoding="utf-8")
+        before = server.requests["get_transfer_list"]
+
+        result = pytester.runpytest_inprocess(
+            "-p", "fixtures.case_plugin", "-p", "no:cacheprovider", "-p", "rerunfailures", "--reruns", "1", "-k", "TC003"
+        )
+
+        assert result.parseoutcomes() == {"failed": 1, "rerun": 1, "deselected": 3}
+        assert server.requests["get_transfer_list"] - before == 2
+
+    def test_xdist_workers_run_only_their_cases(self, server, suite_file, pytester, monkeypatch):
+        pytest.importorskip("xdist")
+        monkeypatch.setenv("PYTHONPATH", str(Path(__file__).parents[2]))
+        monkeypatch.setenv("STUB_BASE_URL", server.base_url)
+        pytester.makeconftest(
+            "import os\n"
+            "from config.settings import Config, config\n"
+            "Config.base_url = property(lambda self: os.environ['STUB_BASE_URL'])\n"
+            "config.config['token_manager']['cache_file'] = os.environ['TOKEN_CACHE_FILE']\n"
+        )
+        pytester.makeini("[pytest]\ncase_files = *_test_cases.yaml\n")
+        (pytester.path / suite_file.name).write_text(suite_file.read_text(encoding="utf-8"), encoding="utf-8")
+        before = server.requests["get_transfer_list"]
+
+        result = pytester.runpytest_subprocess("-p", "fixtures.case_plugin", "-p", "no:cacheprovider", "-n", "2")
+
+        result.assert_outcomes(passed=2, failed=2)
+        assert server.requests["get_transfer_list"] - before == 3
+
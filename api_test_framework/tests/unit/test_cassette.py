@@ -0,0 +1,121 @@
+import pytest
+
+from core.cassette import Cassette, CassetteMiss, CassetteStore
+from core.http_client import HTTPClient
+
+BASE_URL = "http://cassette.test/api"
+
+
+class TestCassetteStore:
+
+    def test_put_get_and_reopen(self, tmp_path):
+        store = CassetteStore(tmp_path)
+        for i in range(2000):
+            store.put(i.to_bytes(20, "big"), {"i": i}, f"body-{i}".encode())
+        store.close()
+
+        reopened = CassetteStore(tmp_path)
+        assert len(reopened) == 2000
+        assert reopened.get((1234).to_bytes(20, "big")) == ({"i": 1234}, b"body-1234")
+        assert reopened.get(b"\xff" * 20) is None
+
+    def test_last_write_wins(self, tmp_path):
+        store = CassetteStore(tmp_path)
+        key = b"k" * 20
+        store.put(key, {"v": 1}, b"old")
+        store.put(key, {"v": 2}, b"new")
+
+        assert store.get(key) == ({"v": 2}, b"new")
+        assert len(store) == 1
+
+    def test_sees_records_appended_by_other_writers(self, tmp_path):
+        reader = CassetteStore(tmp_path)
+        reader.put(b"a" * 20, {}, b"first")
+        assert reader.get(b"a" * 20) == ({}, b"first")
+
+        writer = CassetteStore(tmp_path)
+        writer.put(b"b" * 20, {}, b"x" * 100000)
+
+        assert reader.get(b"b" * 20) == ({}, b"x" * 100000)
+
+    def test_ignores_truncated_index_record(self, tmp_path):
+        store = CassetteStore(tmp_path)
+        store.put(b"a" * 20, {}, b"ok")
+        with open(tmp_path / "index.bin", "ab") as f:
+            f.write(b"\x00" * 7)
+
+        assert len(CassetteStore(tmp_path)) == 1
+
+
+class TestHTTPClientCassette:
+
+    @pytest.fixture
+    def transfer_list(self, mock_api):
+        return mock_api.get(
+            f"{BASE_URL}/api/standalone-transfer",
+            json={"code": 200, "data": {"list": [{"id": 1}]}},
+            headers={"X-Trace": "t1"},
+        )
+
+    def test_record_then_replay_without_network(self, tmp_path, transfer_list):
+        recorder = HTTPClient(base_url=BASE_URL, cassette=Cassette(tmp_path, "record"))
+        recorded = recorder.get("/api/standalone-transfer", params={"page": 1, "page_size": 10})
+        assert transfer_list.call_count == 1
+
+        cassette = Cassette(tmp_path, "replay")
+        player = HTTPClient(base_url=BASE_URL, cassette=cassette)
+        replayed = player.get("/api/standalone-transfer", params={"page_size": 10, "page": 1})
+
+        assert transfer_list.call_count == 1
+        assert replayed.status_code == 200
+        assert replayed.json() == recorded.json()
+        assert replayed.headers["x-trace"] == "t1"
+        assert b"".join(replayed.iter_content(4)) == recorded.content
+        assert replayed.request.method == "GET"
+        assert cassette.stats()["hits"] == 1
+
+    def test_replay_miss_raises(self, tmp_path):
+        client = HTTPClient(base_url=BASE_URL, cassette=Cassette(tmp_path, "replay"))
+
+        with pytest.raises(CassetteMiss, match="未找到录制的请求"):
+            client.get("/api/standalone-transfer", params={"page": 1})
+
+    def test_auto_mode_records_on_miss(self, tmp_path, transfer_list):
+        client = HTTPClient(base_url=BASE_URL, cassette=Cassette(tmp_path, "auto"))
+
+        for _ in range(3):
+            client.get("/api/standalone-transfer")
+
+        assert transfer_list.call_count == 1
+        assert client.cassette.stats() == {"entries": 1, "hits": 2, "misses": 1, "recorded": 1}
+
+    def test_key_normalizes_json_body_and_ignores_headers(self, tmp_path, mock_api):
+        login = mock_api.post(f"{BASE_URL}/auth/login", json={"code": 200})
+        client = HTTPClient(base_url=BASE_URL, cassette=Cassette(tmp_path, "auto"))
+
+        client.post("/auth/login", json={"phone": "1", "password": "p"})
+        client.post(
+            "/auth/login",
+            json={"password": "p", "phone": "1"},
+            headers={"Authorization": "Bearer other"},
+        )
+        client.post("/auth/login", json={"phone": "2", "password": "p"})
+
+        assert login.call_count == 2
+
+    def test_record_mode_uploads_file_once(self, tmp_path, mock_api):
+        upload = mock_api.post(f"{BASE_URL}/api/upload", json={"code": 200})
+        attachment = tmp_path / "report.csv"
+        attachment.write_bytes(b"id,name\n1,alice\n")
+        client = HTTPClient(base_url=BASE_URL, cassette=Cassette(tmp_path / "cassette", "record"))
+
+        with open(attachment, "rb") as f:
+            client.post("/api/upload", files={"file": f})
+
+        assert upload.call_count == 1
+        assert b"id,name\n1,alice\n" in upload.last_request.body
+        assert client.cassette.stats()["recorded"] == 1
+
+    def test_invalid_mode(self, tmp_path):
+        with pytest.raises(ValueError, match="不支持的录制回放模式"):
+            Cassette(tmp_path, "rewind")
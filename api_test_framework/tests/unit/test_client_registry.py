@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests_mock
+
+from core.api.api_manager import APIManager
+from core.api.auth_api import AuthAPI
+from core.api.standalone_transfer_api import StandaloneTransferAPI
+from core.client_registry import ClientRegistry, HeaderClient, client_registry, shared_client
+from core.stub_server import StubServer
+
+
+@pytest.fixture
+def registry():
+    registry = ClientRegistry()
+    yield registry
+    registry.close_all()
+
+
+class TestClientRegistry:
+
+    def test_same_target_returns_same_client(self, registry):
+        first = registry.get("http://a.test/api")
+        assert registry.get("http://a.test/api/") is first
+        assert registry.get("http://b.test/api") is not first
+        assert registry.get("http://a.test/api", timeout=5) is not first
+        assert registry.get("http://a.test/api", headers={"X-Tenant": "1"}) is not first
+        assert len(registry) == 4
+
+    def test_concurrent_get_creates_one_client(self, registry):
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            clients = set(map(id, executor.map(lambda _: registry.get("http://a.test/api"), range(64))))
+
+        assert len(clients) == 1
+
+    def test_close_all_resets(self, registry):
+        client = registry.get("http://a.test/api")
+        registry.close_all()
+
+        assert len(registry) == 0
+        assert registry.get("http://a.test/api") is not client
+
+    def test_fork_starts_with_empty_registry(self, registry, monkeypatch):
+        client = registry.get("http://a.test/api")
+        monkeypatch.setattr("os.getpid", lambda: -1)
+
+        assert registry.get("http://a.test/api") is not client
+
+    def test_api_objects_share_connections(self):
+        with StubServer() as server:
+            managers = [APIManager(client=shared_client(server.base_url), scope="session:registry") for _ in range(3)]
+            for manager in managers:
+                manager.register_api("transfer", StandaloneTransferAPI).get_transfer_list()
+
+            client = shared_client(server.base_url)
+            stats = next(iter(client.pool_stats().values()))
+
+        assert {id(manager.client) for manager in managers} == {id(client)}
+        assert client in client_registry
+        assert stats["new_connections"] == 1
+        assert stats["reused"] == 2
+
+    def test_default_client_is_shared(self):
+        assert AuthAPI().client is APIManager().client is shared_client()
+
+
+class TestHeaderClient:
+
+    def test_headers_added_per_request(self, registry):
+        client = registry.get("http://stub.local")
+        authed = HeaderClient(client, {"Authorization": "Bearer token"})
+        with requests_mock.Mocker() as m:
+            m.get("http://stub.local/system/ping", json={"code": 200})
+            authed.get("/system/ping", headers={"X-Trace": "1"})
+            client.get("/system/ping")
+
+        assert m.request_history[0].headers["Authorization"] == "Bearer token"
+        assert m.request_history[0].headers["X-Trace"] == "1"
+        assert "Authorization" not in m.request_history[1].headers
+        assert "Authorization" not in client.headers
+        assert authed.headers["Authorization"] == "Bearer token"
+        assert authed.base_url == client.base_url
@@ -0,0 +1,86 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from requests.packages.urllib3.util.retry import Retry
+
+from config.settings import Config
+from core.connection_pool import InstrumentedHTTPAdapter
+from core.http_client import HTTPClient
+from core.stub_server import StubServer
+
+CONCURRENCY = 16
+
+
+@pytest.fixture(scope="module")
+def server():
+    with StubServer(latency_ms=30) as server:
+        yield server
+
+
+def make_client(server, **adapter_kwargs):
+    client = HTTPClient(base_url=server.base_url)
+    adapter = InstrumentedHTTPAdapter(max_retries=Retry(total=0), **adapter_kwargs)
+    client.session.mount("http://", adapter)
+    return client
+
+
+def burst(client, rounds=3):
+    barrier = threading.Barrier(CONCURRENCY)
+
+    def call(_):
+        barrier.wait()
+        return client.get("/system/ping").status_code
+
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        for _ in range(rounds):
+            assert set(executor.map(call, range(CONCURRENCY))) == {200}
+    stats = client.pool_stats()
+    client.close()
+    return next(iter(stats.values()))
+
+
+class TestConnectionPool:
+
+    def test_fixed_pool_discards_overflow(self, server):
+        stats = burst(make_client(server, pool_maxsize=4))
+
+        assert stats["checkouts"] == CONCURRENCY * 3
+        assert stats["discards"] > 0
+        assert stats["new_connections"] > CONCURRENCY
+        assert stats["maxsize"] == 4
+
+    def test_blocking_pool_waits(self, server):
+        stats = burst(make_client(server, pool_maxsize=4, pool_block=True), rounds=1)
+
+        assert stats["waits"] > 0
+        assert stats["max_wait_ms"] > 0
+        assert stats["discards"] == 0
+        assert stats["new_connections"] <= 4
+        assert stats["peak_in_use"] <= 4
+
+    def test_adaptive_pool_grows_to_concurrency(self, server):
+        stats = burst(make_client(server, pool_maxsize=4, adaptive=True, max_pool_size=64))
+
+        assert stats["discards"] == 0
+        assert stats["grown"] > 0
+        assert stats["maxsize"] <= CONCURRENCY
+        assert stats["new_connections"] <= CONCURRENCY
+        assert stats["reuse_ratio"] >= 0.6
+
+    def test_adaptive_pool_respects_limit(self, server):
+        stats = burst(make_client(server, pool_maxsize=2, adaptive=True, max_pool_size=6), rounds=1)
+
+        assert stats["maxsize"] == 6
+
+    def test_pool_settings_from_config(self, server, monkeypatch):
+        monkeypatch.setattr(
+            Config, "pool", property(lambda self: {"maxsize": 3, "block": True, "adaptive": True, "max_size": 7})
+        )
+        client = HTTPClient(base_url=server.base_url)
+        adapter = client.session.get_adapter(server.base_url)
+        client.close()
+
+        assert adapter._pool_maxsize == 3
+        assert adapter._pool_block is True
+        assert adapter.poolmanager.adaptive_limit == 7
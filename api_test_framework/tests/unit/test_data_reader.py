@@ -0,0 +1,173 @@
+import os
+
+import pytest
+
+from utils.data_reader import DataReader, ParseCache, worker_shard
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(sidecar_dir=tmp_path / "sidecars")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "cases.yaml").write_text("test_cases:\n  - case_id: TC001\n  - case_id: TC002\n", encoding="utf-8")
+    (data_dir / "cases.json").write_text('[{"case_id": "JSON"}]', encoding="utf-8")
+    (data_dir / "user.json").write_text('{"name": "张三", "age": 20}', encoding="utf-8")
+    return data_dir
+
+
+def touch(path, text):
+    stat = path.stat()
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestDataReader:
+
+    def test_yaml_preferred_over_json(self, data_dir, cache):
+        reader = DataReader(data_dir, cache=cache)
+
+        assert [case["case_id"] for case in reader.get_test_cases("cases")] == ["TC001", "TC002"]
+        assert sorted(reader.list_data_files()) == ["cases", "user"]
+
+    def test_repeated_reads_hit_cache(self, data_dir, cache):
+        reader = DataReader(data_dir, cache=cache)
+        reader.get_test_data("user")
+        reader.get_test_data("user", "name")
+        DataReader(data_dir, cache=cache).read("user")
+
+        assert cache.stats() == {"files": 1, "hits": 2, "misses": 1, "sidecar_hits": 0}
+
+    def test_returned_data_is_a_copy(self, data_dir, cache):
+        reader = DataReader(data_dir, cache=cache)
+        reader.get_test_cases("cases")[0]["case_id"] = "changed"
+
+        assert reader.get_test_cases("cases")[0]["case_id"] == "TC001"
+
+    def test_modified_file_is_reparsed(self, data_dir, cache):
+        reader = DataReader(data_dir, cache=cache)
+        assert reader.get_test_data("user", "age") == 20
+        touch(data_dir / "user.json", '{"name": "张三", "age": 21}')
+
+        assert reader.get_test_data("user", "age") == 21
+        assert cache.misses == 2
+
+    def test_new_file_found_after_index_built(self, data_dir, cache):
+        reader = DataReader(data_dir, cache=cache)
+        reader.read("user")
+        (data_dir / "order.yml").write_text("id: 1\n", encoding="utf-8")
+
+        assert reader.get_test_data("order", "id") == 1
+
+    def test_missing_file(self, data_dir, cache):
+        with pytest.raises(FileNotFoundError, match="数据文件不存在"):
+            DataReader(data_dir, cache=cache).read("missing")
+
+
+class TestSidecar:
+
+    def test_sidecar_reused_by_new_process_cache(self, data_dir, tmp_path):
+        DataReader(data_dir, cache=ParseCache(tmp_path / "sidecars")).read("cases")
+        fresh = ParseCache(tmp_path / "sidecars")
+
+        assert DataReader(data_dir, cache=fresh).get_test_cases("cases")[1]["case_id"] == "TC002"
+        assert fresh.stats()["sidecar_hits"] == 1
+        assert fresh.stats()["misses"] == 0
+
+    def test_stale_sidecar_ignored(self, data_dir, tmp_path):
+        DataReader(data_dir, cache=ParseCache(tmp_path / "sidecars")).read("user")
+        touch(data_dir / "user.json", '{"name": "李四"}')
+        fresh = ParseCache(tmp_path / "sidecars")
+
+        assert DataReader(data_dir, cache=fresh).get_test_data("user", "name") == "李四"
+        assert fresh.stats()["sidecar_hits"] == 0
+
+    def test_corrupt_sidecar_ignored(self, data_dir, tmp_path):
+        cache = ParseCache(tmp_path / "sidecars")
+        DataReader(data_dir, cache=cache).read("user")
+        for sidecar in (tmp_path / "sidecars").iterdir():
+            sidecar.write_bytes(b"broken")
+        fresh = ParseCache(tmp_path / "sidecars")
+
+        assert DataReader(data_dir, cache=fresh).get_test_data("user", "name") == "张三"
+
+
+class TestIterTestCases:
+
+    @pytest.fixture
+    def reader(self, data_dir, cache, monkeypatch):
+        monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+        (data_dir / "suite.yaml").write_text(
+            "api: StandaloneTransferAPI\n"
+            "test_cases:\n"
+            "  - &base {case_id: TC001, expected_status: 200}\n"
+            "  - {<<: *base, case_id: TC002}\n"
+            "  - case_id: TC003\n",
+            encoding="utf-8",
+        )
+        (data_dir / "multi.yaml").write_text(
+            "case_id: A\n---\n- case_id: B\n- case_id: C\n---\ntest_cases:\n  - case_id: D\n---\n", encoding="utf-8"
+        )
+        (data_dir / "rows.jsonl").write_text(
+            "\n".join(f'{{"case_id": "R{i}", "page": {i}}}' for i in range(10)) + "\n\n", encoding="utf-8"
+        )
+        (data_dir / "rows.csv").write_text("case_id,phone\nC1,13800138000\nC2,13900139000\n", encoding="utf-8")
+        return DataReader(data_dir, cache=cache)
+
+    def test_yaml_test_cases_sequence(self, reader):
+        cases = list(reader.iter_test_cases("suite"))
+
+        assert [case["case_id"] for case in cases] == ["TC001", "TC002", "TC003"]
+        assert cases[1]["expected_status"] == 200
+
+    def test_yaml_multi_document(self, reader):
+        assert [case["case_id"] for case in reader.iter_test_cases("multi")] == ["A", "B", "C", "D"]
+
+    def test_jsonl_records(self, reader):
+        cases = list(reader.iter_test_cases("rows"))
+
+        assert len(cases) == 10
+        assert cases[3] == {"case_id": "R3", "page": 3}
+
+    def test_csv_rows(self, reader):
+        assert list(reader.iter_test_cases("rows.csv")) == [
+            {"case_id": "C1", "phone": "13800138000"},
+            {"case_id": "C2", "phone": "13900139000"},
+        ]
+
+    def test_json_matches_get_test_cases(self, reader):
+        assert list(reader.iter_test_cases("user")) == reader.get_test_cases("user")
+        assert list(reader.iter_test_cases("cases.json")) == [{"case_id": "JSON"}]
+
+    @pytest.mark.parametrize("file_name", ["suite", "multi", "rows", "rows.csv", "cases.json"])
+    def test_shards_partition_all_cases(self, reader, file_name):
+        everything = list(reader.iter_test_cases(file_name))
+        shards = [list(reader.iter_test_cases(file_name, index, 3)) for index in range(3)]
+
+        assert sum(len(shard) for shard in shards) == len(everything)
+        assert sorted(map(str, sum(shards, []))) == sorted(map(str, everything))
+
+    def test_worker_shard_from_xdist(self, monkeypatch):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw2")
+        monkeypatch.setenv("PYTEST_XDIST_WORKER_COUNT", "4")
+
+        assert worker_shard() == (2, 4)
+
+    def test_defaults_to_worker_shard(self, reader, monkeypatch):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+        monkeypatch.setenv("PYTEST_XDIST_WORKER_COUNT", "3")
+
+        assert list(reader.iter_test_cases("rows")) == list(reader.iter_test_cases("rows", 1, 3))
+        assert len(list(reader.iter_test_cases("rows", 0, 1))) == 10
+
+    def test_invalid_shard(self, reader):
+        with pytest.raises(ValueError, match="无效的分片参数"):
+            reader.iter_test_cases("rows", 3, 3)
+
+    def test_missing_file_raises_immediately(self, reader):
+        with pytest.raises(FileNotFoundError):
+            reader.iter_test_cases("missing")
@@ -0,0 +1,102 @@
+import json
+import threading
+
+import pytest
+
+from core.http_client import HTTPClient
+from core.latency_aggregator import OVERFLOW_ENDPOINT, LatencyAggregator
+from core.stub_server import StubServer
+from core.timing import set_metrics_sink
+
+
+def feed(aggregator, endpoint, values, status_code=200):
+    for value in values:
+        aggregator.observe(endpoint, "ttfb", value * 0.8)
+        aggregator.observe(endpoint, "total", value)
+        aggregator.record_request(endpoint, value, status_code)
+
+
+class TestLatencyAggregator:
+
+    def test_report_per_endpoint(self):
+        aggregator = LatencyAggregator()
+        feed(aggregator, "GET /user/{id}", range(1, 101))
+        feed(aggregator, "GET /user/{id}", [5] * 25, status_code=500)
+        aggregator.record_request("POST /auth/login", 0, error=ConnectionError())
+
+        report = aggregator.report()
+        user = report["endpoints"]["GET /user/{id}"]
+        assert report["requests"] == 126
+        assert user["count"] == 125
+        assert user["error_rate"] == 0.2
+        assert user["status_codes"] == {"200": 100, "500": 25}
+        assert set(user["latency_ms"]) == {"p50", "p90", "p99", "mean", "max"}
+        assert user["latency_ms"]["max"] == 100
+        assert user["latency_ms"]["p90"] == pytest.approx(88, rel=0.05)
+        assert user["phases_ms"]["ttfb"]["max"] == pytest.approx(80, rel=0.01)
+        assert report["endpoints"]["POST /auth/login"]["exceptions"] == {"ConnectionError": 1}
+
+    def test_merge_matches_single_process(self):
+        combined = LatencyAggregator()
+        workers = [LatencyAggregator(), LatencyAggregator()]
+        for i in range(1000):
+            value = (i * 37) % 500 + 1
+            feed(combined, "GET /system/ping", [value])
+            feed(workers[i % 2], "GET /system/ping", [value])
+
+        merged = LatencyAggregator()
+        for worker in workers:
+            merged.merge(LatencyAggregator.from_dict(json.loads(json.dumps(worker.to_dict()))))
+
+        expected = combined.report()["endpoints"]["GET /system/ping"]
+        actual = merged.report()["endpoints"]["GET /system/ping"]
+        assert actual["count"] == expected["count"] == 1000
+        assert actual["latency_ms"] == expected["latency_ms"]
+        assert actual["phases_ms"] == expected["phases_ms"]
+
+    def test_endpoint_limit_keeps_memory_bounded(self):
+        aggregator = LatencyAggregator(max_endpoints=2)
+        for i in range(10):
+            feed(aggregator, f"GET /report/{i}", [1])
+
+        endpoints = aggregator.report()["endpoints"]
+        assert set(endpoints) == {"GET /report/0", "GET /report/1", OVERFLOW_ENDPOINT}
+        assert endpoints[OVERFLOW_ENDPOINT]["count"] == 8
+
+    def test_endpoint_limit_holds_under_concurrent_first_observations(self):
+        aggregator = LatencyAggregator(max_endpoints=5)
+        barrier = threading.Barrier(40)
+
+        def observe(index: int):
+            barrier.wait()
+            aggregator.observe(f"GET /report/{index}", "total", 1)
+            aggregator.record_request(f"GET /report/{index}", 1, 200)
+
+        threads = [threading.Thread(target=observe, args=(i,)) for i in range(40)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        endpoints = aggregator.report()["endpoints"]
+        assert len(endpoints) == 6
+        assert {endpoint for endpoint, _ in aggregator._histograms} == set(endpoints)
+        assert endpoints[OVERFLOW_ENDPOINT]["count"] == 35
+
+    def test_fed_by_http_client(self, tmp_path):
+        aggregator = LatencyAggregator()
+        previous = set_metrics_sink(aggregator)
+        try:
+            with StubServer() as server, HTTPClient(base_url=server.base_url) as client:
+                client.get("/system/ping")
+                client.get("/user/123")
+                client.get("/user/456")
+        finally:
+            set_metrics_sink(previous)
+
+        path = aggregator.write_report(tmp_path / "latency.json")
+        with open(path, encoding="utf-8") as f:
+            report = json.load(f)
+        assert report["endpoints"]["GET /user/{id}"]["count"] == 2
+        assert report["endpoints"]["GET /user/{id}"]["status_codes"] == {"401": 2}
+        assert report["endpoints"]["GET /system/ping"]["error_rate"] == 0.0
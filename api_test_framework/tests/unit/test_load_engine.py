@@ -0,0 +1,99 @@
+import asyncio
+import itertools
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from core.load import LatencyHistogram, LoadEngine, LoadStage
+
+
+class TestLatencyHistogram:
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record(value)
+
+        assert histogram.count == 1000
+        assert histogram.percentile(50) == pytest.approx(500, rel=0.02)
+        assert histogram.percentile(99) == pytest.approx(990, rel=0.02)
+        assert histogram.percentile(100) == 1000
+        assert histogram.min == 1
+        assert histogram.mean == pytest.approx(500.5)
+
+    def test_merge_and_serialize(self):
+        first = LatencyHistogram()
+        second = LatencyHistogram()
+        for value in range(100):
+            first.record(value)
+            second.record(value + 100)
+
+        first.merge(LatencyHistogram.from_dict(second.to_dict()))
+        assert first.count == 200
+        assert first.max == 199
+        assert first.percentile(50) == pytest.approx(100, rel=0.02)
+
+    def test_merge_rejects_different_precision(self):
+        with pytest.raises(ValueError):
+            LatencyHistogram().merge(LatencyHistogram(sub_bucket_bits=5))
+
+
+class TestLoadEngine:
+
+    def test_requires_stages_or_rate(self):
+        with pytest.raises(ValueError):
+            LoadEngine(target=Mock())
+
+    def test_expected_arrivals_with_ramp(self):
+        engine = LoadEngine(
+            target=Mock(), stages=[LoadStage(10, 100), LoadStage(10, 100)]
+        )
+        assert engine.expected_arrivals(10) == pytest.approx(500)
+        assert engine.expected_arrivals(20) == pytest.approx(1500)
+
+    def test_sync_target_constant_rate(self):
+        calls = []
+
+        def target(order_sn):
+            calls.append(order_sn)
+            time.sleep(0.005)
+            return Mock(status_code=200 if len(calls) % 10 else 500)
+
+        ticks = itertools.count()
+        engine = LoadEngine(
+            target=target,
+            rate=200,
+            duration=0.5,
+            concurrency=100,
+            kwargs_factory=lambda i: {"order_sn": f"SN{i}"},
+            clock=lambda: next(ticks) / 64,
+        )
+        report = engine.run()
+
+        assert report.total == int(engine.expected_arrivals(0.5 - 1 / 64)) == 96
+        assert report.dropped == 0
+        assert report.total == report.succeeded + report.failed
+        assert report.failed == report.status_codes[500]
+        assert len(set(calls)) == len(calls)
+        assert report.histogram.percentile(50) >= 5
+        assert report.to_dict()["latency_ms"]["p999"] >= report.to_dict()["latency_ms"]["p50"]
+
+    def test_async_target_drops_beyond_concurrency(self):
+        async def target():
+            await asyncio.sleep(0.2)
+            return Mock(status_code=200)
+
+        report = LoadEngine(target=target, rate=200, duration=0.3, concurrency=5).run()
+
+        assert report.max_in_flight == 5
+        assert report.dropped > 0
+        assert report.succeeded == report.total
+
+    def test_exceptions_are_counted(self):
+        def target():
+            raise ConnectionError("boom")
+
+        report = LoadEngine(target=target, rate=50, duration=0.2, concurrency=5).run()
+        assert report.failed == report.total > 0
+        assert report.errors["ConnectionError"] == report.total
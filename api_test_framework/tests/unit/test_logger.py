@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+import pytest
+
+from utils.logger import LazyBody, LazyJSON, Logger, LogPipeline, worker_log_path
+
+
+class SlowHandler(logging.Handler):
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.messages = []
+        self.threads = set()
+
+    def emit(self, record):
+        time.sleep(self.delay)
+        self.threads.add(threading.current_thread().name)
+        self.messages.append(self.format(record))
+
+
+class CountingBody:
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "body"
+
+
+@pytest.fixture
+def make_logger():
+    pipelines = []
+
+    def _make(*handlers, level=logging.INFO):
+        pipeline = LogPipeline(list(handlers))
+        pipelines.append(pipeline)
+        logger = logging.getLogger(f"test_logger.{len(pipelines)}.{id(pipeline)}")
+        logger.setLevel(level)
+        logger.propagate = False
+        logger.addHandler(pipeline.handler)
+        return logger, pipeline
+
+    yield _make
+    for pipeline in pipelines:
+        pipeline.stop()
+
+
+class TestLogPipeline:
+
+    def test_callers_do_not_wait_for_io(self, make_logger):
+        handler = SlowHandler(delay=0.02)
+        logger, pipeline = make_logger(handler)
+
+        start = time.perf_counter()
+        for i in range(20):
+            logger.info("第%d条", i)
+        elapsed = time.perf_counter() - start
+        pipeline.stop()
+
+        assert elapsed < 0.1
+        assert handler.messages == [f"第{i}条" for i in range(20)]
+        assert threading.current_thread().name not in handler.threads
+
+    def test_bodies_not_formatted_when_level_is_off(self, make_logger):
+        handler = SlowHandler(delay=0)
+        logger, pipeline = make_logger(handler, level=logging.WARNING)
+        body = CountingBody()
+
+        logger.info("响应体: %s", body)
+        logger.warning("响应体: %s", body)
+        pipeline.stop()
+
+        assert body.calls == 1
+        assert handler.messages == ["响应体: body"]
+
+    def test_message_formatted_once_for_all_handlers(self, make_logger):
+        first, second = SlowHandler(delay=0), SlowHandler(delay=0)
+        second.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        logger, pipeline = make_logger(first, second)
+        body = CountingBody()
+
+        logger.info("响应体: %s", body)
+        pipeline.stop()
+
+        assert body.calls == 1
+        assert first.messages == ["响应体: body"]
+        assert second.messages == ["INFO 响应体: body"]
+
+    def test_mutable_args_logged_at_call_time(self, make_logger):
+        handler = SlowHandler(delay=0)
+        logger, pipeline = make_logger(handler)
+        params = {"page": 1}
+
+        logger.info("请求参数: %s", params)
+        params["page"] = 2
+        pipeline.stop()
+
+        assert handler.messages == ["请求参数: {'page': 1}"]
+
+    def test_rotation_by_size(self, make_logger, tmp_path):
+        path = tmp_path / "test.log"
+        logger, pipeline = make_logger(RotatingFileHandler(path, maxBytes=200, backupCount=2, encoding="utf-8"))
+
+        threads = [
+            threading.Thread(target=lambda n=n: [logger.info("线程%d-%d %s", n, i, "x" * 20) for i in range(20)])
+            for n in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        pipeline.stop()
+
+        files = sorted(p.name for p in tmp_path.iterdir())
+        assert files == ["test.log", "test.log.1", "test.log.2"]
+        assert all(p.stat().st_size <= 200 for p in tmp_path.iterdir())
+
+
+class TestLogger:
+
+    def test_framework_logs_reach_caplog(self, caplog):
+        Logger().get_logger("test_logger.propagate").warning("请求失败: %s", "timeout")
+
+        assert caplog.messages == ["请求失败: timeout"]
+
+    def test_worker_log_path(self, monkeypatch):
+        monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+        assert worker_log_path(Path("logs/test.log")) == Path("logs/test.log")
+
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+        assert worker_log_path(Path("logs/test.log")) == Path("logs/test.gw1.log")
+
+
+class TestLazyValues:
+
+    def test_lazy_json(self):
+        assert str(LazyJSON({"名称": "转账", "amount": 1})) == '{"名称": "转账", "amount": 1}'
+
+    def test_lazy_body(self):
+        class Response:
+            content = b'{"message": "\\u6210\\u529f"}'
+            text = "raw"
+
+        assert str(LazyBody(Response())) == '{"message": "成功"}'
+        Response.content = b"<html>"
+        assert str(LazyBody(Response())) == "raw"
@@ -0,0 +1,286 @@
+import asyncio
+import email.utils
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+import pytest
+import requests
+
+from core.async_http_client import AsyncHTTPClient
+from core.connection_pool import InstrumentedHTTPAdapter
+from core.http_client import HTTPClient
+from core.latency_aggregator import LatencyAggregator
+from core.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ResiliencePolicy,
+    RetryBudget,
+    full_jitter,
+    parse_retry_after,
+    retry_from_config,
+)
+from core.stub_server import StubServer
+from core.timing import set_metrics_sink
+
+NO_BACKOFF = {"total": 3, "backoff_factor": 0, "status_forcelist": [500, 503], "allowed_methods": ["GET", "POST"]}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(scope="module")
+def failing_server():
+    with StubServer(error_rate=1.0) as server:
+        yield server
+
+
+def make_client(server, budget=None, breaker=None):
+    policy = ResiliencePolicy(
+        retry_config={**NO_BACKOFF, "budget": budget or {}},
+        breaker_config=breaker or {"enabled": False},
+    )
+    client = HTTPClient(base_url=server.base_url, resilience=policy)
+    client.session.mount("http://", InstrumentedHTTPAdapter(max_retries=retry_from_config(NO_BACKOFF)))
+    return client
+
+
+class TestRetryBudget:
+
+    def test_withdraw_until_empty_then_refill(self):
+        clock = FakeClock()
+        budget = RetryBudget(ratio=0.5, min_per_second=1, capacity=2, clock=clock)
+
+        assert budget.withdraw() and budget.withdraw()
+        assert not budget.withdraw()
+
+        budget.deposit()
+        budget.deposit()
+        assert budget.withdraw()
+
+        clock.now += 1.5
+        assert budget.withdraw()
+        assert not budget.withdraw()
+        assert budget.tokens == pytest.approx(0.5)
+
+
+class TestCircuitBreaker:
+
+    def test_open_half_open_close(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10, clock=clock)
+
+        assert not breaker.record_failure()
+        assert breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+
+        clock.now += 10
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.trips == 1
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=5, clock=clock)
+        breaker.record_failure()
+        clock.now += 5
+
+        assert breaker.allow()
+        assert breaker.record_failure()
+        assert not breaker.allow()
+        assert breaker.trips == 2
+
+
+    def test_released_probe_can_be_retried(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=5, clock=clock)
+        breaker.record_failure()
+        clock.now += 5
+
+        assert breaker.allow()
+        breaker.release()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow()
+
+
+class TestBackoff:
+
+    def test_full_jitter_bounds(self):
+        assert full_jitter(1, 1, 10) == 0
+        assert full_jitter(3, 1, 10, rng=lambda: 0.999) == pytest.approx(3.996)
+        assert full_jitter(10, 1, 10, rng=lambda: 1.0) == 10
+        assert full_jitter(3, 1, 10, rng=lambda: 0.0) == 0
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("7") == 7
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        future = email.utils.formatdate(time.time() + 60, usegmt=True)
+        assert 55 < parse_retry_after(future) <= 60
+
+    def test_retry_after_is_capped_and_counted(self):
+        policy = ResiliencePolicy(retry_config={"retry_after_max": 5}, breaker_config={})
+
+        assert policy.retry_after("h", "3600") == 5
+        assert policy.stats()["h"]["retry_after"] == 1
+
+    def test_counters_are_thread_safe(self):
+        policy = ResiliencePolicy(retry_config={}, breaker_config={})
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(lambda _: [policy.retry_after("h", "1") for _ in range(500)], range(16)))
+
+        assert policy.stats()["h"]["retry_after"] == 8000
+
+
+class TestHTTPClientResilience:
+
+    @pytest.fixture
+    def sink(self):
+        sink = LatencyAggregator()
+        previous = set_metrics_sink(sink)
+        yield sink
+        set_metrics_sink(previous)
+
+    def test_budget_limits_retries(self, failing_server, sink):
+        client = make_client(failing_server, budget={"ratio": 0, "min_per_second": 0, "capacity": 2})
+
+        statuses = [client.get("/system/ping").status_code for _ in range(3)]
+        client.close()
+
+        host = f"127.0.0.1:{failing_server.port}"
+        assert statuses == [500, 500, 500]
+        assert client.resilience.stats()[host]["retries"] == 2
+        assert client.resilience.stats()[host]["retries_denied"] == 3
+        assert sink.report()["counters"][host] == {"retries": 2, "retries_denied": 3}
+
+    def test_breaker_fails_fast(self, failing_server, sink):
+        client = make_client(
+            failing_server,
+            budget={"capacity": 0},
+            breaker={"failure_threshold": 2, "recovery_timeout": 60},
+        )
+
+        for _ in range(2):
+            assert client.get("/system/ping").status_code == 500
+        with pytest.raises(CircuitOpenError, match="熔断器已打开"):
+            client.get("/system/ping")
+        client.close()
+
+        stats = client.resilience.stats()[f"127.0.0.1:{failing_server.port}"]
+        assert stats["breaker"] == CircuitBreaker.OPEN
+        assert stats["breaker_trips"] == 1
+        assert stats["breaker_rejections"] == 1
+        assert sink.report()["endpoints"]["GET /system/ping"]["exceptions"] == {"CircuitOpenError": 1}
+
+    def test_connection_errors_trip_breaker(self):
+        policy = ResiliencePolicy(
+            retry_config={**NO_BACKOFF, "budget": {"capacity": 0}},
+            breaker_config={"failure_threshold": 1, "recovery_timeout": 60},
+        )
+        client = HTTPClient(base_url="http://127.0.0.1:9", resilience=policy)
+
+        with pytest.raises(requests.ConnectionError) as first:
+            client.get("/system/ping", timeout=1)
+        assert not isinstance(first.value, CircuitOpenError)
+        with pytest.raises(CircuitOpenError):
+            client.get("/system/ping")
+        client.close()
+
+
+class TestNonIdempotentRetries:
+
+    def test_post_not_retried_on_status_by_default(self, failing_server):
+        retry_config = {"total": 3, "backoff_factor": 0, "status_forcelist": [500]}
+        client = HTTPClient(base_url=failing_server.base_url, resilience=ResiliencePolicy(retry_config, {"enabled": False}))
+        client.session.mount("http://", InstrumentedHTTPAdapter(max_retries=retry_from_config(retry_config)))
+
+        assert client.post("/auth/logout", json={}).status_code == 500
+        assert "retries" not in client.resilience.stats()[f"127.0.0.1:{failing_server.port}"]
+        client.close()
+        assert "POST" not in retry_from_config(retry_config).allowed_methods
+
+    def test_async_post_retried_only_on_connect_errors(self, monkeypatch):
+        client = AsyncHTTPClient(
+            base_url="http://127.0.0.1:9", resilience=ResiliencePolicy({"total": 2}, {"enabled": False})
+        )
+        client.retry_total = 2
+        monkeypatch.setattr(client, "_get_backoff_time", lambda attempt: 0)
+        calls = []
+        send = client._send
+
+        async def counting(*args, **kwargs):
+            calls.append(1)
+            return await send(*args, **kwargs)
+
+        monkeypatch.setattr(client, "_send", counting)
+
+        async def _main():
+            try:
+                with pytest.raises(aiohttp.ClientConnectorError):
+                    await client.post("/transfer", json={})
+            finally:
+                await client.close()
+
+        asyncio.run(_main())
+        assert "POST" not in client.allowed_methods
+        assert len(calls) == 3
+
+
+class TestProbeRelease:
+
+    @pytest.fixture
+    def policy(self):
+        clock = FakeClock()
+        policy = ResiliencePolicy(
+            retry_config={**NO_BACKOFF, "budget": {"capacity": 0}},
+            breaker_config={"failure_threshold": 1, "recovery_timeout": 5},
+            clock=clock,
+        )
+        policy.record_result("127.0.0.1:9", error=requests.ConnectionError())
+        clock.now += 5
+        return policy
+
+    def test_unexpected_error_releases_sync_probe(self, policy, monkeypatch):
+        client = HTTPClient(base_url="http://127.0.0.1:9", resilience=policy)
+
+        def broken(*args, **kwargs):
+            raise requests.exceptions.ChunkedEncodingError("截断")
+
+        monkeypatch.setattr(client.session, "request", broken)
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            client.get("/system/ping")
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            client.get("/system/ping")
+        client.close()
+
+        assert policy.stats()["127.0.0.1:9"]["breaker"] == CircuitBreaker.HALF_OPEN
+        assert "breaker_rejections" not in policy.stats()["127.0.0.1:9"]
+
+    @pytest.mark.parametrize("error", [aiohttp.ClientPayloadError("截断"), asyncio.CancelledError()])
+    def test_unexpected_error_releases_async_probe(self, policy, monkeypatch, error):
+        client = AsyncHTTPClient(base_url="http://127.0.0.1:9", resilience=policy)
+
+        async def broken(*args, **kwargs):
+            raise error
+
+        monkeypatch.setattr(client, "_send", broken)
+
+        async def _main():
+            for _ in range(2):
+                with pytest.raises(type(error)):
+                    await client.get("/system/ping")
+
+        asyncio.run(_main())
+
+        assert policy.stats()["127.0.0.1:9"]["breaker"] == CircuitBreaker.HALF_OPEN
+        assert "breaker_rejections" not in policy.stats()["127.0.0.1:9"]
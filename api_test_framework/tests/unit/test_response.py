@@ -0,0 +1,57 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+import requests_mock
+
+from core.http_client import HTTPClient
+from core.response import APIResponse
+from core.validator import ResponseValidator
+
+
+class TestAPIResponse:
+
+    @pytest.fixture
+    def raw_response(self):
+        raw = Mock()
+        raw.status_code = 200
+        raw.json.return_value = {"code": 200, "data": {"list": [{"id": i} for i in range(20)]}}
+        return raw
+
+    def test_json_is_decoded_once(self, raw_response):
+        response = APIResponse(raw_response)
+        assert not response.is_json_decoded
+
+        for i in range(20):
+            ResponseValidator.validate_field(response, f"data.list[{i}].id", i)
+
+        assert response.is_json_decoded
+        assert raw_response.json.call_count == 1
+
+    def test_decode_error_is_cached(self, raw_response):
+        raw_response.json.side_effect = json.JSONDecodeError("bad", "doc", 0)
+        response = APIResponse(raw_response)
+
+        for _ in range(3):
+            with pytest.raises(AssertionError):
+                ResponseValidator.extract_value(response, "code")
+        assert raw_response.json.call_count == 1
+
+    def test_attributes_are_delegated(self, raw_response):
+        response = APIResponse(raw_response)
+        response.encoding = "utf-8"
+
+        assert response.status_code == 200
+        assert raw_response.encoding == "utf-8"
+        assert response.wrapped is raw_response
+        assert response.raw is raw_response.raw
+
+    def test_http_client_returns_wrapper(self):
+        with requests_mock.Mocker() as m:
+            m.get("http://stub.local/system/ping", json={"code": 200, "message": "pong"})
+            with HTTPClient(base_url="http://stub.local") as client:
+                response = client.get("/system/ping")
+
+        assert isinstance(response, APIResponse)
+        assert response.json() is response.json()
+        assert response.json()["message"] == "pong"
@@ -1,9 +1,58 @@
+import random
+import re
+
 import pytest
 
 from config.settings import config
+from core.scan_engine import ROOT_PATH, CompiledPatternSet, JSONStringStream, ScanPath, ScanRule, SegmentScanner
 from core.security_checker import SecurityChecker
 
 
+def legacy_scan(data, vuln_type, severity, patterns=None, keywords=None):
+    vulnerabilities = []
+
+    def check_value(value, path=""):
+        if isinstance(value, dict):
+            for key, val in value.items():
+                check_value(val, f"{path}.{key}" if path else key)
+        elif isinstance(value, list):
+            for i, val in enumerate(value):
+                check_value(val, f"{path}[{i}]")
+        elif isinstance(value, str):
+            for pattern in patterns or []:
+                if re.search(pattern, value, re.IGNORECASE):
+                    vulnerabilities.append(
+                        {"type": vuln_type, "severity": severity, "location": path,
+                         "value": value[:100], "pattern": pattern}
+                    )
+                    break
+            for keyword in keywords or []:
+                if keyword.lower() in path.lower():
+                    vulnerabilities.append(
+                        {"type": vuln_type, "severity": severity, "location": path,
+                         "value": value[:100], "keyword": keyword}
+                    )
+                    break
+
+    check_value(data)
+    return vulnerabilities
+
+
+def legacy_check_all(checker, data):
+    return {
+        "sql_injection": legacy_scan(data, "SQL注入", "HIGH", checker.SQL_INJECTION_PATTERNS),
+        "xss": legacy_scan(data, "XSS攻击", "HIGH", checker.XSS_PATTERNS),
+        "path_traversal": legacy_scan(data, "路径遍历", "HIGH", checker.PATH_TRAVERSAL_PATTERNS),
+        "command_injection": legacy_scan(
+            data, "命令注入", "CRITICAL", checker.COMMAND_INJECTION_PATTERNS
+        ),
+        "sensitive_data": legacy_scan(
+            data, "敏感数据泄露", "MEDIUM", keywords=checker.sensitive_keywords
+        ),
+        "blocked_patterns": legacy_scan(data, "禁止模式", "MEDIUM", checker.blocked_patterns),
+    }
+
+
 class TestSecurityChecker:
 
     @pytest.fixture
@@ -69,3 +118,122 @@ class TestSecurityChecker:
         results = checker.check_all(safe_data)
         total_vulnerabilities = sum(len(vulns) for vulns in results.values())
         assert total_vulnerabilities == 0
+
+    def test_check_all_matches_per_category_scan(self, checker):
+        rng = random.Random(20240101)
+        samples = [
+            "normal text", "admin' OR '1'='1", "<script>alert(1)</script>",
+            "../../etc/passwd", "ls; cat /etc/passwd", "a=1;b", "javascript:void(0)",
+            "UNION ALL SELECT", "$(whoami)", "onload = x", "x" * 150 + "--", "",
+        ]
+
+        def build(depth):
+            if depth == 0 or rng.random() < 0.3:
+                return rng.choice(samples + [1, None, True, 3.5])
+            if rng.random() < 0.5:
+                return [build(depth - 1) for _ in range(rng.randint(0, 4))]
+            keys = ["id", "user_password", "api_token", "comment", "file", "Secret", ""]
+            return {rng.choice(keys) + str(i): build(depth - 1) for i in range(rng.randint(0, 4))}
+
+        for _ in range(200):
+            data = {"code": 200, "data": build(5)}
+            assert checker.check_all(data) == legacy_check_all(checker, data)
+
+    def test_keyword_rule_matches_segments_without_building_paths(self):
+        rule = ScanRule("sensitive_data", "敏感数据泄露", "MEDIUM", keywords=["Password", "token"])
+        data = ScanPath(ROOT_PATH, "data")
+
+        assert rule.match(ScanPath(ScanPath(data, 0, is_index=True), "name"), "x") is None
+        assert data._text is None
+
+        finding = rule.match(ScanPath(ScanPath(data, "access_token"), "user_PASSWORD"), "x")
+        assert finding["keyword"] == "Password"
+        assert finding["location"] == "data.access_token.user_PASSWORD"
+
+    def test_keyword_spanning_segments(self):
+        rule = ScanRule("sensitive_data", "敏感数据泄露", "MEDIUM", keywords=["list[0]", "token"])
+        items = ScanPath(ScanPath(ROOT_PATH, "data"), "list")
+
+        assert rule.match(ScanPath(ScanPath(items, 0, is_index=True), "name"), "x")["keyword"] == "list[0]"
+        assert rule.match(ScanPath(ScanPath(items, 1, is_index=True), "name"), "x") is None
+
+    def test_compiled_pattern_set_reports_first_listed_pattern(self):
+        pattern_set = CompiledPatternSet([r"select", r"1=1"])
+        assert pattern_set.first_match("1=1 and select") == "select"
+        assert pattern_set.first_match("where 1=1") == "1=1"
+        assert pattern_set.first_match("clean") is None
+
+    def test_disabled_checks_are_omitted(self):
+        checker = SecurityChecker(
+            {"security": {"enable_xss_check": False, "enable_auth_bypass_check": False}}
+        )
+        results = checker.check_all({"comment": "<script>alert(1)</script>"})
+        assert list(results) == ["sql_injection", "sensitive_data", "blocked_patterns"]
+
+    def test_check_stream_matches_check_all(self, checker):
+        import json
+
+        data = {
+            "code": 200,
+            "data": {
+                "list": [
+                    {"id": i, "remark": "备注 \"quoted\" \\u00e9", "file": "../../etc/passwd",
+                     "user_password": "p@ss", "flags": [True, None, 1.5e3]}
+                    for i in range(50)
+                ],
+                "comment": "<script>alert('x')</script>",
+            },
+        }
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+        for chunk_size in (1, 7, 64, 4096):
+            chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+            assert checker.check_stream(chunks) == checker.check_all(data)
+
+    def test_stream_findings_arrive_before_body_ends(self, checker):
+        def chunks():
+            yield b'{"data": [{"comment": "<script>alert(1)</script>"},'
+            raise AssertionError("should not read further")
+
+        findings = checker.iter_stream_findings(chunks())
+        name, finding = next(findings)
+        assert name == "sql_injection"
+        assert finding["location"] == "data[0].comment"
+
+    def test_check_stream_rejects_truncated_body(self, checker):
+        with pytest.raises(ValueError):
+            checker.check_stream([b'{"data": ["abc"'])
+
+    def test_long_string_scanned_in_bounded_windows(self, checker):
+        import json
+
+        body = json.dumps({"data": {"blob": "安全内容 " * 200000 + "<script>alert(1)</script>", "id": 1}}).encode("utf-8")
+        stream = JSONStringStream()
+        scanner = SegmentScanner(checker._get_engine(("xss",)), window=4096, overlap=256)
+        findings = []
+        for i in range(0, len(body), 8192):
+            for path, text, done in stream.feed(body[i : i + 8192]):
+                findings.extend(scanner.feed(path, text, done))
+            assert len(stream._buffer) <= 8192
+            assert scanner._size <= 4096 + 8192
+        stream.close()
+
+        assert [(name, finding["location"]) for name, finding in findings] == [("xss", "data.blob")]
+        assert findings[0][1]["value"] == ("安全内容 " * 20)[:100]
+
+    def test_stream_splits_escapes_and_surrogate_pairs(self):
+        body = '{"k\\"ey": "a\\u00e9\\ud83d\\ude00\\n\\"z"}'.encode("utf-8")
+        stream = JSONStringStream()
+        segments = []
+        for i in range(len(body)):
+            segments.extend(stream.feed(body[i : i + 1]))
+        segments.extend(stream.close())
+
+        assert "".join(text for _, text, _ in segments) == "a\u00e9\U0001f600\n\"z"
+        assert segments[-1][0].text == 'k"ey'
+        assert segments[-1][2] is True
+
+    def test_stream_rejects_invalid_escape(self, checker):
+        with pytest.raises(ValueError):
+            checker.check_stream([b'{"data": "abc\\x41', b'0123456789"}'])
+
@@ -0,0 +1,136 @@
+import asyncio
+import re
+import socket
+import time
+
+import pytest
+
+from core.api.api_manager import APIManager
+from core.api.auth_api import AuthAPI
+from core.api.standalone_transfer_api import StandaloneTransferAPI
+from core.api.token_manager import decode_jwt_exp
+from core.api.user_api import UserAPI
+from core.async_http_client import AsyncHTTPClient
+from core.http_client import HTTPClient
+from core.stub_server import StubServer, discover_routes
+
+
+@pytest.fixture(scope="module")
+def server():
+    with StubServer() as server:
+        yield server
+
+
+class TestStubServer:
+
+    @pytest.fixture
+    def manager(self, server):
+        manager = APIManager(client=HTTPClient(base_url=server.base_url), scope="session:stub")
+        manager.clear_context()
+        yield manager
+        manager.clear_context()
+
+    def test_routes_are_derived_from_api_classes(self):
+        routes = {(r.method, r.template): r for r in discover_routes()}
+
+        assert routes[("POST", "/auth/login")].body_fields == ("phone", "password")
+        assert routes[("GET", "/standalone-transfer")].kind == "list"
+        assert routes[("GET", "/user/{user_id}")].auth_required
+        assert not routes[("GET", "/system/ping")].auth_required
+
+    def test_login_then_authenticated_list(self, manager):
+        auth_api = manager.register_api("auth", AuthAPI)
+        transfer_api = manager.register_api("transfer", StandaloneTransferAPI)
+
+        token = auth_api.login_and_extract_token("18800000000", "pwd")
+        assert decode_jwt_exp(token) > time.time()
+
+        response = transfer_api.get_transfer_list(page=2, page_size=5)
+        transfer_api._validate_status_code(response, 200)
+        transfer_api._validate_response_code(response, 200)
+        rows = response.json()["data"]["list"]
+        assert [row["id"] for row in rows] == [6, 7, 8, 9, 10]
+
+    def test_missing_auth_and_empty_fields(self, manager):
+        transfer_api = manager.register_api("transfer", StandaloneTransferAPI)
+        auth_api = manager.register_api("auth", AuthAPI)
+
+        response = transfer_api.get_transfer_list()
+        transfer_api._validate_status_code(response, 401)
+        transfer_api._validate_message_contains(response, "缺少认证信息")
+
+        response = auth_api.login("18800000000", "")
+        auth_api._validate_response_code(response, 400)
+        auth_api._validate_message_contains(response, "password不能为空")
+
+    def test_path_parameters(self, manager):
+        manager.set_context("token", "stub")
+        user_api = manager.register_api("user", UserAPI)
+
+        assert user_api.get_user_by_id(42).json()["data"]["id"] == 42
+        assert user_api.get_profile().json()["code"] == 200
+        assert HTTPClient(base_url=user_api.client.base_url).get("/nowhere").status_code == 404
+
+    @pytest.mark.parametrize("params", [{"page": "abc"}, {"page": "1", "page_size": "1.5"}, {"page": "0"}])
+    def test_invalid_paging_returns_envelope(self, server, params):
+        client = HTTPClient(base_url=server.base_url, headers={"Authorization": "Bearer t"})
+        response = client.get("/standalone-transfer", params=params)
+
+        assert response.status_code == 200
+        assert response.json()["code"] == 500
+        assert response.json()["message"] == "分页参数错误"
+        assert client.get("/system/ping").status_code == 200
+
+    def test_invalid_content_length(self, server):
+        with socket.create_connection((server.host, server.port)) as sock:
+            sock.sendall(b"POST /auth/login HTTP/1.1\r\nHost: stub\r\nContent-Length: abc\r\n\r\n")
+            received = sock.recv(65536)
+
+        assert received.startswith(b"HTTP/1.1 400")
+
+    def test_pipelined_requests_keep_order(self):
+        with StubServer(latency_ms=5, latency_jitter_ms=20, seed=1) as server:
+            request = b"GET /system/ping HTTP/1.1\r\nHost: stub\r\n\r\n"
+            last = b"GET /nowhere HTTP/1.1\r\nHost: stub\r\nConnection: close\r\n\r\n"
+            with socket.create_connection((server.host, server.port)) as sock:
+                sock.sendall(request * 3 + last)
+                received = b""
+                while True:
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        break
+                    received += chunk
+
+        statuses = re.findall(rb"HTTP/1\.1 (\d{3})", received)
+        assert statuses == [b"200", b"200", b"200", b"404"]
+
+    def test_latency_error_rate_and_payload(self):
+        with StubServer(latency_ms=30) as server:
+            response = HTTPClient(base_url=server.base_url).get("/system/ping")
+            assert response.status_code == 200
+            assert response.elapsed.total_seconds() >= 0.025
+
+        status, body = StubServer(error_rate=1, seed=1).handle("GET", "/system/ping", {}, b"")
+        assert status == 500
+        assert "服务器内部错误".encode("utf-8") in body
+
+        with StubServer(list_size=3, payload_bytes=1000) as server:
+            response = HTTPClient(base_url=server.base_url, headers={"Authorization": "Bearer t"}).get(
+                "/user/list", params={"page": 1, "pageSize": 50}
+            )
+            rows = response.json()["data"]["list"]
+            assert len(rows) == 3
+            assert all(len(row["padding"]) == 1000 for row in rows)
+
+    def test_prefix_matches_config_style_base_url(self):
+        with StubServer(prefix="/api") as server:
+            assert server.base_url.endswith("/api")
+            assert HTTPClient(base_url=server.base_url).get("/system/ping").status_code == 200
+
+    def test_serves_concurrent_keep_alive_clients(self, server):
+        async def scenario():
+            async with AsyncHTTPClient(base_url=server.base_url, limit=50) as client:
+                return await asyncio.gather(*[client.get("/system/ping") for _ in range(1000)])
+
+        responses = asyncio.run(scenario())
+        assert all(r.status_code == 200 for r in responses)
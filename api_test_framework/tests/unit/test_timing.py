@@ -0,0 +1,105 @@
+import pytest
+
+from core.http_client import HTTPClient
+from core.stub_server import StubServer
+from core.timing import (
+    HistogramSink,
+    RequestTimings,
+    TRANSPORT_PHASES,
+    endpoint_template,
+    get_metrics_sink,
+    set_metrics_sink,
+)
+from core.validator import ResponseValidator
+
+TRANSFER_SCHEMA = {"type": "object", "required": ["code", "data"]}
+
+
+@pytest.fixture(scope="module")
+def server():
+    with StubServer(latency_ms=20) as server:
+        yield server
+
+
+@pytest.fixture
+def sink():
+    sink = HistogramSink()
+    previous = set_metrics_sink(sink)
+    yield sink
+    set_metrics_sink(previous)
+
+
+class TestEndpointTemplate:
+
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("http://h/api/user/123", "GET /api/user/{id}"),
+            ("http://h/api/order/0b9c6a1e-52f4-4e5a-9d3c-1f2a3b4c5d6e/items", "GET /api/order/{id}/items"),
+            ("http://h/api/standalone-transfer?page=1", "GET /api/standalone-transfer"),
+            ("http://h/api/v2/ping", "GET /api/v2/ping"),
+        ],
+    )
+    def test_replaces_identifiers(self, url, expected):
+        assert endpoint_template("get", url) == expected
+
+
+class TestRequestTimings:
+
+    def test_phases_published_to_sink(self, server, sink):
+        client = HTTPClient(base_url=server.base_url)
+        first = client.get("/system/ping")
+        second = client.get("/system/ping")
+        client.close()
+
+        timings = first.timings
+        assert timings.endpoint == "GET /system/ping"
+        assert set(TRANSPORT_PHASES) - {"tls"} <= set(timings.phases)
+        assert timings.connections == 1 and timings.reused == 0
+        assert second.timings.connections == 0 and second.timings.reused == 1
+        assert timings.server_ms >= 20
+        assert timings.total >= sum(timings.phases.values()) - 1
+
+        histogram = sink.histogram("GET /system/ping", "ttfb")
+        assert histogram.count == 2
+        assert sink.histogram("GET /system/ping", "total").count == 2
+
+    def test_decode_and_validation_recorded_after_request(self, server, sink):
+        client = HTTPClient(base_url=server.base_url)
+        response = client.get("/system/ping")
+        client.close()
+        assert "decode" not in response.timings.phases
+
+        ResponseValidator.validate_json_schema(response, TRANSFER_SCHEMA)
+        ResponseValidator.validate_field(response, "code", 200)
+
+        assert response.timings.phases["decode"] > 0
+        assert response.timings.phases["validation"] > 0
+        assert sink.histogram("GET /system/ping", "decode").count == 1
+        assert sink.histogram("GET /system/ping", "validation").count == 2
+
+    def test_validate_response_time_by_phase(self, server, sink):
+        client = HTTPClient(base_url=server.base_url)
+        response = client.get("/system/ping")
+        client.close()
+
+        ResponseValidator.validate_response_time(response, 5000, phase="total")
+        with pytest.raises(AssertionError, match="ttfb阶段耗时超限"):
+            ResponseValidator.validate_response_time(response, 1, phase="ttfb")
+        with pytest.raises(ValueError, match="未知的耗时阶段: ttbf"):
+            ResponseValidator.validate_response_time(response, 5000, phase="ttbf")
+        with pytest.raises(AssertionError, match="响应没有tls阶段的耗时数据"):
+            ResponseValidator.validate_response_time(response, 5000, phase="tls")
+
+    def test_disabled_sink_still_exposes_timings(self, server):
+        previous = set_metrics_sink(None)
+        try:
+            client = HTTPClient(base_url=server.base_url)
+            response = client.get("/system/ping")
+            client.close()
+        finally:
+            set_metrics_sink(previous)
+
+        assert isinstance(response.timings, RequestTimings)
+        assert response.timings.phases["ttfb"] > 0
+        assert get_metrics_sink() is previous
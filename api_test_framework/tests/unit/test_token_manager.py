@@ -0,0 +1,166 @@
+import base64
+import json
+import threading
+import time
+from itertools import count
+
+import pytest
+
+from core.api.token_manager import TokenCache, TokenEntry, TokenManager, decode_jwt_exp
+from core.http_client import HTTPClient
+
+BASE_URL = "http://auth.test/api"
+ACCOUNT = {"phone": "18800000000", "password": "pwd"}
+
+
+def make_jwt(exp=None, **claims) -> str:
+    def _encode(data):
+        raw = base64.urlsafe_b64encode(json.dumps(data).encode("utf-8"))
+        return raw.rstrip(b"=").decode("ascii")
+
+    if exp is not None:
+        claims["exp"] = exp
+    return f"{_encode({'alg': 'HS256', 'typ': 'JWT'})}.{_encode(claims)}.signature"
+
+
+class TestDecodeJwtExp:
+
+    def test_reads_exp_claim(self):
+        assert decode_jwt_exp(make_jwt(exp=1767925564, id=413)) == 1767925564
+
+    @pytest.mark.parametrize("token", ["opaque-token", "a.b.c", make_jwt(id=1), make_jwt(exp="soon")])
+    def test_missing_or_invalid_exp(self, token):
+        assert decode_jwt_exp(token) is None
+
+
+class TestTokenManager:
+
+    @pytest.fixture
+    def server(self, mock_api):
+        sequence = count(1)
+        state = {"ttl": 3600}
+
+        def login(request, context):
+            token = make_jwt(exp=int(time.time()) + state["ttl"], seq=next(sequence))
+            return {"code": 200, "data": {"access_token": token}}
+
+        def refresh(request, context):
+            if state.get("refresh_fails"):
+                context.status_code = 401
+                return {"code": 401, "message": "token已失效"}
+            token = make_jwt(exp=int(time.time()) + 3600, seq=next(sequence))
+            return {"code": 200, "data": {"access_token": token}}
+
+        state["login"] = mock_api.post(f"{BASE_URL}/auth/login", json=login)
+        state["refresh"] = mock_api.post(f"{BASE_URL}/auth/refresh-token", json=refresh)
+        return state
+
+    @pytest.fixture
+    def cache_path(self, tmp_path):
+        return tmp_path / "tokens.json"
+
+    def make_manager(self, cache_path, **kwargs):
+        return TokenManager(client=HTTPClient(base_url=BASE_URL), cache_path=cache_path, **kwargs)
+
+    def test_logs_in_once_and_reuses_token(self, server, cache_path):
+        manager = self.make_manager(cache_path)
+
+        tokens = {manager.get_token(**ACCOUNT) for _ in range(20)}
+
+        assert len(tokens) == 1
+        assert server["login"].call_count == 1
+        assert manager.stats()["logins"] == 1
+
+    def test_pool_round_robin(self, server, cache_path):
+        manager = self.make_manager(cache_path, pool_size=3)
+
+        tokens = [manager.get_token(**ACCOUNT) for _ in range(6)]
+
+        assert server["login"].call_count == 3
+        assert len(set(tokens)) == 3
+        assert tokens[:3] == tokens[3:]
+
+    def test_cache_shared_between_managers(self, server, cache_path):
+        first = self.make_manager(cache_path)
+        token = first.get_token(**ACCOUNT)
+
+        second = self.make_manager(cache_path)
+        assert second.get_token(**ACCOUNT) == token
+        assert server["login"].call_count == 1
+        assert json.loads(cache_path.read_text("utf-8"))[f"{BASE_URL}|{ACCOUNT['phone']}"]
+
+    def test_concurrent_workers_login_once(self, server, cache_path):
+        managers = [self.make_manager(cache_path) for _ in range(8)]
+        tokens = []
+
+        def worker(manager):
+            tokens.append(manager.get_token(**ACCOUNT))
+
+        threads = [threading.Thread(target=worker, args=(m,)) for m in managers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(tokens)) == 1
+        assert server["login"].call_count == 1
+
+    def test_refreshes_tokens_close_to_expiry(self, server, cache_path):
+        server["ttl"] = 120
+        manager = self.make_manager(cache_path, refresh_margin=300)
+        old_token = manager.get_token(**ACCOUNT)
+
+        manager.refresh_expiring()
+
+        new_token = manager.get_token(**ACCOUNT)
+        assert new_token != old_token
+        assert decode_jwt_exp(new_token) > time.time() + 3000
+        assert server["refresh"].call_count == 1
+        assert server["refresh"].last_request.headers["Authorization"] == f"Bearer {old_token}"
+        assert manager.stats()["refreshes"] == 1
+
+    def test_failed_refresh_falls_back_to_login(self, server, cache_path):
+        server["ttl"] = 120
+        manager = self.make_manager(cache_path, refresh_margin=300)
+        manager.get_token(**ACCOUNT)
+        server["refresh_fails"] = True
+        server["ttl"] = 3600
+
+        manager.refresh_expiring()
+
+        assert server["login"].call_count == 2
+        assert decode_jwt_exp(manager.get_token(**ACCOUNT)) > time.time() + 3000
+
+    def test_expired_cache_entries_are_ignored(self, server, cache_path):
+        expired = TokenEntry(make_jwt(exp=int(time.time()) - 10), time.time() - 10)
+        TokenCache(cache_path).update(f"{BASE_URL}|{ACCOUNT['phone']}", lambda cached: [expired])
+        manager = self.make_manager(cache_path)
+
+        assert manager.get_token(**ACCOUNT) != expired.token
+        assert server["login"].call_count == 1
+
+    def test_rewrite_prunes_expired_entries(self, cache_path):
+        cache = TokenCache(cache_path)
+        now = time.time()
+        cache.update("http://old-stub:1234|a", lambda cached: [TokenEntry("old", now - 1)])
+        cache.update("http://stub|b", lambda cached: [TokenEntry("stale", now - 1), TokenEntry("fresh", now + 600)])
+
+        assert cache._read() == {"http://stub|b": [{"token": "fresh", "expires_at": now + 600}]}
+
+    def test_invalidate_removes_token(self, server, cache_path):
+        manager = self.make_manager(cache_path)
+        token = manager.get_token(**ACCOUNT)
+
+        manager.invalidate(ACCOUNT["phone"], token)
+
+        assert manager.get_token(**ACCOUNT) != token
+        assert server["login"].call_count == 2
+
+    def test_login_does_not_touch_caller_context(self, server, cache_path):
+        manager = self.make_manager(cache_path)
+        manager.auth_api.context.set("token", "caller")
+
+        manager.get_token(**ACCOUNT)
+
+        assert manager.auth_api.context.get("token") == "caller"
+        manager.auth_api.context.clear()
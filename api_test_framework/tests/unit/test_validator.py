@@ -0,0 +1,207 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+from jsonschema.exceptions import SchemaError, ValidationError
+from pydantic import BaseModel
+
+from core.response import APIResponse
+from core.schema_registry import SchemaRegistry
+from core.validator import (
+    ExpressionCache,
+    ResponseValidator,
+    expression_cache,
+    validation_timings,
+)
+
+
+class TestExpressionCache:
+
+    def test_hits_and_misses(self):
+        cache = ExpressionCache(maxsize=10)
+        data = {"data": {"list": [{"id": 7}]}}
+
+        assert cache.search("data.list[0].id", data) == 7
+        assert cache.search("data.list[0].id", data) == 7
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        cache = ExpressionCache(maxsize=2)
+        cache.get("a")
+        cache.get("b")
+        cache.get("a")
+        cache.get("c")
+
+        cache.get("a")
+        assert cache.stats()["hits"] == 2
+        cache.get("b")
+        assert cache.stats()["misses"] == 4
+        assert cache.stats()["size"] == 2
+
+    def test_search_many(self):
+        cache = ExpressionCache()
+        result = cache.search_many(["code", "data.total", "missing"], {"code": 200, "data": {"total": 3}})
+        assert result == {"code": 200, "data.total": 3, "missing": None}
+
+
+class TestResponseValidator:
+
+    @pytest.fixture
+    def response(self):
+        raw = Mock()
+        raw.json.return_value = {"code": 200, "data": {"list": [1, 2, 3], "name": "transfer"}}
+        return APIResponse(raw)
+
+    def test_field_assertions_use_shared_cache(self, response):
+        hits_before = expression_cache.hits
+        for _ in range(5):
+            ResponseValidator.validate_field(response, "code", 200)
+            ResponseValidator.validate_field_exists(response, "data.name")
+            ResponseValidator.validate_field_type(response, "data.name", str)
+            ResponseValidator.validate_array_length(response, "data.list", 3)
+        assert expression_cache.hits - hits_before >= 16
+
+    def test_validate_fields(self, response):
+        ResponseValidator.validate_fields(response, {"code": 200, "data.list[1]": 2})
+
+        with pytest.raises(AssertionError, match=r"\[data.name\]"):
+            ResponseValidator.validate_fields(response, {"code": 200, "data.name": "other"})
+
+
+class TestSchemaRegistry:
+
+    @pytest.fixture
+    def registry(self, tmp_path):
+        (tmp_path / "transfer_item.json").write_text(
+            json.dumps(
+                {
+                    "type": "object",
+                    "required": ["id", "amount"],
+                    "properties": {"id": {"type": "integer"}, "amount": {"$ref": "common.json#/amount"}},
+                }
+            ),
+            encoding="utf-8",
+        )
+        (tmp_path / "common.json").write_text(
+            json.dumps({"amount": {"type": "integer", "minimum": 0}}), encoding="utf-8"
+        )
+        (tmp_path / "transfer_list.yaml").write_text(
+            "type: object\n"
+            "properties:\n"
+            "  data:\n"
+            "    type: object\n"
+            "    properties:\n"
+            "      list:\n"
+            "        type: array\n"
+            "        items:\n"
+            "          $ref: transfer_item.json\n",
+            encoding="utf-8",
+        )
+        return SchemaRegistry(tmp_path)
+
+    def test_validator_is_built_once(self, registry):
+        schema = {"type": "object", "required": ["code"]}
+        for _ in range(10):
+            registry.validate({"code": 200}, schema)
+        registry.validate({"code": 200}, {"type": "object", "required": ["code"]})
+
+        assert registry.stats() == {"validators": 1, "hits": 10, "misses": 1}
+
+    def test_ref_resolution_across_schema_dir(self, registry):
+        good = {"data": {"list": [{"id": 1, "amount": 100}]}}
+        bad = {"data": {"list": [{"id": 1, "amount": -1}]}}
+
+        registry.validate(good, "transfer_list")
+        with pytest.raises(ValidationError):
+            registry.validate(bad, "transfer_list")
+
+    def test_first_error_only(self, registry):
+        schema = {"type": "object", "properties": {"a": {"type": "integer"}, "b": {"type": "integer"}}}
+        with pytest.raises(ValidationError):
+            registry.validate({"a": "x", "b": "y"}, schema, first_error_only=True)
+
+    def test_invalid_schema_is_rejected(self, registry):
+        with pytest.raises(SchemaError):
+            registry.validate({}, {"type": "not-a-type"})
+
+    def test_missing_schema_file(self, registry):
+        with pytest.raises(FileNotFoundError):
+            registry.load("../outside")
+
+    def test_response_validator_uses_registry(self):
+        raw = Mock()
+        raw.json.return_value = {"code": "200"}
+        with pytest.raises(AssertionError, match="JSON Schema验证失败"):
+            ResponseValidator.validate_json_schema(
+                APIResponse(raw), {"properties": {"code": {"type": "integer"}}}
+            )
+
+
+class TransferRow(BaseModel):
+    id: int
+    platform: str
+
+
+class TransferPage(BaseModel):
+    code: int
+    data: dict
+
+
+class TestPydanticValidation:
+
+    @pytest.fixture
+    def response(self):
+        raw = Mock()
+        body = {"code": 200, "data": {"list": [{"id": i, "platform": "taobao"} for i in range(5)]}}
+        raw.content = json.dumps(body).encode("utf-8")
+        raw.json.side_effect = lambda: json.loads(raw.content)
+        raw.url = "https://api.example.com/api/standalone-transfer?page=1"
+        raw.request.method = "GET"
+        return APIResponse(raw)
+
+    def test_model_from_raw_bytes(self, response):
+        result = ResponseValidator.validate_pydantic_model(response, TransferPage)
+
+        assert result.source == "json"
+        assert result.value.code == 200
+        assert not response.is_json_decoded
+
+    def test_bulk_rows_from_raw_bytes(self, response):
+        result = ResponseValidator.validate_pydantic_models(response, TransferRow, "data.list")
+
+        assert result.source == "json"
+        assert result.count == 5
+        assert all(isinstance(row, TransferRow) for row in result.value)
+        assert result.endpoint == "GET /api/standalone-transfer"
+
+    def test_uses_decoded_body_when_available(self, response):
+        response.json()
+        result = ResponseValidator.validate_pydantic_models(response, TransferRow, "data.list[1:3]")
+
+        assert result.source == "python"
+        assert [row.id for row in result.value] == [1, 2]
+
+    def test_invalid_rows_raise_assertion(self, response):
+        class StrictRow(BaseModel):
+            id: str
+
+        with pytest.raises(AssertionError, match="Pydantic模型验证失败"):
+            ResponseValidator.validate_pydantic_models(response, StrictRow, "data.list")
+
+    def test_invalid_json(self):
+        raw = Mock()
+        raw.content = b"<html>"
+        with pytest.raises(AssertionError, match="响应不是有效的JSON格式"):
+            ResponseValidator.validate_pydantic_model(APIResponse(raw), TransferPage)
+
+    def test_timings_are_recorded_per_endpoint(self, response):
+        validation_timings.clear()
+        ResponseValidator.validate_pydantic_models(response, TransferRow, "data.list")
+        ResponseValidator.validate_pydantic_models(response, TransferRow, "data.list")
+
+        [row] = validation_timings.summary()
+        assert row["endpoint"] == "GET /api/standalone-transfer"
+        assert row["model"] == "TransferRow"
+        assert row["calls"] == 2
+        assert row["items"] == 10
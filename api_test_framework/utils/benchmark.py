@@ -0,0 +1,190 @@
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    ops_per_sec: float
+    best_ops_per_sec: float
+    mean_us: float
+    stdev_pct: float
+    rounds: int
+    iterations: int
+    alloc_kb: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def measure(
+    name: str,
+    func: Callable[[], Any],
+    rounds: int = 5,
+    min_round_time: float = 0.05,
+    max_iterations: int = 1_000_000,
+) -> BenchmarkResult:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    iterations = 1
+    while elapsed < min_round_time and iterations < max_iterations:
+        estimate = int(iterations * min_round_time / elapsed) if elapsed > 0 else iterations * 2
+        iterations = min(max_iterations, max(iterations * 2, estimate))
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            timings.append((time.perf_counter() - start) / iterations)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(timings)
+    stdev = statistics.pstdev(timings) / median * 100 if median else 0.0
+    return BenchmarkResult(
+        name=name,
+        ops_per_sec=round(1 / median, 2) if median else float("inf"),
+        best_ops_per_sec=round(1 / min(timings), 2) if min(timings) else float("inf"),
+        mean_us=round(statistics.mean(timings) * 1e6, 3),
+        stdev_pct=round(stdev, 2),
+        rounds=rounds,
+        iterations=iterations,
+        alloc_kb=round(peak / 1024, 2),
+    )
+
+
+def _calibration_workload():
+    rows = {f"key-{i}": {"id": i, "name": f"row-{i}"} for i in range(200)}
+    sorted(rows.values(), key=lambda row: row["name"], reverse=True)
+    json.loads(json.dumps(rows))
+
+
+class BenchmarkSuite:
+    CALIBRATION = "calibration"
+
+    def __init__(self, baseline_path: Union[str, Path], threshold: float = 0.3):
+        self.baseline_path = Path(baseline_path)
+        self.threshold = threshold
+        self.results: Dict[str, BenchmarkResult] = {}
+        self.baseline: Dict[str, Dict[str, Any]] = {}
+        self.baseline_calibration: Optional[float] = None
+        self._load_baseline()
+        self._calibration: Optional[float] = None
+
+    def _load_baseline(self):
+        if not self.baseline_path.exists():
+            return
+        with open(self.baseline_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.baseline = data.get("benchmarks", {})
+        self.baseline_calibration = data.get("machine", {}).get("calibration_ops")
+
+    def calibrate(self) -> float:
+        result = measure(self.CALIBRATION, _calibration_workload, rounds=9, min_round_time=0.1)
+        self._calibration = result.best_ops_per_sec
+        return self._calibration
+
+    @property
+    def calibration(self) -> float:
+        if self._calibration is None:
+            self.calibrate()
+        return self._calibration
+
+    def expected_ops(self, name: str) -> Optional[float]:
+        baseline = self.baseline.get(name)
+        if not baseline:
+            return None
+        expected = baseline["best_ops_per_sec"]
+        if self.baseline_calibration:
+            expected *= self.calibration / self.baseline_calibration
+        return expected
+
+    def run(self, name: str, func: Callable[[], Any], **kwargs) -> BenchmarkResult:
+        result = measure(name, func, **kwargs)
+        self.results[name] = result
+        return result
+
+    def compare(self, result: BenchmarkResult) -> Optional[str]:
+        expected = self.expected_ops(result.name)
+        if expected is None:
+            return None
+        if result.best_ops_per_sec < expected * (1 - self.threshold):
+            change = (result.best_ops_per_sec - expected) / expected * 100
+            return (
+                f"{result.name} 性能回退 {change:.1f}%: "
+                f"{result.best_ops_per_sec:.1f} ops/s，按本机校准后的基线 {expected:.1f} ops/s"
+                f"（阈值 {self.threshold:.0%}）"
+            )
+        return None
+
+    def save(self, path: Optional[Union[str, Path]] = None):
+        path = Path(path or self.baseline_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        merged = dict(self.baseline)
+        merged.update({name: result.to_dict() for name, result in self.results.items()})
+        payload = {
+            "machine": {
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "platform": platform.platform(),
+                "processor": platform.machine(),
+                "calibration_ops": self.calibration,
+            },
+            "benchmarks": dict(sorted(merged.items())),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+
+    def report(self) -> str:
+        lines: List[str] = [
+            f"{'基准测试':<42} {'ops/s':>14} {'均值(us)':>12} {'波动%':>7} {'分配KB':>10} {'基线变化':>9}"
+        ]
+        for name, result in sorted(self.results.items()):
+            expected = self.expected_ops(name)
+            change = f"{(result.best_ops_per_sec / expected - 1) * 100:+.1f}%" if expected else "-"
+            lines.append(
+                f"{name:<46} {result.ops_per_sec:>14,.1f} {result.mean_us:>12,.1f} "
+                f"{result.stdev_pct:>7.1f} {result.alloc_kb:>10,.1f} {change:>9}"
+            )
+        rss = peak_rss_kb()
+        if rss is not None:
+            lines.append(f"进程峰值RSS（整个会话）: {rss / 1024:.1f} MB")
+        return "\n".join(lines)
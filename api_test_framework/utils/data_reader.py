@@ -1,57 +1,249 @@
+import csv
+import hashlib
 import json
+import os
+import pickle
 import yaml
 from pathlib import Path
-from typing import Any, Dict, List, Union
+from threading import Lock
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from yaml.composer import Composer
+from yaml.events import (
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+)
+from yaml.nodes import MappingNode
+
+from config.settings import config
+
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+DATA_SUFFIXES = (".yaml", ".yml", ".json")
+STREAM_SUFFIXES = (".jsonl", ".csv") + DATA_SUFFIXES
+
+
+def _load_yaml(f) -> Any:
+    return yaml.load(f, Loader=YamlLoader)
+
+
+def _parser_for(file_path: Path) -> Callable[[Any], Any]:
+    if file_path.suffix in (".yaml", ".yml"):
+        return _load_yaml
+    if file_path.suffix == ".json":
+        return json.load
+    raise ValueError(f"不支持的数据文件格式: {file_path}")
+
+
+class ParseCache:
+    def __init__(self, sidecar_dir: Optional[Union[str, Path]] = None):
+        self.sidecar_dir = Path(sidecar_dir) if sidecar_dir else None
+        self.hits = 0
+        self.misses = 0
+        self.sidecar_hits = 0
+        self._entries: Dict[Path, Tuple[Tuple[int, int], bytes]] = {}
+        self._lock = Lock()
+
+    def _sidecar_path(self, file_path: Path) -> Optional[Path]:
+        if self.sidecar_dir is None:
+            return None
+        digest = hashlib.sha1(str(file_path).encode("utf-8")).hexdigest()
+        return self.sidecar_dir / f"{file_path.stem}-{digest[:16]}.pickle"
+
+    def _read_sidecar(self, sidecar: Optional[Path], signature: Tuple[int, int]) -> Optional[bytes]:
+        if sidecar is None:
+            return None
+        try:
+            with open(sidecar, "rb") as f:
+                cached_signature, payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            return None
+        return payload if tuple(cached_signature) == signature else None
+
+    @staticmethod
+    def _write_sidecar(sidecar: Optional[Path], signature: Tuple[int, int], payload: bytes):
+        if sidecar is None:
+            return
+        try:
+            sidecar.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump((signature, payload), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, sidecar)
+        except OSError:
+            pass
+
+    def load(self, file_path: Union[str, Path]) -> Any:
+        file_path = Path(file_path).absolute()
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"数据文件不存在: {file_path}")
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return pickle.loads(entry[1])
+
+        sidecar = self._sidecar_path(file_path)
+        payload = self._read_sidecar(sidecar, signature)
+        if payload is not None:
+            with self._lock:
+                self.sidecar_hits += 1
+        else:
+            parser = _parser_for(file_path)
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = parser(f)
+            payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+            self._write_sidecar(sidecar, signature, payload)
+            with self._lock:
+                self.misses += 1
+
+        with self._lock:
+            self._entries[file_path] = (signature, payload)
+        return pickle.loads(payload)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.sidecar_hits = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "files": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "sidecar_hits": self.sidecar_hits,
+        }
+
+
+class _CaseStreamLoader(YamlLoader, Composer):
+    def __init__(self, stream):
+        YamlLoader.__init__(self, stream)
+        Composer.__init__(self)
+
+    def _iter_sequence(self):
+        self.get_event()
+        while not self.check_event(SequenceEndEvent):
+            yield self.compose_node(None, None)
+        self.get_event()
+
+    def _iter_mapping(self):
+        start = self.get_event()
+        pairs = []
+        streamed = False
+        while not self.check_event(MappingEndEvent):
+            event = self.peek_event()
+            key = self.compose_node(None, None)
+            if isinstance(event, ScalarEvent) and event.value == "test_cases" and self.check_event(SequenceStartEvent):
+                streamed = True
+                yield from self._iter_sequence()
+            else:
+                pairs.append((key, self.compose_node(None, None)))
+        self.get_event()
+        if not streamed:
+            yield MappingNode("tag:yaml.org,2002:map", pairs, start.start_mark, start.end_mark, start.flow_style)
+
+    def iter_nodes(self):
+        self.get_event()
+        while not self.check_event(StreamEndEvent):
+            self.get_event()
+            if self.check_event(SequenceStartEvent):
+                yield from self._iter_sequence()
+            elif self.check_event(MappingStartEvent):
+                yield from self._iter_mapping()
+            else:
+                yield self.compose_node(None, None)
+            self.get_event()
+            self.anchors = {}
+        self.get_event()
+
+
+def worker_shard() -> Tuple[int, int]:
+    worker = os.getenv("PYTEST_XDIST_WORKER", "")
+    if not worker.startswith("gw"):
+        return 0, 1
+    return int(worker[2:]), int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+
+
+def _default_sidecar_dir() -> Optional[Path]:
+    sidecar_dir = config.get("data_reader.sidecar_dir")
+    return config.base_dir / sidecar_dir if sidecar_dir else None
+
+
+parse_cache = ParseCache(_default_sidecar_dir())
 
 
 class DataReader:
-    def __init__(self, data_dir: Union[str, Path] = None):
+    def __init__(self, data_dir: Union[str, Path] = None, cache: Optional[ParseCache] = None):
         if data_dir is None:
             self.data_dir = Path(__file__).parent.parent / "tests" / "data"
         else:
             self.data_dir = Path(data_dir)
-        
+        self.cache = cache or parse_cache
+        self._index: Optional[Dict[str, Dict[str, Path]]] = None
+
         if not self.data_dir.exists():
             self.data_dir.mkdir(parents=True, exist_ok=True)
 
+    def _build_index(self) -> Dict[str, Dict[str, Path]]:
+        index: Dict[str, Dict[str, Path]] = {}
+        for file_path in self.data_dir.iterdir():
+            if file_path.suffix in STREAM_SUFFIXES and file_path.is_file():
+                index.setdefault(file_path.stem, {})[file_path.suffix] = file_path
+        self._index = index
+        return index
+
+    def _lookup(self, index: Dict[str, Dict[str, Path]], file_name: str, suffixes: Tuple[str, ...]) -> Optional[Path]:
+        candidates = index.get(file_name, {})
+        return next((candidates[suffix] for suffix in suffixes if suffix in candidates), None)
+
+    def _resolve(self, file_name: str, suffixes: Tuple[str, ...] = DATA_SUFFIXES) -> Path:
+        file_path = self._lookup(self._index or self._build_index(), file_name, suffixes)
+        if file_path is None or not file_path.exists():
+            file_path = self._lookup(self._build_index(), file_name, suffixes)
+        if file_path is None:
+            raise FileNotFoundError(f"数据文件不存在: {file_name}")
+        return file_path
+
     def read_yaml(self, file_name: str) -> Union[Dict, List]:
         file_path = self.data_dir / f"{file_name}.yaml"
-        
+
         if not file_path.exists():
             file_path = self.data_dir / f"{file_name}.yml"
-        
+
         if not file_path.exists():
             raise FileNotFoundError(f"数据文件不存在: {file_path}")
-        
-        with open(file_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+
+        return self.cache.load(file_path)
 
     def read_json(self, file_name: str) -> Union[Dict, List]:
         file_path = self.data_dir / f"{file_name}.json"
-        
+
         if not file_path.exists():
             raise FileNotFoundError(f"数据文件不存在: {file_path}")
-        
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+
+        return self.cache.load(file_path)
+
+    def read_file(self, file_path: Union[str, Path]) -> Union[Dict, List]:
+        return self.cache.load(file_path)
 
     def read(self, file_name: str) -> Union[Dict, List]:
-        yaml_path = self.data_dir / f"{file_name}.yaml"
-        yml_path = self.data_dir / f"{file_name}.yml"
-        json_path = self.data_dir / f"{file_name}.json"
-        
-        if yaml_path.exists():
-            return self.read_yaml(file_name)
-        elif yml_path.exists():
-            return self.read_yaml(file_name)
-        elif json_path.exists():
-            return self.read_json(file_name)
-        else:
-            raise FileNotFoundError(f"数据文件不存在: {file_name}")
+        return self.cache.load(self._resolve(file_name))
 
     def get_test_cases(self, file_name: str) -> List[Dict]:
-        data = self.read(file_name)
-        
+        return self._as_test_cases(self.read(file_name), file_name)
+
+    @staticmethod
+    def _as_test_cases(data: Any, file_name: str) -> List[Dict]:
         if isinstance(data, list):
             return data
         elif isinstance(data, dict) and "test_cases" in data:
@@ -61,9 +253,81 @@ class DataReader:
         else:
             raise ValueError(f"无法解析测试数据: {file_name}")
 
+    def iter_test_cases(
+        self, file_name: str, shard_index: Optional[int] = None, shard_count: Optional[int] = None
+    ) -> Iterator[Dict]:
+        if shard_index is None and shard_count is None:
+            shard_index, shard_count = worker_shard()
+        shard_index = shard_index or 0
+        shard_count = shard_count or 1
+        if not 0 <= shard_index < shard_count:
+            raise ValueError(f"无效的分片参数: shard_index={shard_index}, shard_count={shard_count}")
+
+        if Path(file_name).suffix in STREAM_SUFFIXES and (self.data_dir / file_name).is_file():
+            file_path = self.data_dir / file_name
+        else:
+            file_path = self._resolve(file_name, STREAM_SUFFIXES)
+
+        if file_path.suffix == ".jsonl":
+            records = self._iter_jsonl(file_path, shard_index, shard_count)
+        elif file_path.suffix == ".csv":
+            records = self._iter_csv(file_path, shard_index, shard_count)
+        elif file_path.suffix == ".json":
+            records = self._as_test_cases(self.cache.load(file_path), file_name)[shard_index::shard_count]
+        else:
+            records = self._iter_yaml(file_path, shard_index, shard_count)
+        return iter(records)
+
+    @staticmethod
+    def _iter_jsonl(file_path: Path, shard_index: int, shard_count: int) -> Iterator[Dict]:
+        with open(file_path, "r", encoding="utf-8") as f:
+            position = 0
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                if position % shard_count == shard_index:
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        raise ValueError(f"数据文件第{line_no}行不是有效的JSON: {file_path}: {e}")
+                position += 1
+
+    @staticmethod
+    def _iter_csv(file_path: Path, shard_index: int, shard_count: int) -> Iterator[Dict]:
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            rows = csv.reader(f)
+            header = next(rows, None)
+            if header is None:
+                return
+            position = 0
+            for row in rows:
+                if not row:
+                    continue
+                if position % shard_count == shard_index:
+                    yield dict(zip(header, row))
+                position += 1
+
+    @staticmethod
+    def _iter_yaml(file_path: Path, shard_index: int, shard_count: int) -> Iterator[Dict]:
+        with open(file_path, "r", encoding="utf-8") as f:
+            loader = _CaseStreamLoader(f)
+            try:
+                position = 0
+                for node in loader.iter_nodes():
+                    if node.tag == "tag:yaml.org,2002:null":
+                        continue
+                    if position % shard_count == shard_index:
+                        case = loader.construct_document(node)
+                        if not isinstance(case, (dict, list)):
+                            raise ValueError(f"无法解析测试数据: {file_path}")
+                        yield case
+                    position += 1
+            finally:
+                loader.dispose()
+
     def get_test_data(self, file_name: str, key: str = None) -> Any:
         data = self.read(file_name)
-        
+
         if key is None:
             return data
         elif isinstance(data, dict):
@@ -72,7 +336,4 @@ class DataReader:
             raise ValueError(f"数据不是字典类型，无法获取键: {key}")
 
     def list_data_files(self) -> List[str]:
-        files = []
-        for ext in ["*.yaml", "*.yml", "*.json"]:
-            files.extend(self.data_dir.glob(ext))
-        return [f.stem for f in files]
+        return list(self._build_index())
@@ -1,20 +1,104 @@
+import atexit
+import json
 import logging
+import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Dict
+from typing import Any, Callable, Dict, List, Optional
 
 from config.settings import config
 
 
+class LazyJSON:
+    __slots__ = ("data",)
+
+    def __init__(self, data: Any):
+        self.data = data
+
+    def __str__(self) -> str:
+        return json.dumps(self.data, ensure_ascii=False, default=str)
+
+
+class LazyBody:
+    __slots__ = ("response", "truncate")
+
+    def __init__(self, response: Any, truncate: Optional[Callable[[str], str]] = None):
+        self.response = response
+        self.truncate = truncate
+
+    def __str__(self) -> str:
+        try:
+            text = json.dumps(json.loads(self.response.content), ensure_ascii=False)
+        except (TypeError, ValueError):
+            text = self.response.text
+        return self.truncate(text) if self.truncate is not None else text
+
+
+class LogPipeline:
+    def __init__(self, handlers: List[logging.Handler]):
+        self.queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self.handler = QueueHandler(self.queue)
+        self.handlers = handlers
+        self._listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+        self._running = True
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self._listener.stop()
+        for handler in self.handlers:
+            handler.close()
+
+
+def worker_log_path(log_path: Path) -> Path:
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if not worker:
+        return log_path
+    return log_path.with_name(f"{log_path.stem}.{worker}{log_path.suffix}")
+
+
+def _build_handlers() -> List[logging.Handler]:
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter("%(message)s"))
+    handlers: List[logging.Handler] = [console_handler]
+
+    log_file = config.get("logging.file")
+    if log_file:
+        log_path = worker_log_path(Path(log_file))
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            log_path,
+            maxBytes=int(config.get("logging.max_bytes", 10 * 1024 * 1024)),
+            backupCount=int(config.get("logging.backup_count", 5)),
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(
+            logging.Formatter(config.get("logging.format", "%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+        )
+        handlers.append(file_handler)
+    return handlers
+
+
 class Logger:
     _instance = None
     _loggers: Dict[str, logging.Logger] = {}
+    _pipeline: Optional[LogPipeline] = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
+    def pipeline(self) -> LogPipeline:
+        if Logger._pipeline is None:
+            Logger._pipeline = LogPipeline(_build_handlers())
+            atexit.register(self.shutdown)
+        return Logger._pipeline
+
     def get_logger(self, name: str = __name__) -> logging.Logger:
         if name in self._loggers:
             return self._loggers[name]
@@ -23,26 +107,15 @@ class Logger:
         logger.setLevel(getattr(logging, config.get("logging.level", "INFO")))
 
         if not logger.handlers:
-            console_formatter = logging.Formatter("%(message)s")
-            file_formatter = logging.Formatter(
-                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-            )
-
-            console_handler = logging.StreamHandler(sys.stdout)
-            console_handler.setFormatter(console_formatter)
-            logger.addHandler(console_handler)
-
-            log_file = config.get("logging.file")
-            if log_file:
-                log_path = Path(log_file)
-                log_path.parent.mkdir(parents=True, exist_ok=True)
-                file_handler = logging.FileHandler(log_file, encoding="utf-8")
-                file_handler.setFormatter(file_formatter)
-                logger.addHandler(file_handler)
+            logger.addHandler(self.pipeline().handler)
 
         self._loggers[name] = logger
         return logger
 
+    def shutdown(self):
+        if Logger._pipeline is not None:
+            Logger._pipeline.stop()
+
 
 def get_logger(name: str = __name__) -> logging.Logger:
     return Logger().get_logger(name)